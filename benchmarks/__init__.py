@@ -0,0 +1 @@
+"""Benchmarks of dict-typer, run with `python -m benchmarks`"""
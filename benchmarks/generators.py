@@ -0,0 +1,108 @@
+"""Synthetic sources, each stressing one dimension of the input.
+
+Every generator takes a size and is deterministic, so results are comparable
+between runs.
+"""
+import json
+import random
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "snapshot" / "fixtures"
+
+Generator = Callable[[int], Any]
+
+
+def deep_nesting(depth: int) -> Dict[str, Any]:
+    """Dicts nested `depth` levels deep, with a list of dicts at each level.
+
+    The keys differ between levels, as levels with the same keys would be
+    merged into a single recursive type.
+    """
+    source: Dict[str, Any] = {"value": 1}
+    for level in range(depth):
+        source = {
+            f"level_{level}": source,
+            f"items_{level}": [{"id": level, "name": "x"}],
+        }
+    return source
+
+
+def wide_dict(width: int) -> Dict[str, Any]:
+    """A single dict with `width` keys of varying types"""
+    values: List[Any] = [1, 1.5, "x", True, None, [1, 2], {"a": 1}]
+    return {f"field_{idx}": values[idx % len(values)] for idx in range(width)}
+
+
+def homogeneous_list(length: int) -> List[Dict[str, Any]]:
+    """Records of exactly the same shape"""
+    return [
+        {
+            "id": idx,
+            "name": f"name {idx}",
+            "score": idx / 3,
+            "tags": ["a", "b"],
+            "meta": {"ok": True},
+        }
+        for idx in range(length)
+    ]
+
+
+def heterogeneous_list(length: int) -> List[Any]:
+    """Items of many different types and shapes"""
+    rng = random.Random(length)
+    items: List[Any] = []
+    for idx in range(length):
+        kind = rng.randrange(5)
+        if kind == 0:
+            items.append(idx)
+        elif kind == 1:
+            items.append(f"item {idx}")
+        elif kind == 2:
+            items.append(None)
+        elif kind == 3:
+            items.append([idx, str(idx)])
+        else:
+            keys = rng.sample(["a", "b", "c", "d", "e", "f"], rng.randint(1, 4))
+            items.append({key: rng.choice([1, "x", None, [1]]) for key in keys})
+    return items
+
+
+def name_collisions(count: int) -> Dict[str, Any]:
+    """Dicts under the same key with different keys, so the names collide"""
+    return {f"group_{idx}": {"sub": {f"key_{idx}": idx}} for idx in range(count)}
+
+
+def multi_examples(count: int) -> List[Dict[str, Any]]:
+    """Examples of one schema, with some fields only in some of them"""
+    rng = random.Random(count)
+    examples = []
+    for idx in range(count):
+        example: Dict[str, Any] = {"id": idx, "name": f"name {idx}"}
+        if rng.random() < 0.5:
+            example["email"] = f"user{idx}@example.com"
+        if rng.random() < 0.3:
+            example["address"] = {"street": "Main", "number": idx}
+        if rng.random() < 0.2:
+            example["tags"] = ["a"] * rng.randint(0, 3)
+        examples.append(example)
+    return examples
+
+
+# Each generator with its default size
+GENERATORS: Dict[str, Tuple[Generator, int]] = {
+    "deep_nesting": (deep_nesting, 100),
+    "wide_dict": (wide_dict, 5_000),
+    "homogeneous_list": (homogeneous_list, 20_000),
+    "heterogeneous_list": (heterogeneous_list, 5_000),
+    "name_collisions": (name_collisions, 1_000),
+    "multi_examples": (multi_examples, 2_000),
+}
+
+
+def fixtures() -> Dict[str, Any]:
+    """The parsed snapshot test fixtures, by name"""
+    return {
+        path.name[: -len(".json")]: json.loads(path.read_text())
+        for path in sorted(FIXTURES.glob("*.json"))
+    }
@@ -0,0 +1,114 @@
+"""Time and trace the memory of each benchmark case against each target.
+
+Time is the best of a number of runs, peak memory is measured in a separate
+run under tracemalloc, as tracing slows everything down.
+"""
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+
+import click
+from click.testing import CliRunner
+
+from benchmarks.generators import GENERATORS, fixtures
+from dict_typer import cli, get_type_definitions
+from dict_typer.type_definitions import DefinitionBuilder
+
+# A target runs dict-typer on the source prepared for it
+Target = Tuple[Callable[[Any], Any], Callable[[Any], Any]]
+
+
+def _run_cli(text: str) -> None:
+    # Every run types the input, rather than reading the output cached by the
+    # first one
+    result = CliRunner().invoke(cli, ["--no-cache"], input=text)
+    if result.exit_code != 0:
+        raise RuntimeError(result.output)
+
+
+TARGETS: Dict[str, Target] = {
+    "get_type_definitions": (lambda source: source, get_type_definitions),
+    "build_output": (
+        lambda source: source,
+        lambda source: DefinitionBuilder(source).build_output(),
+    ),
+    "cli": (json.dumps, _run_cli),
+}
+
+
+class Result(NamedTuple):
+    case: str
+    target: str
+    size: Optional[int]
+    seconds: float
+    peak_bytes: int
+
+
+def iter_cases(scale: float = 1.0) -> Iterator[Tuple[str, Optional[int], Any]]:
+    """The name, size and source of each case"""
+    for name, (generator, size) in GENERATORS.items():
+        scaled = max(1, int(size * scale))
+        yield name, scaled, generator(scaled)
+    for name, source in fixtures().items():
+        yield f"fixture:{name}", None, source
+
+
+def measure(run: Callable[[Any], Any], source: Any, repeat: int) -> Tuple[float, int]:
+    """The best time out of `repeat` runs, and the peak memory of a run"""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run(source)
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(source)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_benchmarks(
+    scale: float = 1.0, repeat: int = 3, only: Optional[str] = None
+) -> Iterator[Result]:
+    for case, size, source in iter_cases(scale):
+        if only and only not in case:
+            continue
+        for target, (prepare, run) in TARGETS.items():
+            seconds, peak = measure(run, prepare(source), repeat)
+            yield Result(case, target, size, seconds, peak)
+
+
+def format_row(result: Result) -> str:
+    size = "" if result.size is None else str(result.size)
+    return (
+        f"{result.case:<40} {result.target:<22} {size:>8} "
+        f"{result.seconds * 1000:>12.2f} {result.peak_bytes / 2 ** 20:>12.2f}"
+    )
+
+
+@click.command()
+@click.option(
+    "--scale", type=float, default=1.0, help="Multiply the size of the synthetic cases."
+)
+@click.option(
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=3,
+    help="Runs to take the best time of.",
+)
+@click.option("--only", help="Only run the cases with this in the name.")
+@click.option("--json", "as_json", is_flag=True, help="Output a JSON line per result.")
+def main(scale: float, repeat: int, only: Optional[str], as_json: bool) -> None:
+    if not as_json:
+        click.echo(
+            f"{'case':<40} {'target':<22} {'size':>8} {'time (ms)':>12} {'peak (MB)':>12}"
+        )
+    for result in run_benchmarks(scale, repeat, only):
+        click.echo(json.dumps(result._asdict()) if as_json else format_row(result))
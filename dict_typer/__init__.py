@@ -1,56 +1,36 @@
-import io
-import json
-import sys
-from typing import Dict, List, Tuple
-
-import click
-from rich.console import Console
-from rich.syntax import Syntax
+import importlib
+from typing import TYPE_CHECKING, Any
 
+from dict_typer.accumulator import SchemaAccumulator
 from dict_typer.type_definitions import get_type_definitions
 
+if TYPE_CHECKING:
+    from dict_typer.asynchronous import AsyncSchemaAccumulator, aget_type_definitions
+    from dict_typer.columnar import get_type_definitions_from_table
+    from dict_typer.command_line import cli
+
 __version__ = "0.1.15"
 
+__all__ = [
+    "AsyncSchemaAccumulator",
+    "SchemaAccumulator",
+    "aget_type_definitions",
+    "cli",
+    "get_type_definitions",
+    "get_type_definitions_from_table",
+]
 
-@click.command()
-@click.option(
-    "--imports/--no-imports",
-    default=True,
-    help="Show imports at the top, default: True",
-)
-@click.option("--rich", "-r", is_flag=True, help="Show rich output.")
-@click.option(
-    "--line-numbers", "-l", is_flag=True, help="Show line numbers if rich.",
-)
-@click.argument("file", type=click.File("r"), nargs=-1)
-@click.version_option(__version__)
-def cli(
-    file: Tuple[io.TextIOWrapper],
-    imports: bool = True,
-    rich: bool = False,
-    line_numbers: bool = False,
-) -> None:
-    if len(file) > 1:
-        raise click.BadArgumentUsage("Multiple files supplied, run with one at a time")
-    if len(file) == 0:
-        if sys.stdin.isatty():
-            raise click.UsageError(
-                "Either provide the path to the file or pipe a file to dict-typer"
-            )
-        else:
-            stream = sys.stdin.read().strip()
-    else:
-        stream = file[0].read().strip()
+# Imported on first use, so using the library doesn't import click, rich or
+# asyncio
+_LAZY_ATTRIBUTES = {
+    "AsyncSchemaAccumulator": "dict_typer.asynchronous",
+    "aget_type_definitions": "dict_typer.asynchronous",
+    "cli": "dict_typer.command_line",
+    "get_type_definitions_from_table": "dict_typer.columnar",
+}
 
-    try:
-        parsed = json.loads(stream)
-    except json.decoder.JSONDecodeError as e:
-        raise click.UsageError(f"JSON serialisation error \n\n{e}")
 
-    output = get_type_definitions(parsed, show_imports=imports)
-    if rich:
-        syntax = Syntax(output, "python", theme="monokai", line_numbers=line_numbers)
-        console = Console()
-        console.print(syntax)
-    else:
-        click.echo(output)
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
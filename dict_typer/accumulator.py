@@ -0,0 +1,196 @@
+import json
+from typing import IO, Any, Dict, Optional, Tuple, Union
+
+from dict_typer.streaming import _RecordStats
+from dict_typer.type_definitions import (
+    ExampleCounters,
+    FieldStats,
+    _check_optional_threshold,
+    _RecordTypes,
+)
+
+Shape = Union[type, Tuple[Any, ...]]
+
+STATE_VERSION = 3
+# Earlier states hold the first sample of each shape instead of the types, and
+# without the number of samples of each shape in version 1, one each
+_SUPPORTED_STATE_VERSIONS = (1, 2, STATE_VERSION)
+
+
+def shape_of(value: Any) -> Shape:
+    """A value identifying everything that typing `value` depends on.
+
+    Values of the same shape are typed the same: dicts by their keys and the
+    shapes of their values, anything else but sequences by its type.
+    Sequences by the index and shape of each item shaped unlike the items
+    before it, as typing an item of an already typed shape doesn't change
+    anything, while the names of item types include the index.
+    """
+    if isinstance(value, dict):
+        return (dict, tuple((key, shape_of(item)) for key, item in value.items()))
+    if isinstance(value, (list, set, tuple, frozenset)):
+        items: Dict[Shape, int] = {}
+        for idx, item in enumerate(value):
+            items.setdefault(shape_of(item), idx)
+        return (type(value), tuple((idx, shape) for shape, idx in items.items()))
+    return type(value)
+
+
+class SchemaAccumulator:
+    """Collect samples of a schema, to render the definitions
+    get_type_definitions would generate for the list of all the samples.
+
+    Each sample is typed when it's added, both as an item of the list and as
+    an example of one schema, and only the merged definitions are kept, along
+    with the statistics of their fields and the ones deciding if the samples
+    are examples of one schema. Memory depends on the variety of the samples
+    rather than their number, and the samples aren't referenced once added.
+    Which fields are optional is decided from the statistics when rendering,
+    so the same samples can be rendered with different thresholds.
+
+    Accumulators can be merged, the samples of the other accumulator following
+    the samples of this one. Merging is associative, so samples can be
+    collected in batches, threads, processes or machines and merged in order.
+    The state can be saved as JSON with `dump` and read back with `load`, to
+    add more samples later on.
+    """
+
+    def __init__(
+        self,
+        root_type_name: str = "Root",
+        type_postfix: str = "",
+        show_imports: bool = True,
+        force_alternative: bool = False,
+    ) -> None:
+        self.root_type_name = root_type_name
+        self.type_postfix = type_postfix
+        self.show_imports = show_imports
+        self.force_alternative = force_alternative
+
+        self.count = 0
+        self._stats = _RecordStats()
+        self._types = _RecordTypes(
+            root_type_name=root_type_name,
+            type_postfix=type_postfix,
+            force_alternative=force_alternative,
+            name_map=None,
+        )
+        # The counters of the examples of each shape of the samples added so
+        # far, samples of a shape already typed are only counted. Not part of
+        # the state, a loaded or merged accumulator types each shape again
+        self._counters: Dict[Shape, Optional[ExampleCounters]] = {}
+
+    def _options(self) -> Tuple[str, str, bool]:
+        """The options that change the types, imports are only rendered"""
+        return (self.root_type_name, self.type_postfix, self.force_alternative)
+
+    def add(self, sample: Any) -> None:
+        self._stats.add(sample)
+        shape = shape_of(sample)
+        if shape not in self._counters:
+            self._types.add(sample, self.count)
+            self._counters[shape] = self._types.counters(sample)
+        else:
+            counters = self._counters[shape]
+            if counters is not None:
+                self._types.merger.count(counters)
+        self.count += 1
+
+    def merge(self, other: "SchemaAccumulator") -> "SchemaAccumulator":
+        """Add the samples of another accumulator after the ones of this one"""
+        if other._options() != self._options():
+            raise ValueError("Can't merge accumulators with different options")
+
+        self._types.merge(other._types, self.count)
+        self._stats.update(other._stats)
+        self.count += other.count
+        return self
+
+    def render(self, optional_threshold: float = 1.0) -> str:
+        """Fields of examples of one schema are optional if they appear in less
+        than the `optional_threshold` share of the samples of their type, by
+        default if they don't appear in all of them.
+        """
+        _check_optional_threshold(optional_threshold)
+        return self._types.render(
+            as_examples=self._stats.suggest_examples(),
+            total=self._stats.total,
+            empty_count=self._stats.empty_count,
+            show_imports=self.show_imports,
+            optional_threshold=optional_threshold,
+        )
+
+    def field_stats(self) -> Dict[str, Dict[str, FieldStats]]:
+        """The statistics of the fields of each type of the samples, by the
+        name of the type and of the field, as merged when rendering examples.
+
+        The statistics are counted as the samples are added, the ones returned
+        are a copy that adding more samples doesn't change.
+        """
+        field_stats: Dict[str, Dict[str, FieldStats]] = {}
+        for name, fields in self._types.merger.field_stats.items():
+            copies = field_stats[name] = {}
+            for field_name, stats in fields.items():
+                copies[field_name] = FieldStats()
+                copies[field_name].update(stats)
+        return field_stats
+
+    def _state(self) -> Dict[str, Any]:
+        """The state `dump` writes as JSON"""
+        return {
+            "version": STATE_VERSION,
+            "root_type_name": self.root_type_name,
+            "type_postfix": self.type_postfix,
+            "force_alternative": self.force_alternative,
+            "stats": {
+                "total": self._stats.total,
+                "empty_count": self._stats.empty_count,
+                "all_dicts": self._stats.all_dicts,
+                "field_counts": dict(self._stats.field_counts),
+            },
+            "types": self._types.dump_state(),
+        }
+
+    @classmethod
+    def _from_state(cls, state: Any, show_imports: bool = True) -> "SchemaAccumulator":
+        if (
+            not isinstance(state, dict)
+            or state.get("version") not in _SUPPORTED_STATE_VERSIONS
+        ):
+            raise ValueError("Unsupported schema state")
+
+        accumulator = cls(
+            root_type_name=state["root_type_name"],
+            type_postfix=state["type_postfix"],
+            show_imports=show_imports,
+            force_alternative=state["force_alternative"],
+        )
+        stats = accumulator._stats
+        stats.total = state["stats"]["total"]
+        stats.empty_count = state["stats"]["empty_count"]
+        stats.all_dicts = state["stats"]["all_dicts"]
+        stats.field_counts.update(state["stats"]["field_counts"])
+        accumulator.count = stats.total
+        if state["version"] == STATE_VERSION:
+            accumulator._types.load_state(state["types"])
+        else:
+            for idx, sample, *count in state["samples"]:
+                accumulator._types.add(sample, idx, count[0] if count else 1)
+        return accumulator
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickled as its state, the types hold caches that can't be pickled"""
+        return (self._from_state, (self._state(), self.show_imports))
+
+    def dump(self, fp: IO[str]) -> None:
+        """Write the state as JSON, the merged definitions and the statistics"""
+        json.dump(self._state(), fp)
+
+    @classmethod
+    def load(cls, fp: IO[str], show_imports: bool = True) -> "SchemaAccumulator":
+        """Read the state written by `dump`, or by earlier versions"""
+        state = json.load(fp)
+        try:
+            return cls._from_state(state, show_imports)
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError(f"Invalid schema state: {e}")
@@ -0,0 +1,140 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import (
+    Any,
+    AsyncIterable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from dict_typer.accumulator import SchemaAccumulator
+
+T = TypeVar("T")
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _accumulate(samples: List[Any], options: Dict[str, Any]) -> SchemaAccumulator:
+    accumulator = SchemaAccumulator(**options)
+    for sample in samples:
+        accumulator.add(sample)
+    return accumulator
+
+
+async def _run(executor: Optional[Executor], func: Callable[..., T], *args: Any) -> T:
+    loop = asyncio.get_running_loop()
+    if isinstance(executor, ProcessPoolExecutor):
+        return await loop.run_in_executor(executor, func, *args)
+    # Threads collect the same Stats as the caller, like asyncio.to_thread
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        executor, functools.partial(context.run, func, *args)
+    )
+
+
+class AsyncSchemaAccumulator:
+    """A SchemaAccumulator for asyncio code, which types the samples in an
+    executor so the event loop isn't blocked.
+
+    Samples are buffered until `batch_size` of them are added, the batch is
+    then collected in the executor, the default one of the loop unless given,
+    while the event loop runs other tasks. Batches are merged in the order
+    they're complete, so the definitions are the same as a SchemaAccumulator
+    of all the samples would render. Samples have to be picklable with a
+    process pool executor.
+    """
+
+    def __init__(
+        self,
+        root_type_name: str = "Root",
+        type_postfix: str = "",
+        show_imports: bool = True,
+        force_alternative: bool = False,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError(f"Batch size has to be at least 1, got {batch_size}")
+        self._options: Dict[str, Any] = {
+            "root_type_name": root_type_name,
+            "type_postfix": type_postfix,
+            "show_imports": show_imports,
+            "force_alternative": force_alternative,
+        }
+        self.accumulator = SchemaAccumulator(**self._options)
+        self.batch_size = batch_size
+        self.executor = executor
+
+        self._batch: List[Any] = []
+        # Batches are merged, and rendered, one at a time in the order they
+        # wait for the lock
+        self._lock = asyncio.Lock()
+
+    @property
+    def count(self) -> int:
+        """The number of samples added, including the buffered ones"""
+        return self.accumulator.count + len(self._batch)
+
+    async def add(self, sample: Any) -> None:
+        self._batch.append(sample)
+        if len(self._batch) >= self.batch_size:
+            await self.flush()
+
+    async def extend(self, samples: Union[Iterable[Any], AsyncIterable[Any]]) -> None:
+        """Add the samples of an iterable or an async iterable"""
+        if isinstance(samples, AsyncIterable):
+            async for sample in samples:
+                await self.add(sample)
+        else:
+            for sample in samples:
+                await self.add(sample)
+
+    async def flush(self) -> None:
+        """Collect the buffered samples in the executor"""
+        batch, self._batch = self._batch, []
+        async with self._lock:
+            if batch:
+                collected = await _run(self.executor, _accumulate, batch, self._options)
+                self.accumulator.merge(collected)
+
+    async def render(self, optional_threshold: float = 1.0) -> str:
+        await self.flush()
+        async with self._lock:
+            return await _run(
+                self.executor, self.accumulator.render, optional_threshold
+            )
+
+
+async def aget_type_definitions(
+    samples: Union[Iterable[Any], AsyncIterable[Any]],
+    *,
+    root_type_name: str = "Root",
+    type_postfix: str = "",
+    show_imports: bool = True,
+    force_alternative: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    executor: Optional[Executor] = None,
+    optional_threshold: float = 1.0,
+) -> str:
+    """Generate the type definitions get_type_definitions would for the list of
+    the samples, typing them in batches in the executor without blocking the
+    event loop.
+    """
+    accumulator = AsyncSchemaAccumulator(
+        root_type_name=root_type_name,
+        type_postfix=type_postfix,
+        show_imports=show_imports,
+        force_alternative=force_alternative,
+        batch_size=batch_size,
+        executor=executor,
+    )
+    await accumulator.extend(samples)
+    return await accumulator.render(optional_threshold)
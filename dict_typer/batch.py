@@ -0,0 +1,264 @@
+import glob
+import json
+import mmap
+import os
+import stat
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+from dict_typer.accumulator import SchemaAccumulator
+from dict_typer.cache import OutputCache, file_digest, output_options
+from dict_typer.decoding import get_loads, strip_whitespace
+from dict_typer.sampling import Sampling
+from dict_typer.stats import phase
+from dict_typer.streaming import (
+    get_type_definitions_from_json_stream,
+    get_type_definitions_from_ndjson,
+    iter_json_records,
+    iter_ndjson,
+)
+from dict_typer.type_definitions import get_type_definitions
+
+T = TypeVar("T")
+
+
+class InputError(ValueError):
+    """A file that couldn't be decoded, the message starts with its path"""
+
+
+def expand_paths(patterns: Iterable[str]) -> List[str]:
+    """The paths of the files to type, with glob patterns expanded in sorted
+    order, for shells that don't expand them or patterns that were quoted.
+    """
+    paths: List[str] = []
+    for pattern in patterns:
+        if not glob.has_magic(pattern):
+            paths.append(pattern)
+            continue
+
+        matches = sorted(
+            path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path)
+        )
+        if not matches:
+            raise ValueError(f"No files match '{pattern}'")
+        paths.extend(matches)
+    return paths
+
+
+def output_name(path: str) -> str:
+    """The name of the file the definitions of the file at `path` are written to"""
+    return f"{os.path.splitext(os.path.basename(path))[0]}.py"
+
+
+def open_input(path: str, ndjson: bool, stream: bool) -> IO[Any]:
+    """The file at `path`, opened as text to be read line by line with `ndjson`
+    or incrementally with `stream`, otherwise as bytes to be decoded at once.
+    """
+    if ndjson or stream:
+        return open(path, "r")
+    return open(path, "rb")
+
+
+def _map_file(source_file: IO[Any]) -> Optional[mmap.mmap]:
+    """The whole file mapped to memory, if it's a regular binary file that is
+    read from the start.
+    """
+    if "b" not in getattr(source_file, "mode", ""):
+        return None
+    try:
+        fileno = source_file.fileno()
+        if source_file.tell() != 0:
+            return None
+    except OSError:
+        # Such as pipes or files without a descriptor
+        return None
+    status = os.fstat(fileno)
+    if not stat.S_ISREG(status.st_mode) or status.st_size == 0:
+        return None
+    return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+
+
+def read_document(source_file: IO[Any], json_backend: str = "auto") -> Any:
+    """Decode the whole file with the JSON backend, from a memory map of it
+    when it can be mapped, so it isn't copied before decoding.
+    """
+    loads = get_loads(json_backend)
+    mapped = _map_file(source_file)
+    with phase("parse"):
+        if mapped is None:
+            return loads(source_file.read().strip())
+        with mapped, memoryview(mapped) as view:
+            document = strip_whitespace(view)
+            try:
+                return loads(document)
+            finally:
+                document.release()
+
+
+def read_records(
+    source_file: IO[Any], ndjson: bool, stream: bool, json_backend: str = "auto"
+) -> Iterable[Any]:
+    """The records of a file, its lines with `ndjson`, otherwise the items of a
+    root list or the whole document.
+    """
+    if ndjson:
+        return iter_ndjson(source_file)
+    if stream:
+        return iter_json_records(source_file)
+    parsed = read_document(source_file, json_backend)
+    return parsed if isinstance(parsed, list) else [parsed]
+
+
+def type_file(
+    source_file: IO[Any],
+    *,
+    show_imports: bool = True,
+    ndjson: bool = False,
+    stream: bool = False,
+    sampling: Optional[Sampling] = None,
+    workers: Optional[int] = None,
+    json_backend: str = "auto",
+    optional_threshold: float = 1.0,
+) -> str:
+    """Generate the type definitions of a file on its own"""
+    if ndjson:
+        return get_type_definitions_from_ndjson(
+            source_file,
+            show_imports=show_imports,
+            optional_threshold=optional_threshold,
+        )
+    if stream:
+        return get_type_definitions_from_json_stream(
+            source_file,
+            show_imports=show_imports,
+            optional_threshold=optional_threshold,
+        )
+    return get_type_definitions(
+        read_document(source_file, json_backend),
+        show_imports=show_imports,
+        sampling=sampling,
+        workers=workers,
+        optional_threshold=optional_threshold,
+    )
+
+
+def type_path(path: str, cache: Optional[OutputCache] = None, **options: Any) -> str:
+    """type_file of the file at `path`, from the cache if it's given and the
+    file was typed before with the same options.
+
+    Raises InputError if the file isn't valid JSON.
+    """
+
+    def generate() -> str:
+        try:
+            with open_input(
+                path, options.get("ndjson", False), options.get("stream", False)
+            ) as f:
+                return type_file(f, **options)
+        except json.JSONDecodeError as e:
+            raise InputError(f"{path}: {e}")
+
+    if cache is None:
+        return generate()
+    return cache.cached([file_digest(path)], output_options(options), generate)
+
+
+def _type_path(path: str, options: Dict[str, Any]) -> str:
+    return type_path(path, **options)
+
+
+def _accumulate_path(path: str, options: Dict[str, Any]) -> SchemaAccumulator:
+    accumulator = SchemaAccumulator(**options["accumulator"])
+    try:
+        with open_input(path, options["ndjson"], options["stream"]) as f:
+            for record in read_records(
+                f, options["ndjson"], options["stream"], options["json_backend"]
+            ):
+                accumulator.add(record)
+    except json.JSONDecodeError as e:
+        raise InputError(f"{path}: {e}")
+    return accumulator
+
+
+def _map_paths(
+    func: Callable[[str, Dict[str, Any]], T],
+    paths: List[str],
+    options: Dict[str, Any],
+    workers: int,
+) -> Iterator[T]:
+    """The results of `func` for each path, in order, from a pool of processes
+    if there's more than one worker.
+    """
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield func(path, options)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+        # Bigger chunks for many small files, to not send them one by one
+        chunksize = max(1, len(paths) // (workers * 4))
+        yield from executor.map(
+            func, paths, [options] * len(paths), chunksize=chunksize
+        )
+
+
+def type_files(
+    paths: List[str],
+    *,
+    workers: int = 1,
+    show_imports: bool = True,
+    ndjson: bool = False,
+    stream: bool = False,
+    sampling: Optional[Sampling] = None,
+    cache: Optional[OutputCache] = None,
+    json_backend: str = "auto",
+    optional_threshold: float = 1.0,
+) -> Iterator[str]:
+    """Generate the type definitions of each file on its own, in order, spread
+    over a pool of `workers` processes, only for the files that aren't in the
+    cache if it's given.
+
+    Raises InputError for files that aren't valid JSON.
+    """
+    options: Dict[str, Any] = {
+        "show_imports": show_imports,
+        "ndjson": ndjson,
+        "stream": stream,
+        "sampling": sampling,
+        "cache": cache,
+        "json_backend": json_backend,
+        "optional_threshold": optional_threshold,
+        # Files are typed in parallel rather than the records of each file
+        "workers": None,
+    }
+    return _map_paths(_type_path, paths, options, workers)
+
+
+def accumulate_files(
+    paths: List[str],
+    accumulator: SchemaAccumulator,
+    *,
+    workers: int = 1,
+    ndjson: bool = False,
+    stream: bool = False,
+    json_backend: str = "auto",
+) -> SchemaAccumulator:
+    """Add the records of the files to the accumulator, in order, collecting
+    the records of each file in a pool of `workers` processes.
+
+    Raises InputError for files that aren't valid JSON.
+    """
+    options: Dict[str, Any] = {
+        "accumulator": {
+            "root_type_name": accumulator.root_type_name,
+            "type_postfix": accumulator.type_postfix,
+            "show_imports": accumulator.show_imports,
+            "force_alternative": accumulator.force_alternative,
+        },
+        "ndjson": ndjson,
+        "stream": stream,
+        "json_backend": json_backend,
+    }
+    for file_accumulator in _map_paths(_accumulate_path, paths, options, workers):
+        accumulator.merge(file_accumulator)
+    return accumulator
@@ -0,0 +1,188 @@
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+from dict_typer.decoding import get_loads
+from dict_typer.type_definitions import get_type_definitions
+
+# Entries above this many bytes in total are evicted, least recently used first
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+_CHUNK_SIZE = 1024 * 1024
+
+# The options of get_type_definitions that change the output, and their defaults
+OUTPUT_OPTIONS: Dict[str, Any] = {
+    "root_type_name": "Root",
+    "type_postfix": "",
+    "show_imports": True,
+    "force_alternative": False,
+    "name_map": None,
+    "sampling": None,
+    "optional_threshold": 1.0,
+}
+
+
+def default_cache_dir() -> str:
+    """$DICT_TYPER_CACHE_DIR, otherwise dict-typer in $XDG_CACHE_HOME or ~/.cache"""
+    directory = os.environ.get("DICT_TYPER_CACHE_DIR")
+    if directory:
+        return directory
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "dict-typer")
+
+
+def file_digest(path: str) -> bytes:
+    """The hash of the bytes of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+# The options that only change how the output is generated
+_NON_OUTPUT_OPTIONS = ("workers", "json_backend")
+
+
+def output_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    """The options with the defaults of the ones that change the output filled
+    in, without the number of workers or the JSON backend, which don't change it.
+    """
+    return {
+        **OUTPUT_OPTIONS,
+        **{
+            key: value
+            for key, value in options.items()
+            if key not in _NON_OUTPUT_OPTIONS
+        },
+    }
+
+
+def cache_key(digests: Iterable[bytes], options: Dict[str, Any]) -> str:
+    """The key of the output for inputs with the hashes `digests`, generated
+    with the options by this version of dict-typer.
+    """
+    from dict_typer import __version__
+
+    key = hashlib.sha256()
+    key.update(
+        json.dumps(
+            {"version": __version__, "options": options}, sort_keys=True, default=repr
+        ).encode()
+    )
+    for digest in digests:
+        key.update(digest)
+    return key.hexdigest()
+
+
+class OutputCache:
+    """Generated definitions stored on disk by the hash of the input and every
+    option that changes the output, including the version of dict-typer.
+
+    Reading an entry marks it as used, entries are evicted least recently used
+    first once they take more than `max_size` bytes. Entries are written at
+    once, so processes can share the cache.
+    The cache is best effort: outputs are generated as usual if the directory
+    can't be read or written to.
+    """
+
+    directory: str
+    max_size: int
+
+    def __init__(
+        self, directory: Optional[str] = None, max_size: int = DEFAULT_MAX_SIZE
+    ) -> None:
+        self.directory = directory or default_cache_dir()
+        self.max_size = max_size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.py")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                output = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return output
+
+    def store(self, key: str, output: str) -> None:
+        """Store the output, unless the cache directory can't be written to"""
+        temp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.directory, suffix=".tmp", delete=False
+            ) as f:
+                temp_path = f.name
+                f.write(output)
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            if temp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(temp_path)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        try:
+            with os.scandir(self.directory) as scan:
+                for entry in scan:
+                    if entry.name.endswith(".py"):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Evicted by another process
+                pass
+            total -= size
+
+    def cached(
+        self,
+        digests: Iterable[bytes],
+        options: Dict[str, Any],
+        generate: Callable[[], str],
+    ) -> str:
+        """The cached output for the inputs and options, generating and storing
+        it if it isn't cached.
+        """
+        key = cache_key(digests, options)
+        output = self.get(key)
+        if output is None:
+            output = generate()
+            self.store(key, output)
+        return output
+
+    def get_type_definitions(
+        self, data: Union[str, bytes], json_backend: str = "auto", **options: Any
+    ) -> str:
+        """get_type_definitions of the JSON document `data`, decoded with the
+        JSON backend, from the cache if it was generated before with the same
+        options.
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        return self.cached(
+            [hashlib.sha256(data).digest()],
+            output_options(options),
+            lambda: get_type_definitions(get_loads(json_backend)(data), **options),
+        )
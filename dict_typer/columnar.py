@@ -0,0 +1,269 @@
+from typing import Any, Iterator, List, Optional, Set, Tuple
+
+from dict_typer.accumulator import Shape, shape_of
+from dict_typer.models import DictEntry, Entry, MemberEntry
+from dict_typer.stats import phase
+from dict_typer.type_definitions import DefinitionBuilder, NameMap
+from dict_typer.utils import key_to_class_name
+
+# The base types of the Arrow types matching any of the predicates of
+# pyarrow.types, some of which only newer versions of pyarrow have
+_ARROW_BASE_TYPES = (
+    (("is_null",), "None"),
+    (("is_boolean",), "bool"),
+    (("is_integer",), "int"),
+    (("is_floating",), "float"),
+    (("is_string", "is_large_string", "is_string_view"), "str"),
+    (
+        ("is_binary", "is_large_binary", "is_fixed_size_binary", "is_binary_view"),
+        "bytes",
+    ),
+)
+_ARROW_LISTS = (
+    "is_list",
+    "is_large_list",
+    "is_fixed_size_list",
+    "is_list_view",
+    "is_large_list_view",
+)
+
+# The base types of the kinds of numpy dtypes
+_NUMPY_BASE_TYPES = {
+    "b": "bool",
+    "i": "int",
+    "u": "int",
+    "f": "float",
+    "c": "complex",
+    "S": "bytes",
+    "U": "str",
+}
+
+
+def _is_any(arrow_type: Any, predicates: Tuple[str, ...]) -> bool:
+    import pyarrow.types
+
+    return any(
+        getattr(pyarrow.types, predicate)(arrow_type)
+        for predicate in predicates
+        if hasattr(pyarrow.types, predicate)
+    )
+
+
+def _item_names(builder: DefinitionBuilder, key: str, idx: int) -> Tuple[str, str]:
+    """The key and the name of a dict of the item at `idx` of the sequence
+    named `key`, as they're named when typing the sequence.
+    """
+    return (
+        f"{key}Item{idx}",
+        f"{key_to_class_name(f'{key}Item')}{idx}{builder.type_postfix}",
+    )
+
+
+def _arrow_types(
+    builder: DefinitionBuilder,
+    arrow_type: Any,
+    chunks: List[Any],
+    key: str,
+    type_name: str,
+) -> Set[Entry]:
+    """The types of the values of an Arrow array, given as its chunks, from the
+    Arrow type and the null count.
+
+    Structs are added to the definitions as `type_name`, like a dict value
+    named `key` is when typing the rows.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    types: Set[Entry] = set()
+    length = sum(len(chunk) for chunk in chunks)
+    null_count = sum(chunk.null_count for chunk in chunks)
+    if null_count:
+        types.add(MemberEntry("None"))
+        if null_count == length:
+            return types
+        # Nested values are typed without the ones of the null values
+        chunks = [
+            pc.drop_null(chunk) if chunk.null_count else chunk for chunk in chunks
+        ]
+
+    if pa.types.is_dictionary(arrow_type):
+        return types | _arrow_types(
+            builder,
+            arrow_type.value_type,
+            [chunk.dictionary for chunk in chunks],
+            key,
+            type_name,
+        )
+
+    for predicates, name in _ARROW_BASE_TYPES:
+        if _is_any(arrow_type, predicates):
+            types.add(MemberEntry(name))
+            return types
+
+    if pa.types.is_struct(arrow_type):
+        entry = DictEntry(
+            builder._get_name(type_name), force_alternative=builder.force_alternative
+        )
+        fields = [chunk.flatten() for chunk in chunks]
+        for idx, field in enumerate(arrow_type):
+            entry.members[field.name] = _arrow_types(
+                builder,
+                field.type,
+                [chunk_fields[idx] for chunk_fields in fields],
+                field.name,
+                f"{key_to_class_name(field.name)}{builder.type_postfix}",
+            )
+        types.add(builder._add_definition(entry))
+        return types
+
+    if pa.types.is_map(arrow_type):
+        # Maps are lists of key and value tuples in Python
+        entries_type = pa.list_(
+            pa.struct([arrow_type.key_field, arrow_type.item_field])
+        )
+        entries = [
+            pc.list_flatten(chunk.cast(entries_type)).flatten() for chunk in chunks
+        ]
+        item_key, _ = _item_names(builder, key, 0)
+        tuple_types: Set[Entry] = set()
+        for idx, field in enumerate((arrow_type.key_field, arrow_type.item_field)):
+            tuple_types |= _arrow_types(
+                builder,
+                field.type,
+                [chunk_entries[idx] for chunk_entries in entries],
+                *_item_names(builder, item_key, idx),
+            )
+        types.add(
+            MemberEntry(
+                "List", sub_members={MemberEntry("Tuple", sub_members=tuple_types)}
+            )
+        )
+        return types
+
+    if _is_any(arrow_type, _ARROW_LISTS):
+        item_types = _arrow_types(
+            builder,
+            arrow_type.value_type,
+            [pc.list_flatten(chunk) for chunk in chunks],
+            *_item_names(builder, key, 0),
+        )
+        types.add(MemberEntry("List", sub_members=item_types))
+        return types
+
+    raise NotImplementedError(f"Type handling for '{arrow_type}' not implemented")
+
+
+def _pandas_types(
+    builder: DefinitionBuilder, series: Any, key: str, type_name: str
+) -> Set[Entry]:
+    """The types of the values of a pandas Series, from its dtype and null
+    count, or from each distinct shape of its values for Python objects.
+    """
+    import pandas as pd
+
+    dtype = series.dtype
+    if isinstance(dtype, pd.ArrowDtype):
+        import pyarrow as pa
+
+        array = pa.array(series.array)
+        chunks = array.chunks if isinstance(array, pa.ChunkedArray) else [array]
+        return _arrow_types(builder, dtype.pyarrow_dtype, chunks, key, type_name)
+
+    types: Set[Entry] = set()
+    nulls = series.isna()
+    null_count = int(nulls.sum())
+    if null_count:
+        types.add(MemberEntry("None"))
+        if null_count == len(series):
+            return types
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        return types | _pandas_types(
+            builder, pd.Series(dtype.categories), key, type_name
+        )
+    if isinstance(dtype, pd.StringDtype):
+        types.add(MemberEntry("str"))
+        return types
+    if dtype.kind in _NUMPY_BASE_TYPES:
+        types.add(MemberEntry(_NUMPY_BASE_TYPES[dtype.kind]))
+        return types
+    if dtype.kind != "O":
+        raise NotImplementedError(f"Type handling for '{dtype}' not implemented")
+
+    # Values typed like an earlier one don't change the types
+    shapes: Set[Shape] = set()
+    for value in series[~nulls] if null_count else series:
+        shape = shape_of(value)
+        if shape in shapes:
+            continue
+        shapes.add(shape)
+        if isinstance(value, dict):
+            types.add(builder._get_definition(value, type_name))
+        else:
+            types.add(builder._type_value(value, key, None))
+    return types
+
+
+def _column_types(
+    builder: DefinitionBuilder, table: Any
+) -> Iterator[Tuple[str, Set[Entry]]]:
+    """The name and the types of each column of the table"""
+    if hasattr(table, "schema") and hasattr(table, "column_names"):
+        # Columns of Tables are chunked, the ones of RecordBatches aren't
+        for field, column in zip(table.schema, table.columns):
+            chunks = column.chunks if hasattr(column, "chunks") else [column]
+            yield field.name, _arrow_types(
+                builder,
+                field.type,
+                chunks,
+                field.name,
+                f"{key_to_class_name(field.name)}{builder.type_postfix}",
+            )
+    elif hasattr(table, "dtypes") and hasattr(table, "items"):
+        for name, series in table.items():
+            key = str(name)
+            yield key, _pandas_types(
+                builder, series, key, f"{key_to_class_name(key)}{builder.type_postfix}"
+            )
+    else:
+        raise TypeError(
+            f"Expected a pandas DataFrame or a pyarrow Table or RecordBatch, got "
+            f"{type(table).__name__}"
+        )
+
+
+def get_type_definitions_from_table(
+    table: Any,
+    root_type_name: str = "Root",
+    type_postfix: str = "",
+    show_imports: bool = True,
+    force_alternative: bool = False,
+    name_map: Optional[NameMap] = None,
+) -> str:
+    """Generate the definitions of a row of a pandas DataFrame, or of a pyarrow
+    Table or RecordBatch, named `root_type_name`.
+
+    Columns are typed from their types and null counts rather than row by row,
+    so the rows aren't converted to dicts. Nested Arrow structs, lists and maps
+    are typed from their types, only columns of Python objects are typed from
+    their values, once per distinct shape. Missing values, including NaN and
+    NA, are typed as None.
+    """
+    builder = DefinitionBuilder(
+        None,
+        root_type_name=root_type_name,
+        type_postfix=type_postfix,
+        show_imports=show_imports,
+        force_alternative=force_alternative,
+        name_map=name_map,
+    )
+    with phase("infer"):
+        entry = DictEntry(
+            builder._get_name(f"{key_to_class_name(root_type_name)}{type_postfix}"),
+            force_alternative=force_alternative,
+        )
+        for key, types in _column_types(builder, table):
+            entry.members[key] = types
+        row_type = builder._add_definition(entry)
+    return builder._render(row_type)
@@ -0,0 +1,523 @@
+import hashlib
+import io
+import json
+import os
+import signal
+import sys
+import tempfile
+from contextlib import nullcontext
+from typing import IO, Any, ContextManager, Dict, List, Optional, Sequence, Tuple
+
+import click
+
+from dict_typer import __version__
+from dict_typer.accumulator import SchemaAccumulator
+from dict_typer.batch import (
+    InputError,
+    accumulate_files,
+    expand_paths,
+    open_input,
+    output_name,
+    read_records,
+    type_file,
+    type_files,
+)
+from dict_typer.cache import OutputCache, file_digest, output_options
+from dict_typer.decoding import JSON_BACKENDS, get_loads, paused_gc
+from dict_typer.sampling import SAMPLING_STRATEGIES, Sampling
+from dict_typer.stats import Stats, collect_stats
+
+
+def _save_state(accumulator: SchemaAccumulator, path: str) -> None:
+    """Replace the state file at once, so an interrupted run leaves the old one"""
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(
+        "w", dir=directory, suffix=".tmp", delete=False
+    ) as f:
+        accumulator.dump(f)
+    os.replace(f.name, path)
+
+
+def _open_input(
+    paths: List[str], ndjson: bool, stream: bool
+) -> ContextManager[IO[Any]]:
+    """The file at the only path, or stdin without any, as text with `ndjson`
+    or `stream`, otherwise as bytes.
+    """
+    if not paths or paths[0] == "-":
+        return nullcontext(sys.stdin if ndjson or stream else sys.stdin.buffer)
+    return open_input(paths[0], ndjson, stream)
+
+
+def _type_input(
+    source_file: IO[Any], cache: Optional[OutputCache], options: Dict[str, Any]
+) -> str:
+    """type_file of the input, from the cache unless it's streamed from stdin"""
+    if cache is None or source_file is sys.stdin:
+        return type_file(source_file, **options)
+
+    if source_file is sys.stdin.buffer:
+        data = source_file.read()
+        digest = hashlib.sha256(data).digest()
+        source_file = io.BytesIO(data)
+    else:
+        digest = file_digest(source_file.name)
+    return cache.cached(
+        [digest], output_options(options), lambda: type_file(source_file, **options)
+    )
+
+
+def _write_outputs(
+    paths: List[str],
+    output_dir: str,
+    jobs: int,
+    imports: bool,
+    ndjson: bool,
+    stream: bool,
+    sampling: Optional[Sampling],
+    cache: Optional[OutputCache],
+    json_backend: str,
+    optional_threshold: float,
+) -> None:
+    """Write the definitions of each file on its own to the output directory"""
+    targets: Dict[str, str] = {}
+    for path in paths:
+        target = os.path.join(output_dir, output_name(path))
+        if target in targets:
+            raise click.BadArgumentUsage(
+                f"'{targets[target]}' and '{path}' would both be written to '{target}'"
+            )
+        targets[target] = path
+
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = type_files(
+        paths,
+        workers=jobs,
+        show_imports=imports,
+        ndjson=ndjson,
+        stream=stream,
+        sampling=sampling,
+        cache=cache,
+        json_backend=json_backend,
+        optional_threshold=optional_threshold,
+    )
+    for target, output in zip(targets, outputs):
+        with open(target, "w") as f:
+            f.write(f"{output}\n")
+
+
+def _serve_command() -> click.Command:
+    """The serve command, defined when it's run, as the server takes a while
+    to import
+    """
+    from dict_typer.server import (
+        DEFAULT_BATCH_SIZE,
+        DEFAULT_BATCH_WINDOW,
+        DEFAULT_CACHE_SIZE,
+        DEFAULT_PORT,
+        TypingService,
+        make_server,
+    )
+
+    @click.command()
+    @click.option(
+        "--socket",
+        "socket_path",
+        type=click.Path(dir_okay=False),
+        help="Listen on this Unix socket instead of a TCP port.",
+    )
+    @click.option(
+        "--host", default="127.0.0.1", show_default=True, help="Host to listen on."
+    )
+    @click.option(
+        "--port",
+        type=click.IntRange(0, 65535),
+        default=DEFAULT_PORT,
+        show_default=True,
+        help="Port to listen on.",
+    )
+    @click.option(
+        "--cache-size",
+        type=click.IntRange(min=0),
+        default=DEFAULT_CACHE_SIZE,
+        show_default=True,
+        help="Number of definitions kept in memory.",
+    )
+    @click.option(
+        "--batch-size",
+        type=click.IntRange(min=1),
+        default=DEFAULT_BATCH_SIZE,
+        show_default=True,
+        help="Most requests typed in one batch.",
+    )
+    @click.option(
+        "--batch-window",
+        type=click.FloatRange(min=0),
+        default=DEFAULT_BATCH_WINDOW * 1000,
+        show_default=True,
+        help="Milliseconds to wait for more requests to batch with the first one.",
+    )
+    @click.option(
+        "--json-backend",
+        type=click.Choice(JSON_BACKENDS),
+        default="auto",
+        show_default=True,
+        help="How to decode the payloads, auto uses orjson or msgspec if installed.",
+    )
+    @click.option("--verbose", "-v", is_flag=True, help="Log each request to stderr.")
+    def serve(
+        socket_path: Optional[str],
+        host: str,
+        port: int,
+        cache_size: int,
+        batch_size: int,
+        batch_window: float,
+        json_backend: str,
+        verbose: bool,
+    ) -> None:
+        """Serve the type definitions of JSON payloads over HTTP.
+
+        POST a payload to / for its definitions, options such as root_type_name,
+        type_postfix, show_imports, force_alternative and optional_threshold are
+        passed in the query string. GET /stats for the latency and throughput counters.
+        """
+        try:
+            get_loads(json_backend)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--json-backend")
+
+        service = TypingService(
+            cache_size=cache_size,
+            batch_size=batch_size,
+            batch_window=batch_window / 1000,
+            json_backend=json_backend,
+        )
+        try:
+            server = make_server(service, socket_path, host, port, verbose)
+        except OSError as e:
+            service.close()
+            raise click.ClickException(
+                f"Can't listen on {socket_path or f'{host}:{port}'}: {e}"
+            )
+        # Shut down cleanly when stopped as a daemon too
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        if socket_path is not None:
+            click.echo(f"Serving on {socket_path}", err=True)
+        else:
+            click.echo(f"Serving on http://{host}:{server.server_address[1]}", err=True)  # type: ignore
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            service.close()
+            if socket_path is not None and os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+    return serve
+
+
+class _TypeCommand(click.Command):
+    """Types the files, or starts the server if the first argument is `serve`"""
+
+    def main(  # type: ignore
+        self,
+        args: Optional[Sequence[str]] = None,
+        prog_name: Optional[str] = None,
+        **extra: Any,
+    ) -> Any:
+        args = sys.argv[1:] if args is None else list(args)
+        if args[:1] == ["serve"]:
+            serve = _serve_command()
+            return serve.main(args[1:], f"{prog_name or 'dict-typer'} serve", **extra)
+        return super().main(args, prog_name, **extra)
+
+
+@click.command(cls=_TypeCommand)
+@click.option(
+    "--imports/--no-imports",
+    default=True,
+    help="Show imports at the top, default: True",
+)
+@click.option("--rich", "-r", is_flag=True, help="Show rich output.")
+@click.option(
+    "--line-numbers",
+    "-l",
+    is_flag=True,
+    help="Show line numbers if rich.",
+)
+@click.option(
+    "--ndjson",
+    is_flag=True,
+    help="Read newline delimited JSON, each line is an example of the root type.",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Parse the input incrementally instead of loading the whole document.",
+)
+@click.option(
+    "--sample",
+    type=click.IntRange(min=1),
+    help="Type sequences longer than this from a sample of their items.",
+)
+@click.option(
+    "--sample-strategy",
+    type=click.Choice(SAMPLING_STRATEGIES),
+    default="head",
+    show_default=True,
+    help="How to sample the items of long sequences.",
+)
+@click.option(
+    "--sample-seed", type=int, default=0, help="Seed of the random sampling strategies."
+)
+@click.option(
+    "--optional-threshold",
+    type=click.FloatRange(0, 1),
+    default=1.0,
+    show_default=True,
+    help="Fields of records are optional if they're in less than this share of the records.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of processes typing multiple files or a large list of records, default: 1",
+)
+@click.option(
+    "--state-in",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Add the records to the schema state saved in this file.",
+)
+@click.option(
+    "--state-out",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Save the schema state including the records to this file.",
+)
+@click.option(
+    "--render-state",
+    is_flag=True,
+    help="Render the schema state of --state-in again without reading any input.",
+)
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False, writable=True),
+    help="Write the definitions of each file to a .py file of the same name in this directory.",
+)
+@click.option(
+    "--stats",
+    "show_stats",
+    is_flag=True,
+    help="Print counters and timings of the type inference to stderr.",
+)
+@click.option(
+    "--json-backend",
+    type=click.Choice(JSON_BACKENDS),
+    default="auto",
+    show_default=True,
+    help="How to decode JSON documents, auto uses orjson or msgspec if installed.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Type the input again even if its definitions are in the cache.",
+)
+@click.argument("file", nargs=-1)
+@click.version_option(__version__)
+def cli(
+    file: Tuple[str, ...],
+    imports: bool = True,
+    rich: bool = False,
+    line_numbers: bool = False,
+    ndjson: bool = False,
+    stream: bool = False,
+    sample: Optional[int] = None,
+    sample_strategy: str = "head",
+    sample_seed: int = 0,
+    optional_threshold: float = 1.0,
+    jobs: int = 1,
+    state_in: Optional[str] = None,
+    state_out: Optional[str] = None,
+    render_state: bool = False,
+    output_dir: Optional[str] = None,
+    show_stats: bool = False,
+    json_backend: str = "auto",
+    no_cache: bool = False,
+) -> None:
+    """Generate type definitions of the JSON in FILE, or piped to dict-typer.
+
+    FILE can be given multiple times and may be a glob pattern, the records of
+    all the files are merged into one schema unless --output-dir is given.
+
+    `dict-typer serve` starts a server instead, see `dict-typer serve --help`.
+    """
+    try:
+        paths = expand_paths(file)
+    except ValueError as e:
+        raise click.BadArgumentUsage(str(e))
+    batch = len(paths) > 1 or output_dir is not None
+    for path in paths:
+        if path == "-" and batch:
+            raise click.BadArgumentUsage(
+                "Standard input can't be typed along with other files"
+            )
+        if path != "-" and not os.path.isfile(path):
+            raise click.BadArgumentUsage(f"File '{path}' does not exist")
+
+    use_state = state_in is not None or state_out is not None
+    if ndjson and stream:
+        raise click.BadOptionUsage("stream", "--stream can't be combined with --ndjson")
+    if sample and (ndjson or stream):
+        raise click.BadOptionUsage(
+            "sample", "--sample can't be combined with --ndjson or --stream"
+        )
+    if jobs > 1 and (ndjson or stream) and not batch:
+        raise click.BadOptionUsage(
+            "jobs", "--jobs can't be combined with --ndjson or --stream"
+        )
+    if use_state and (sample or (jobs > 1 and not batch)):
+        raise click.BadOptionUsage(
+            "state_in",
+            "--state-in and --state-out can't be combined with --sample or --jobs",
+        )
+    if output_dir is not None and (use_state or rich):
+        raise click.BadOptionUsage(
+            "output_dir",
+            "--output-dir can't be combined with --state-in, --state-out or --rich",
+        )
+    if sample and batch and output_dir is None:
+        raise click.BadOptionUsage(
+            "sample", "--sample can't be combined with merging multiple files"
+        )
+    try:
+        get_loads(json_backend)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--json-backend")
+    if not paths and output_dir is not None:
+        raise click.BadArgumentUsage("--output-dir needs the paths of the files")
+    if render_state and state_in is None:
+        raise click.BadOptionUsage("render_state", "--render-state needs --state-in")
+    if render_state and paths:
+        raise click.BadArgumentUsage("--render-state doesn't read any files")
+    if not paths and sys.stdin.isatty() and not render_state:
+        raise click.UsageError(
+            "Either provide the path to the file or pipe a file to dict-typer"
+        )
+
+    accumulator = SchemaAccumulator(show_imports=imports)
+    if state_in is not None:
+        try:
+            with open(state_in, "r") as f:
+                accumulator = SchemaAccumulator.load(f, show_imports=imports)
+        except (ValueError, KeyError) as e:
+            raise click.BadParameter(
+                f"Invalid state file: {e}", param_hint="--state-in"
+            )
+
+    sampling = Sampling(sample, sample_strategy, sample_seed) if sample else None
+    stats = Stats() if show_stats else None
+    # Nothing would be counted for cached definitions
+    cache = None if no_cache or show_stats else OutputCache()
+    try:
+        # The command runs on one thread, pausing the collector speeds up decoding
+        with collect_stats(stats), paused_gc():
+            if output_dir is not None:
+                _write_outputs(
+                    paths,
+                    output_dir,
+                    jobs,
+                    imports,
+                    ndjson,
+                    stream,
+                    sampling,
+                    cache,
+                    json_backend,
+                    optional_threshold,
+                )
+                output = None
+            elif render_state:
+                if state_out is not None:
+                    _save_state(accumulator, state_out)
+                output = accumulator.render(optional_threshold)
+            elif batch and not use_state and cache is not None:
+                output = cache.cached(
+                    [file_digest(path) for path in paths],
+                    output_options(
+                        {
+                            "merge": True,
+                            "show_imports": imports,
+                            "ndjson": ndjson,
+                            "stream": stream,
+                            "optional_threshold": optional_threshold,
+                        }
+                    ),
+                    lambda: accumulate_files(
+                        paths,
+                        accumulator,
+                        workers=jobs,
+                        ndjson=ndjson,
+                        stream=stream,
+                        json_backend=json_backend,
+                    ).render(optional_threshold),
+                )
+            elif batch:
+                accumulate_files(
+                    paths,
+                    accumulator,
+                    workers=jobs,
+                    ndjson=ndjson,
+                    stream=stream,
+                    json_backend=json_backend,
+                )
+                if state_out is not None:
+                    _save_state(accumulator, state_out)
+                output = accumulator.render(optional_threshold)
+            else:
+                with _open_input(paths, ndjson, stream) as source_file:
+                    if use_state:
+                        for record in read_records(
+                            source_file, ndjson, stream, json_backend
+                        ):
+                            accumulator.add(record)
+                        if state_out is not None:
+                            _save_state(accumulator, state_out)
+                        output = accumulator.render(optional_threshold)
+                    else:
+                        output = _type_input(
+                            source_file,
+                            cache,
+                            {
+                                "show_imports": imports,
+                                "ndjson": ndjson,
+                                "stream": stream,
+                                "sampling": sampling,
+                                "workers": jobs,
+                                "json_backend": json_backend,
+                                "optional_threshold": optional_threshold,
+                            },
+                        )
+    except json.decoder.JSONDecodeError as e:
+        raise click.UsageError(f"JSON serialisation error \n\n{e}")
+    except InputError as e:
+        raise click.UsageError(f"JSON serialisation error in {e}")
+
+    if output is None:
+        # Written to the output directory
+        pass
+    elif rich:
+        # Only loaded for rich output, it takes longer to import than typing
+        # most inputs
+        from rich.console import Console
+        from rich.syntax import Syntax
+
+        syntax = Syntax(output, "python", theme="monokai", line_numbers=line_numbers)
+        console = Console()
+        console.print(syntax)
+    else:
+        click.echo(output)
+
+    if stats is not None:
+        click.echo(stats.report(), err=True)
@@ -0,0 +1,165 @@
+import contextlib
+import gc
+import json
+import mmap
+import re
+from typing import Any, Callable, Iterator, Tuple, Type, Union
+
+JSON_BACKENDS = ("auto", "orjson", "msgspec", "json")
+
+# Documents are text, bytes or a view of bytes, such as of a memory mapped file
+Document = Union[str, bytes, memoryview]
+Loads = Callable[[Document], Any]
+
+# Integers of this many digits may be out of the 64 bit range, which the fast
+# decoders turn into floats or reject
+_LONG_DIGITS = 19
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"0" * 9)
+_NOT_DIGIT = re.compile(b"[^0]")
+# Scanned a chunk at a time, to not copy whole documents
+_SCAN_CHUNK_SIZE = 1024 * 1024
+
+# The whitespace bytes.strip() strips
+_WHITESPACE = frozenset(b" \t\n\r\x0b\x0c")
+
+
+def strip_whitespace(view: memoryview) -> memoryview:
+    """The view without leading and trailing whitespace, without copying it"""
+    start, end = 0, len(view)
+    while start < end and view[start] in _WHITESPACE:
+        start += 1
+    while end > start and view[end - 1] in _WHITESPACE:
+        end -= 1
+    return view[start:end]
+
+
+def _has_long_integer(data: Union[bytes, memoryview]) -> bool:
+    """Whether the document may have an integer that doesn't fit in 64 bits.
+
+    Runs of digits that are part of the fraction or exponent of a float are
+    skipped, runs within strings or across chunks may not be, which only costs
+    a stdlib decode.
+    """
+    for offset in range(0, len(data), _SCAN_CHUNK_SIZE):
+        # Overlapping the previous chunk, for runs that start in it
+        chunk_start = max(0, offset - _LONG_DIGITS + 1)
+        chunk_end = offset + _SCAN_CHUNK_SIZE
+        chunk = bytes(data[chunk_start:chunk_end])
+        digits = chunk.translate(_DIGITS_TO_ZERO)
+        pos = digits.find(b"0" * _LONG_DIGITS)
+        while pos != -1:
+            match = _NOT_DIGIT.search(digits, pos)
+            end = match.start() if match else len(digits)
+            start = pos - 1 if pos and chunk.startswith(b"-", pos - 1) else pos
+            in_float = chunk.startswith((b".", b"e", b"E"), end) or (
+                start > 0
+                and chunk.startswith((b".", b"e", b"E", b"+", b"-"), start - 1)
+            )
+            if not in_float:
+                return True
+            pos = digits.find(b"0" * _LONG_DIGITS, end)
+    return False
+
+
+def _drop_pages(view: memoryview) -> None:
+    """Let the kernel drop the pages of a read only memory mapped file, they
+    are read from the file again if they're needed.
+    """
+    if (
+        view.readonly
+        and isinstance(view.obj, mmap.mmap)
+        and hasattr(mmap, "MADV_DONTNEED")
+    ):
+        view.obj.madvise(mmap.MADV_DONTNEED)
+
+
+def _json_loads(data: Document) -> Any:
+    if isinstance(data, memoryview):
+        # Decoded to text the same way json.loads decodes bytes, without
+        # copying them first, and parsed without the bytes in memory
+        text = str(data, json.detect_encoding(data[:4].tobytes()), "surrogatepass")
+        _drop_pages(data)
+        return json.loads(text)
+    return json.loads(data)
+
+
+@contextlib.contextmanager
+def paused_gc() -> Iterator[None]:
+    """Pause the cyclic garbage collector, for single threaded programs only.
+
+    Decoded documents have no reference cycles, collecting while their objects
+    are allocated takes about as long as decoding them. The collector is
+    process wide, so library code doesn't pause it itself.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _fast_loads(loads: Loads, errors: Tuple[Type[Exception], ...]) -> Loads:
+    def fast_loads(data: Document) -> Any:
+        # Lone surrogates are kept, for the fast decoders to reject
+        encoded = (
+            data.encode("utf-8", "surrogatepass") if isinstance(data, str) else data
+        )
+        if not _has_long_integer(encoded):
+            try:
+                return loads(encoded)
+            except errors:
+                # Documents the stdlib decodes and the fast decoders don't,
+                # such as NaN or lone surrogates, invalid ones raise the same
+                # error as they would otherwise
+                pass
+        return _json_loads(data)
+
+    return fast_loads
+
+
+def _orjson() -> Loads:
+    import orjson
+
+    return _fast_loads(orjson.loads, (orjson.JSONDecodeError,))
+
+
+def _msgspec() -> Loads:
+    import msgspec
+
+    return _fast_loads(msgspec.json.decode, (msgspec.DecodeError,))
+
+
+_FAST_BACKENDS = {"orjson": _orjson, "msgspec": _msgspec}
+
+
+def get_loads(backend: str = "auto") -> Loads:
+    """The function that decodes JSON documents with the backend.
+
+    - auto: orjson or msgspec, whichever is installed, otherwise json
+    - orjson, msgspec: the decoder, which has to be installed
+    - json: the standard library decoder
+
+    The fast decoders are only used for documents they decode to the same
+    values as the standard library, which decodes the rest, so the backend
+    doesn't change the type definitions or the errors of invalid documents.
+    """
+    if backend not in JSON_BACKENDS:
+        raise ValueError(
+            f"Unknown JSON backend '{backend}', expected one of {', '.join(JSON_BACKENDS)}"
+        )
+    if backend == "json":
+        return _json_loads
+    if backend != "auto":
+        try:
+            return _FAST_BACKENDS[backend]()
+        except ImportError:
+            raise ValueError(f"JSON backend '{backend}' isn't installed")
+
+    for fast_backend in _FAST_BACKENDS.values():
+        try:
+            return fast_backend()
+        except ImportError:
+            continue
+    return _json_loads
@@ -0,0 +1,233 @@
+import json
+import re
+from json.decoder import scanstring  # type: ignore
+from json.scanner import NUMBER_RE
+from typing import Any, Iterator, List, Optional, Protocol, Tuple
+
+Event = Tuple[str, Any]
+
+
+class TextReader(Protocol):
+    def read(self, size: int = ...) -> str:
+        ...
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+# Everything up to the closing quote of a string, skipping escaped characters
+STRING_END_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# Numbers and literals run until whitespace or a structural character
+BARE_TOKEN_RE = re.compile(r'[^ \t\n\r,:\[\]{}"]*')
+LITERALS = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "NaN": float("nan"),
+    "Infinity": float("inf"),
+    "-Infinity": float("-inf"),
+}
+
+# What the tokenizer expects next
+_VALUE = 0
+_VALUE_OR_END = 1
+_KEY = 2
+_KEY_OR_END = 3
+_COLON = 4
+_COMMA_OR_END = 5
+_DONE = 6
+
+
+class _Reader:
+    """A window over a text stream, only the unconsumed part is kept."""
+
+    def __init__(self, stream: TextReader, chunk_size: int) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read more of the stream, returns False at the end of it.
+
+        Reads at least as much as is currently buffered, so a single token
+        spanning many chunks is rescanned a logarithmic number of times.
+        """
+        if self.eof:
+            return False
+        chunk = self.stream.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        consumed = self.pos
+        self.offset += consumed
+        self.buffer = self.buffer[consumed:] + chunk
+        self.pos = 0
+        return True
+
+    def error(self, msg: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(
+            f"{msg} (offset {self.offset + self.pos})", self.buffer, self.pos
+        )
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, empty at the end"""
+        while True:
+            self.pos = WHITESPACE_RE.match(self.buffer, self.pos).end()  # type: ignore
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def string(self) -> str:
+        while not STRING_END_RE.match(self.buffer, self.pos + 1):
+            if not self.fill():
+                raise self.error("Unterminated string")
+        try:
+            value, self.pos = scanstring(self.buffer, self.pos + 1, True)
+        except json.JSONDecodeError as e:
+            self.pos = e.pos
+            raise self.error(e.msg)
+        return value
+
+    def bare_value(self) -> Any:
+        while True:
+            end = BARE_TOKEN_RE.match(self.buffer, self.pos).end()  # type: ignore
+            if end < len(self.buffer) or not self.fill():
+                break
+        start = self.pos
+        token = self.buffer[start:end]
+
+        if token in LITERALS:
+            value = LITERALS[token]
+        else:
+            match = NUMBER_RE.fullmatch(token)
+            if not match:
+                raise self.error("Expecting value")
+            integer, frac, exp = match.groups()
+            value = float(token) if frac or exp else int(integer)
+
+        self.pos = end
+        return value
+
+
+def iter_json_events(
+    stream: TextReader, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Event]:
+    """Parse a JSON document incrementally, yielding an event per token.
+
+    The events are `start_map`, `map_key`, `end_map`, `start_array`,
+    `end_array` and `value`, the latter two carrying the key or the scalar.
+    Only the current chunk of the stream is held in memory.
+    """
+    reader = _Reader(stream, chunk_size)
+    containers: List[str] = []
+    expect = _VALUE
+
+    while True:
+        char = reader.peek()
+        if not char:
+            if expect != _DONE:
+                raise reader.error(
+                    "Unexpected end of data" if containers else "Expecting value"
+                )
+            return
+        if expect == _DONE:
+            raise reader.error("Extra data")
+
+        if expect == _COLON:
+            if char != ":":
+                raise reader.error("Expecting ':' delimiter")
+            reader.pos += 1
+            expect = _VALUE
+            continue
+
+        if expect == _COMMA_OR_END:
+            in_map = containers[-1] == "map"
+            if char == ",":
+                reader.pos += 1
+                expect = _KEY if in_map else _VALUE
+                continue
+            if char != ("}" if in_map else "]"):
+                raise reader.error("Expecting ',' delimiter")
+            reader.pos += 1
+            containers.pop()
+            yield ("end_map" if in_map else "end_array", None)
+            expect = _COMMA_OR_END if containers else _DONE
+            continue
+
+        if expect in (_KEY, _KEY_OR_END):
+            if char == "}" and expect == _KEY_OR_END:
+                reader.pos += 1
+                containers.pop()
+                yield ("end_map", None)
+                expect = _COMMA_OR_END if containers else _DONE
+                continue
+            if char != '"':
+                raise reader.error("Expecting property name enclosed in double quotes")
+            yield ("map_key", reader.string())
+            expect = _COLON
+            continue
+
+        if char == "]" and expect == _VALUE_OR_END:
+            reader.pos += 1
+            containers.pop()
+            yield ("end_array", None)
+            expect = _COMMA_OR_END if containers else _DONE
+        elif char == "{":
+            reader.pos += 1
+            containers.append("map")
+            yield ("start_map", None)
+            expect = _KEY_OR_END
+        elif char == "[":
+            reader.pos += 1
+            containers.append("array")
+            yield ("start_array", None)
+            expect = _VALUE_OR_END
+        else:
+            value = reader.string() if char == '"' else reader.bare_value()
+            yield ("value", value)
+            expect = _COMMA_OR_END if containers else _DONE
+
+
+def build_value(event: Event, events: Iterator[Event]) -> Any:
+    """Build the value starting with `event`, consuming the rest of it from `events`"""
+    stack: List[Any] = []
+    keys: List[Optional[str]] = []
+
+    while True:
+        kind, value = event
+        if kind == "map_key":
+            keys[-1] = value
+        elif kind == "start_map" or kind == "start_array":
+            stack.append({} if kind == "start_map" else [])
+            keys.append(None)
+        else:
+            if kind == "end_map" or kind == "end_array":
+                value = stack.pop()
+                keys.pop()
+            if not stack:
+                return value
+            parent = stack[-1]
+            if isinstance(parent, list):
+                parent.append(value)
+            else:
+                parent[keys[-1]] = value
+        event = next(events)
+
+
+def iter_array_items(events: Iterator[Event]) -> Iterator[Any]:
+    """Build and yield the items of an array, one at a time.
+
+    The `start_array` event has to be consumed already, the remaining events
+    of the document are consumed after the array ends to validate them.
+    """
+    for event in events:
+        if event[0] == "end_array":
+            break
+        yield build_value(event, events)
+
+    for _ in events:
+        pass
@@ -1,6 +1,19 @@
-import functools
-from typing import Any, Dict, List, Optional, Set, TypeVar
-
+import weakref
+from typing import (
+    AbstractSet,
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from dict_typer.stats import current_stats
 from dict_typer.utils import is_valid_key
 
 KNOWN_TYPE_IMPORTS = ("List", "Tuple", "Set", "FrozenSet")
@@ -9,6 +22,7 @@ KNOWN_TYPE_IMPORTS = ("List", "Tuple", "Set", "FrozenSet")
 EntryType = TypeVar("EntryType", "MemberEntry", "DictEntry")
 SubMembers = Set[EntryType]
 DictMembers = Dict[str, SubMembers]
+Entry = Union["MemberEntry", "DictEntry"]
 
 
 def is_valid_name(name: str) -> bool:
@@ -17,9 +31,9 @@ def is_valid_name(name: str) -> bool:
     return name not in KNOWN_TYPE_IMPORTS
 
 
-def sub_members_to_string(sub_members: SubMembers) -> str:
-    def get_member_value(item: EntryType) -> str:
-        """ Only reference DictEntry by name. """
+def sub_members_to_string(sub_members: AbstractSet[Entry]) -> str:
+    def get_member_value(item: Entry) -> str:
+        """Only reference DictEntry by name."""
         if isinstance(item, DictEntry):
             return item.name
         return str(item)
@@ -36,74 +50,182 @@ def sub_members_to_string(sub_members: SubMembers) -> str:
     return ""
 
 
-def sub_members_to_imports(sub_members: SubMembers) -> Set[str]:
-    imports = set()
+def sub_members_to_imports(sub_members: AbstractSet[Entry]) -> Set[str]:
+    return members_to_imports([sub_members])
 
-    for member in sub_members:
-        imports |= member.get_imports()
 
-    if len(sub_members) == 2 and "None" in (sm.name for sm in sub_members):
-        imports.add("Optional")
-    elif len(sub_members) > 1:
-        imports.add("Union")
+def members_to_imports(members: Iterable[AbstractSet[Entry]]) -> Set[str]:
+    """The imports of sets of sub members, including the ones of the entries
+    nested in them.
+
+    Walks the entries with a stack rather than recursion, visiting each entry
+    once, so deeply nested and self referencing entries are fine.
+    """
+    imports = set()
+    seen: Set[int] = set()
+    stack = list(members)
+    while stack:
+        sub_members = stack.pop()
+        if len(sub_members) == 2 and "None" in (sm.name for sm in sub_members):
+            imports.add("Optional")
+        elif len(sub_members) > 1:
+            imports.add("Union")
+
+        for member in sub_members:
+            if id(member) in seen:
+                continue
+            seen.add(id(member))
+            if isinstance(member, DictEntry):
+                stack.extend(member.members.values())
+            else:
+                if member.name in KNOWN_TYPE_IMPORTS:
+                    imports.add(member.name)
+                stack.append(member.sub_members)
 
     return imports
 
 
+def dict_entry_names(entries: Iterable[Entry]) -> Set[str]:
+    """The names of the DictEntries among the entries, including the ones nested
+    in sub members of MemberEntries, but not the members of the DictEntries.
+    """
+    names = set()
+    stack = list(entries)
+    while stack:
+        entry = stack.pop()
+        if isinstance(entry, DictEntry):
+            names.add(entry.name)
+        else:
+            stack.extend(entry.sub_members)
+    return names
+
+
 class MemberEntry:
-    """ A representation of a type with optional sub types.
+    """A representation of a type with optional sub types.
 
     A MemberEntry without subtypes can be considered as a leaf of a tree, in
     most cases it will be a simple unit such as str, int, float, but it can
     also be a List, Set, Tuple, Dict without any known members.
+
+    Entries are immutable values, the string and hash are computed once when
+    the entry is created. Leaves are shared singletons and entries without any
+    DictEntry below them are interned, so equal entries are usually the same
+    object.
     """
 
-    name: str
-    sub_members: SubMembers
+    # No __dict__ per entry, only the weak reference the interning needs
+    __slots__ = (
+        "_name",
+        "_sub_members",
+        "_string",
+        "_hash",
+        "_internable",
+        "__weakref__",
+    )
+
+    _leaves: Dict[str, "MemberEntry"] = {}
+    _interned: "weakref.WeakValueDictionary[str, MemberEntry]" = (
+        weakref.WeakValueDictionary()
+    )
 
-    def __init__(self, name: str, sub_members: Optional[SubMembers] = None,) -> None:
-        self.name = name
-        self.sub_members = sub_members or set()
+    _name: str
+    _sub_members: FrozenSet[Entry]
+    _string: str
+    _hash: int
+    _internable: bool
 
-    def get_imports(self) -> Set[str]:
-        imports = set()
-        if self.name in KNOWN_TYPE_IMPORTS:
-            imports.add(self.name)
+    def __new__(
+        cls,
+        name: str,
+        sub_members: Optional[Iterable[Entry]] = None,
+    ) -> "MemberEntry":
+        if not sub_members:
+            leaf = cls._leaves.get(name)
+            if leaf is None:
+                leaf = cls._leaves[name] = cls._create(name, frozenset(), name, True)
+            return leaf
+
+        frozen_sub_members = frozenset(sub_members)
+        string = f"{name}[{sub_members_to_string(frozen_sub_members)}]"
+        stats = current_stats()
+        if stats is not None:
+            stats.counts["member_entry_renders"] += 1
+        # The string only has the names of DictEntries, not their members
+        internable = all(
+            isinstance(sm, MemberEntry) and sm._internable for sm in frozen_sub_members
+        )
+        if not internable:
+            return cls._create(name, frozen_sub_members, string, False)
+
+        entry = cls._interned.get(string)
+        if entry is None:
+            entry = cls._interned[string] = cls._create(
+                name, frozen_sub_members, string, True
+            )
+        return entry
+
+    @classmethod
+    def _create(
+        cls, name: str, sub_members: FrozenSet[Entry], string: str, internable: bool
+    ) -> "MemberEntry":
+        entry = super().__new__(cls)
+        entry._name = name
+        entry._sub_members = sub_members
+        entry._string = string
+        entry._hash = hash(string)
+        entry._internable = internable
+        stats = current_stats()
+        if stats is not None:
+            stats.counts["member_entry_hashes"] += 1
+        return entry
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def sub_members(self) -> FrozenSet[Entry]:
+        return self._sub_members
 
-        return imports | sub_members_to_imports(self.sub_members)
+    def get_imports(self) -> Set[str]:
+        return members_to_imports([{self}])
 
     @property
     def depends_on(self) -> Set[str]:
         return {sm.name for sm in self.sub_members}
 
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Copies and unpickled entries go through the constructor, to be interned"""
+        return (self.__class__, (self._name, set(self._sub_members)))
+
     def __hash__(self) -> int:
-        return hash(str(self))
+        return self._hash
 
     def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
         if self.__class__ != other.__class__:
             return False
         assert isinstance(other, self.__class__)
 
-        return str(self) == str(other)
+        return self._string == other._string
 
     def __repr__(self) -> str:
         return f"<MemberEntry ({self})>"
 
     def __str__(self) -> str:
-        sub_string = sub_members_to_string(self.sub_members)
-        if sub_string:
-            return f"{self.name}[{sub_string}]"
-
-        return self.name
+        return self._string
 
 
 class DictEntry:
-    """ A representation of a typed dict.
+    """A representation of a typed dict.
 
     A typed dict will have a name and a members map. The value of each member
     is a MemberEntry, which has a name and an optional submembers.
     """
 
+    __slots__ = ("name", "members", "indentation", "force_alternative", "total")
+
     name: str
     members: DictMembers
     indentation: int
@@ -128,10 +250,7 @@ class DictEntry:
         self.total = total
 
     def get_imports(self) -> Set[str]:
-        imports = set()
-        for sub_members in self.members.values():
-            imports |= sub_members_to_imports(sub_members)
-        return imports
+        return members_to_imports(self.members.values())
 
     def update_members(self, members: DictMembers) -> None:
         if set(members.keys()) != self.keys:
@@ -155,10 +274,10 @@ class DictEntry:
         return set.union(*[m.depends_on for m in members], {m.name for m in members})
 
     def __hash__(self) -> int:
-        return hash(str(";".join(self.keys)))
+        return hash(";".join(set(self.members)))
 
     def __eq__(self, other: Any) -> bool:
-        """ DictEntries are equal if the keys are equal.
+        """DictEntries are equal if the keys are equal.
 
         The name and the values of each key don't matter, since the the name is
         just for the python type and the values are to know what type the keys
@@ -188,7 +307,7 @@ class DictEntry:
                         f'{" " * self.indentation}"{key}": {sub_members_to_string(value)},'
                     )
 
-                out.append(f"}}{total_param})")  
+                out.append(f"}}{total_param})")
         else:
             total_param = ", total=False" if not self.total else ""
             out.append(f"class {self.name}(TypedDict{total_param}):")
@@ -201,37 +320,3 @@ class DictEntry:
                     )
 
         return "\n".join(out)
-
-
-@functools.total_ordering
-class DependencyCmp:
-    _name: str
-    _depends_on: Set[str]
-
-    def __init__(self, obj: EntryType) -> None:
-        self._name = obj.name
-        self._depends_on = obj.depends_on
-
-    def __lt__(self, other: Any) -> bool:
-        """ Considered less if other depends on it """
-        if self.__class__ != other.__class__:
-            raise TypeError(
-                "DependencyCmp comparison only supports comparing to other instances of DependencyCmp"
-            )
-        assert isinstance(other, self.__class__)
-
-        return self._name in other._depends_on
-
-    def __eq__(self, other: Any) -> bool:
-        """ Considered equal if other doesn't depend on it """
-        if self.__class__ != other.__class__:
-            raise TypeError(
-                "DependencyCmp comparison only supports comparing to other instances of DependencyCmp"
-            )
-        assert isinstance(other, self.__class__)
-
-        return self._name not in other._depends_on
-
-
-def key_to_dependency_cmp(entry: Any) -> DependencyCmp:
-    return DependencyCmp(entry)
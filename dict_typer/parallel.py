@@ -0,0 +1,55 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+from dict_typer.accumulator import SchemaAccumulator
+
+# Below this many records per worker, the pool costs more than it saves
+MIN_RECORDS_PER_WORKER = 1000
+
+
+def _accumulate_shard(records: List[Any], options: Dict[str, Any]) -> SchemaAccumulator:
+    accumulator = SchemaAccumulator(**options)
+    for record in records:
+        accumulator.add(record)
+    return accumulator
+
+
+def get_type_definitions_parallel(
+    records: List[Any],
+    workers: int,
+    root_type_name: str = "Root",
+    type_postfix: str = "",
+    show_imports: bool = True,
+    force_alternative: bool = False,
+    optional_threshold: float = 1.0,
+) -> str:
+    """Generate the same definitions as get_type_definitions for a list of
+    records, spreading the work over a pool of processes.
+
+    Each worker types a shard of the records in a SchemaAccumulator and sends
+    back its partial schema, the merged definitions and their statistics
+    without any of the records. The partial schemas are merged in order in the
+    main process, which keeps the output identical to typing every record.
+
+    Name maps aren't supported, as they can tell records apart by index.
+    """
+    options: Dict[str, Any] = {
+        "root_type_name": root_type_name,
+        "type_postfix": type_postfix,
+        "show_imports": show_imports,
+        "force_alternative": force_alternative,
+    }
+    shard_size = max(1, -(-len(records) // (workers * 4)))
+    shards = []
+    for start in range(0, len(records), shard_size):
+        end = start + shard_size
+        shards.append(records[start:end])
+
+    accumulator = SchemaAccumulator(**options)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for shard_accumulator in executor.map(
+            _accumulate_shard, shards, [options] * len(shards)
+        ):
+            accumulator.merge(shard_accumulator)
+
+    return accumulator.render(optional_threshold=optional_threshold)
@@ -0,0 +1,80 @@
+import itertools
+import random
+from typing import Any, Collection, Iterable, List, Sequence, Tuple
+
+SAMPLING_STRATEGIES = ("head", "reservoir", "stratified")
+
+
+class Sampling:
+    """How to sample the items of sequences longer than `size`.
+
+    - head: the first `size` items
+    - reservoir: a uniform random sample of `size` items
+    - stratified: the first and the last item, and one random item from each of
+      `size - 2` equally long stretches in between
+
+    The random strategies are seeded, so the same sequence is sampled the same
+    way each time. Sampled items keep their position in the original sequence.
+    """
+
+    def __init__(self, size: int, strategy: str = "head", seed: int = 0) -> None:
+        if size < 1:
+            raise ValueError(f"Sample size has to be at least 1, got {size}")
+        if strategy not in SAMPLING_STRATEGIES:
+            raise ValueError(
+                f"Unknown sampling strategy '{strategy}', expected one of "
+                f"{', '.join(SAMPLING_STRATEGIES)}"
+            )
+        self.size = size
+        self.strategy = strategy
+        self.seed = seed
+
+    def __repr__(self) -> str:
+        return f"Sampling({self.size}, strategy={self.strategy!r}, seed={self.seed})"
+
+    def describe(self) -> str:
+        """A comment line stating how the output was sampled"""
+        strategy = self.strategy
+        if strategy != "head":
+            strategy += f", seed {self.seed}"
+        return (
+            f"# Types inferred from a sample of at most {self.size} items "
+            f"per sequence ({strategy})"
+        )
+
+    def indexes(self, length: int) -> Iterable[int]:
+        """The sorted positions to sample out of a sequence of `length` items"""
+        if length <= self.size or self.strategy == "head":
+            return range(min(length, self.size))
+
+        rng = random.Random(self.seed)
+        if self.strategy == "reservoir":
+            # Equivalent to a reservoir sample, without visiting every position
+            return sorted(rng.sample(range(length), self.size))
+
+        if self.size == 1:
+            return [0]
+        strata = self.size - 2
+        picks = [0]
+        for stratum in range(strata):
+            start = 1 + stratum * (length - 2) // strata
+            end = 1 + (stratum + 1) * (length - 2) // strata
+            picks.append(rng.randrange(start, end))
+        picks.append(length - 1)
+        return picks
+
+    def sample(self, items: Collection[Any]) -> List[Tuple[int, Any]]:
+        """The sampled items along with their positions"""
+        if isinstance(items, Sequence):
+            return [(idx, items[idx]) for idx in self.indexes(len(items))]
+
+        # Sets can't be indexed, walk them up to the last sampled position
+        wanted = list(self.indexes(len(items)))
+        if not wanted:
+            return []
+        selected = set(wanted)
+        return [
+            (idx, value)
+            for idx, value in enumerate(itertools.islice(items, wanted[-1] + 1))
+            if idx in selected
+        ]
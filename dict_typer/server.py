@@ -0,0 +1,370 @@
+import errno
+import hashlib
+import http.client
+import json
+import os
+import queue
+import socket
+import socketserver
+import stat
+import threading
+import time
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from dict_typer.cache import cache_key, output_options
+from dict_typer.decoding import get_loads
+from dict_typer.type_definitions import get_type_definitions
+
+DEFAULT_PORT = 8750
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_BATCH_SIZE = 64
+# Seconds to wait for more requests to batch with the first one
+DEFAULT_BATCH_WINDOW = 0.002
+
+# Latencies kept for the percentiles of the counters
+_LATENCY_WINDOW = 1000
+
+_BOOLEANS = {
+    "1": True,
+    "true": True,
+    "yes": True,
+    "0": False,
+    "false": False,
+    "no": False,
+}
+
+
+class ServerCounters:
+    """Latency and throughput counters of a server, safe to update from the
+    threads of its requests.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self._latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def request(self, latency: float, error: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.errors += error
+            self._latencies.append(latency)
+
+    def batch(self, size: int, hits: int, misses: int) -> None:
+        with self._lock:
+            self.batches += 1
+            self.batched_requests += size
+            self.cache_hits += hits
+            self.cache_misses += misses
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            uptime = time.monotonic() - self.started
+            latencies = sorted(self._latencies)
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            return (
+                latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+                * 1000
+            )
+
+        return {
+            "uptime_s": uptime,
+            "requests": self.requests,
+            "errors": self.errors,
+            "requests_per_s": self.requests / uptime if uptime else 0.0,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "batches": self.batches,
+            "mean_batch_size": self.batched_requests / self.batches
+            if self.batches
+            else 0.0,
+            "latency_ms": {
+                "p50": percentile(0.5),
+                "p90": percentile(0.9),
+                "p99": percentile(0.99),
+                "max": latencies[-1] * 1000 if latencies else 0.0,
+            },
+        }
+
+
+# The HTTP status and the definitions or the error
+Response = Tuple[int, str]
+
+
+class _Request:
+    __slots__ = ("key", "data", "options", "done", "response")
+
+    def __init__(self, key: str, data: bytes, options: Dict[str, Any]) -> None:
+        self.key = key
+        self.data = data
+        self.options = options
+        self.done = threading.Event()
+        self.response: Response = (500, "")
+
+
+class TypingService:
+    """Types JSON payloads on a worker thread, in batches of the requests that
+    arrive within `batch_window` seconds of each other.
+
+    Requests for the same payload and options in a batch are typed once, and
+    the definitions of the last `cache_size` distinct requests are kept in
+    memory.
+    """
+
+    def __init__(
+        self,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        json_backend: str = "auto",
+    ) -> None:
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.counters = ServerCounters()
+
+        self._loads = get_loads(json_backend)
+        self._cache: "OrderedDict[str, Response]" = OrderedDict()
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        # Requests are only queued while the service is open
+        self._closed = False
+        self._closing_lock = threading.Lock()
+        self._worker = threading.Thread(
+            target=self._run, name="dict-typer-batches", daemon=True
+        )
+        self._worker.start()
+
+    def type_payload(self, data: bytes, options: Dict[str, Any]) -> Response:
+        """The definitions of the JSON payload, or the error if it isn't valid.
+
+        Payloads sent after the service is closed get a 503 response.
+        """
+        start = time.perf_counter()
+        key = cache_key([hashlib.sha256(data).digest()], output_options(options))
+        request = _Request(key, data, options)
+        with self._closing_lock:
+            closed = self._closed
+            if not closed:
+                self._queue.put(request)
+        if closed:
+            request.response = (503, "The service is closed")
+        else:
+            request.done.wait()
+        self.counters.request(time.perf_counter() - start, request.response[0] != 200)
+        return request.response
+
+    def close(self) -> None:
+        with self._closing_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join()
+
+    def _next_batch(self) -> Optional[List[_Request]]:
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.batch_size:
+            try:
+                request = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if request is None:
+                # Close after this batch
+                self._queue.put(None)
+                break
+            batch.append(request)
+        return batch
+
+    def _type(self, request: _Request) -> Response:
+        try:
+            source = self._loads(request.data)
+        except ValueError as e:
+            return 400, f"JSON serialisation error \n\n{e}"
+        return 200, get_type_definitions(source, **request.options)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            hits = misses = 0
+            responses: Dict[str, Response] = {}
+            for request in batch:
+                if request.key in responses:
+                    hits += 1
+                elif request.key in self._cache:
+                    self._cache.move_to_end(request.key)
+                    responses[request.key] = self._cache[request.key]
+                    hits += 1
+                else:
+                    misses += 1
+                    try:
+                        responses[request.key] = self._type(request)
+                    except Exception as e:
+                        # Not cached, and the other requests are still served
+                        responses[request.key] = (500, f"{type(e).__name__}: {e}")
+                    else:
+                        self._cache[request.key] = responses[request.key]
+                        if len(self._cache) > self.cache_size:
+                            self._cache.popitem(last=False)
+                request.response = responses[request.key]
+            self.counters.batch(len(batch), hits, misses)
+            for request in batch:
+                request.done.set()
+
+
+def _parse_options(query: str) -> Dict[str, Any]:
+    options: Dict[str, Any] = {}
+    for name, values in parse_qs(query, keep_blank_values=True).items():
+        value = values[-1]
+        if name in ("root_type_name", "type_postfix"):
+            options[name] = value
+        elif name in ("show_imports", "force_alternative"):
+            if value.lower() not in _BOOLEANS:
+                raise ValueError(f"Invalid value for {name}: '{value}'")
+            options[name] = _BOOLEANS[value.lower()]
+        elif name == "optional_threshold":
+            try:
+                options[name] = float(value)
+            except ValueError:
+                raise ValueError(f"Invalid value for {name}: '{value}'")
+            if not 0 <= options[name] <= 1:
+                raise ValueError(
+                    f"Invalid value for {name}: '{value}', has to be between 0 and 1"
+                )
+        else:
+            raise ValueError(f"Unknown option '{name}'")
+    return options
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_ServerMixin"  # type: ignore
+    protocol_version = "HTTP/1.1"
+
+    def _respond(
+        self, status: int, body: str, content_type: str = "text/plain"
+    ) -> None:
+        encoded = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def do_GET(self) -> None:  # noqa: N802
+        if urlsplit(self.path).path == "/stats":
+            self._respond(
+                200,
+                json.dumps(self.server.service.counters.as_dict()),
+                "application/json",
+            )
+        else:
+            self._respond(404, "Not found, POST JSON to / or GET /stats\n")
+
+    def do_POST(self) -> None:  # noqa: N802
+        url = urlsplit(self.path)
+        data = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if url.path != "/":
+            self._respond(404, "Not found, POST JSON to / or GET /stats\n")
+            return
+        try:
+            options = _parse_options(url.query)
+        except ValueError as e:
+            self._respond(400, f"{e}\n")
+            return
+
+        status, body = self.server.service.type_payload(data, options)
+        self._respond(
+            status, f"{body}\n", "text/x-python" if status == 200 else "text/plain"
+        )
+
+    def address_string(self) -> str:
+        # Unix socket clients don't have an address
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class _ServerMixin:
+    service: TypingService
+    verbose: bool = False
+    # Connections waiting to be accepted, for bursts of concurrent requests
+    request_queue_size = 128
+
+
+class TypingHTTPServer(_ServerMixin, ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class TypingUnixServer(_ServerMixin, socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        # Replace the socket of a server that didn't shut down cleanly, but
+        # never anything else at the path
+        path: str = self.server_address  # type: ignore
+        try:
+            mode = os.lstat(path).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(mode):
+                raise FileExistsError(
+                    errno.EEXIST, "Not replacing a file that isn't a socket", path
+                )
+            os.unlink(path)
+        super().server_bind()
+
+
+def make_server(
+    service: TypingService,
+    socket_path: Optional[str] = None,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    verbose: bool = False,
+) -> socketserver.BaseServer:
+    """A server of the service over HTTP, on the Unix socket if a path is given,
+    otherwise on the host and port.
+    """
+    server: socketserver.BaseServer
+    if socket_path is not None:
+        server = TypingUnixServer(socket_path, _Handler)
+    else:
+        server = TypingHTTPServer((host, port), _Handler)
+    server.service = service  # type: ignore
+    server.verbose = verbose  # type: ignore
+    return server
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """An HTTP connection over a Unix socket, to talk to a server started with
+    a socket path.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 30.0) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
@@ -0,0 +1,93 @@
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, ContextManager, Dict, Iterator, Optional
+
+# The phases of a run, in the order they happen
+PHASES = ("parse", "infer", "merge", "sort", "render")
+
+# Counters, in the order they are reported
+COUNTERS = (
+    "get_type_calls",
+    "definitions_added",
+    "definition_comparisons",
+    "definition_merges",
+    "fingerprint_hits",
+    "name_collision_retries",
+    "member_entry_renders",
+    "member_entry_hashes",
+    "dict_entry_hashes",
+)
+
+_current: "ContextVar[Optional[Stats]]" = ContextVar("dict_typer_stats", default=None)
+
+
+class Stats:
+    """Counters and wall time per phase of the inference internals.
+
+    Collected from everything typed within `collect_stats`, builders look the
+    current Stats up once when they're created, so nothing is counted or timed
+    when no Stats is being collected. Work done in other processes, such as the
+    workers of get_type_definitions, isn't collected.
+    """
+
+    counts: "Counter[str]"
+    timings: Dict[str, float]
+
+    def __init__(self) -> None:
+        self.counts = Counter()
+        self.timings = dict.fromkeys(PHASES, 0.0)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the wall time spent in the block to the phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = (
+                self.timings.get(name, 0.0) + time.perf_counter() - start
+            )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "counts": {name: self.counts[name] for name in COUNTERS},
+            "timings": dict(self.timings),
+        }
+
+    def report(self) -> str:
+        width = max(map(len, COUNTERS + PHASES))
+        lines = ["Phase timings (ms):"]
+        lines += [
+            f"  {name:<{width}}  {seconds * 1000:10.3f}"
+            for name, seconds in self.timings.items()
+        ]
+        lines.append("Counters:")
+        lines += [f"  {name:<{width}}  {self.counts[name]:10d}" for name in COUNTERS]
+        return "\n".join(lines)
+
+
+def current_stats() -> Optional[Stats]:
+    """The Stats being collected, if any"""
+    return _current.get()
+
+
+@contextmanager
+def collect_stats(stats: Optional[Stats]) -> Iterator[Optional[Stats]]:
+    """Collect the counters and timings of everything typed within the block,
+    or nothing if `stats` is None.
+    """
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def phase(name: str) -> ContextManager[None]:
+    """Time the block as the phase if Stats are being collected"""
+    stats = _current.get()
+    if stats is None:
+        return nullcontext()
+    return stats.phase(name)
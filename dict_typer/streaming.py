@@ -0,0 +1,198 @@
+import itertools
+import json
+from collections import defaultdict
+from typing import IO, Any, Dict, Iterable, Iterator, Optional
+
+from dict_typer.events import (
+    DEFAULT_CHUNK_SIZE,
+    TextReader,
+    build_value,
+    iter_array_items,
+    iter_json_events,
+)
+from dict_typer.models import DictEntry
+from dict_typer.stats import phase
+from dict_typer.type_definitions import (
+    DefinitionBuilder,
+    NameMap,
+    _check_optional_threshold,
+    _counts_suggest_examples,
+    _RecordTypes,
+)
+
+
+def iter_ndjson(stream: Iterable[str]) -> Iterator[Any]:
+    """Yield one decoded record per non blank line"""
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise json.JSONDecodeError(f"{e.msg} (line {line_number})", e.doc, e.pos)
+
+
+def iter_json_records(
+    stream: TextReader, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Any]:
+    """Yield the items of a JSON array parsed incrementally, one at a time, or
+    the whole document if it isn't an array.
+    """
+    events = iter_json_events(stream, chunk_size)
+    first = next(events)
+    if first[0] == "start_array":
+        yield from iter_array_items(events)
+        return
+
+    yield build_value(first, events)
+    for _ in events:
+        pass
+
+
+class _RecordStats:
+    """The statistics deciding if records are examples of one schema"""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.empty_count = 0
+        self.all_dicts = True
+        self.field_counts: Dict[str, int] = defaultdict(int)
+
+    def add(self, record: Any) -> None:
+        self.total += 1
+        if not self.all_dicts:
+            return
+        if not isinstance(record, dict):
+            self.all_dicts = False
+            return
+        if not record:
+            self.empty_count += 1
+        for field in record.keys():
+            self.field_counts[field] += 1
+
+    def update(self, other: "_RecordStats") -> None:
+        """Add the statistics of records following the ones seen so far"""
+        self.total += other.total
+        self.all_dicts = self.all_dicts and other.all_dicts
+        self.empty_count += other.empty_count
+        for field, count in other.field_counts.items():
+            self.field_counts[field] += count
+
+    def suggest_examples(self) -> bool:
+        return self.all_dicts and _counts_suggest_examples(
+            self.total, self.empty_count, self.field_counts
+        )
+
+
+def get_type_definitions_from_records(
+    records: Iterable[Any],
+    root_type_name: str = "Root",
+    type_postfix: str = "",
+    show_imports: bool = True,
+    force_alternative: bool = False,
+    name_map: Optional[NameMap] = None,
+    optional_threshold: float = 1.0,
+) -> str:
+    """Generate the same definitions as get_type_definitions would for the list
+    of all the records, without holding the records in memory.
+
+    The records are read once, one at a time. Each one is typed as a list item,
+    and merged into the examples of one schema when it's a dict, along with
+    the statistics deciding which of the two the output is.
+    """
+    _check_optional_threshold(optional_threshold)
+    stats = _RecordStats()
+    record_types = _RecordTypes(
+        root_type_name=root_type_name,
+        type_postfix=type_postfix,
+        force_alternative=force_alternative,
+        name_map=name_map,
+    )
+    for idx, record in enumerate(records):
+        stats.add(record)
+        record_types.add(record, idx)
+
+    return record_types.render(
+        as_examples=stats.suggest_examples(),
+        total=stats.total,
+        empty_count=stats.empty_count,
+        show_imports=show_imports,
+        optional_threshold=optional_threshold,
+    )
+
+
+def get_type_definitions_from_ndjson(
+    stream: IO[str],
+    root_type_name: str = "Root",
+    type_postfix: str = "",
+    show_imports: bool = True,
+    force_alternative: bool = False,
+    name_map: Optional[NameMap] = None,
+    optional_threshold: float = 1.0,
+) -> str:
+    """Generate definitions from newline delimited JSON, one record per line.
+
+    The output is the same as get_type_definitions for the list of records.
+    The stream is read once, so memory use does not grow with the input.
+    """
+    return get_type_definitions_from_records(
+        iter_ndjson(stream),
+        root_type_name=root_type_name,
+        type_postfix=type_postfix,
+        show_imports=show_imports,
+        force_alternative=force_alternative,
+        name_map=name_map,
+        optional_threshold=optional_threshold,
+    )
+
+
+def get_type_definitions_from_json_stream(
+    stream: IO[str],
+    root_type_name: str = "Root",
+    type_postfix: str = "",
+    show_imports: bool = True,
+    force_alternative: bool = False,
+    name_map: Optional[NameMap] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    optional_threshold: float = 1.0,
+) -> str:
+    """Generate definitions from a JSON document parsed incrementally.
+
+    The output is the same as get_type_definitions for the parsed document.
+    Objects and scalars are typed token by token. The items of a root array
+    are built and typed one at a time, like newline delimited JSON.
+    """
+    events = iter_json_events(stream, chunk_size)
+    first = next(events)
+
+    if first[0] == "start_array":
+        return get_type_definitions_from_records(
+            iter_array_items(events),
+            root_type_name=root_type_name,
+            type_postfix=type_postfix,
+            show_imports=show_imports,
+            force_alternative=force_alternative,
+            name_map=name_map,
+            optional_threshold=optional_threshold,
+        )
+
+    builder = DefinitionBuilder(
+        None,
+        root_type_name=root_type_name,
+        type_postfix=type_postfix,
+        show_imports=show_imports,
+        force_alternative=force_alternative,
+        name_map=name_map,
+    )
+    with phase("infer"):
+        source_type = builder._get_type_from_events(
+            itertools.chain([first], events), key=root_type_name
+        )
+        # Validate that nothing follows the document
+        for _ in events:
+            pass
+
+        if isinstance(source_type, DictEntry):
+            builder._add_definition(source_type)
+    return builder._render(source_type)
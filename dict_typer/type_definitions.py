@@ -1,13 +1,33 @@
-from typing import Any, Dict, List, Optional, Set, Tuple, Type, Union
-from collections import defaultdict
+import itertools
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
+from dict_typer.events import Event
 from dict_typer.models import (
     DictEntry,
+    Entry,
     MemberEntry,
-    key_to_dependency_cmp,
-    sub_members_to_imports,
+    dict_entry_names,
+    members_to_imports,
     sub_members_to_string,
 )
+from dict_typer.sampling import Sampling
+from dict_typer.stats import Stats, current_stats, phase
 from dict_typer.utils import key_to_class_name
 
 BASE_TYPES: Tuple[Type, ...] = (  # type: ignore
@@ -30,6 +50,167 @@ BASE_TYPES: Tuple[Type, ...] = (  # type: ignore
 
 Source = Union[str, int, float, bool, None, Dict, List]
 NameMap = Dict[str, str]
+# The keys of a dict and the types of its values, in order
+Fingerprint = Tuple[Tuple[Any, ...], Tuple[type, ...]]
+# The mapped type name, or the base if it's a list item type, and a fingerprint
+FingerprintKey = Tuple[Optional[str], Optional[str], Fingerprint]
+# The type name, or the base if it's a list item type, and the keys of a dict
+MergeKey = Tuple[Optional[str], Optional[str], FrozenSet[str]]
+
+
+# The suffix of the temporary names of example definitions
+_TEMP_SUFFIX_RE = re.compile(r"_temp_\d+")
+
+
+def _list_item_base(name: str) -> Optional[str]:
+    """The base of a list item type name, "Foo" for "FooItem0", or None if the
+    name isn't a list item type name.
+    """
+    if "Item" not in name:
+        return None
+    parts = name.split("Item")
+    if not any(c.isdigit() for c in parts[-1]):
+        return None
+    return parts[0]
+
+
+def _merge_key(name: str, keys: FrozenSet[str]) -> MergeKey:
+    """What decides the definition a dict typed as `name` is merged into, see
+    _add_definition_at: its keys and the base of the name for list item types,
+    or the whole name if numbering it to make it unique would change its base.
+    """
+    return (*_merge_name(name), keys)
+
+
+@lru_cache(maxsize=1024)
+def _merge_name(name: str) -> Tuple[Optional[str], Optional[str]]:
+    base = _list_item_base(name)
+    if base != _list_item_base(f"{name}1"):
+        return (name, None)
+    return (None, base)
+
+
+def _map_entry(entry: Entry, replace: Callable[[DictEntry], DictEntry]) -> Entry:
+    """The entry with the DictEntries in it replaced by what `replace` returns
+    for them, rebuilding the MemberEntries holding them.
+
+    Nested entries are walked with a stack rather than recursion, like values
+    are typed.
+    """
+    if isinstance(entry, DictEntry):
+        return replace(entry)
+    if entry._internable:
+        # No DictEntry below it
+        return entry
+
+    mapped: Dict[int, Entry] = {}
+    stack = [entry]
+    while stack:
+        current = stack[-1]
+        pending = [
+            sub_member
+            for sub_member in current.sub_members
+            if isinstance(sub_member, MemberEntry)
+            and not sub_member._internable
+            and id(sub_member) not in mapped
+        ]
+        if pending:
+            stack.extend(pending)
+            continue
+
+        stack.pop()
+        sub_members: Set[Entry] = set()
+        for sub_member in current.sub_members:
+            if isinstance(sub_member, DictEntry):
+                sub_members.add(replace(sub_member))
+            elif sub_member._internable:
+                sub_members.add(sub_member)
+            else:
+                sub_members.add(mapped[id(sub_member)])
+        mapped[id(current)] = MemberEntry(current.name, sub_members=sub_members)
+    return mapped[id(entry)]
+
+
+def _dump_type(entry: Entry, dump_definition: Callable[[DictEntry], Any]) -> Any:
+    """The entry as a JSON value: leaves by name, other MemberEntries as their
+    name and sub members, DictEntries as `dump_definition` returns them.
+    """
+    if isinstance(entry, DictEntry):
+        return dump_definition(entry)
+    if not entry.sub_members:
+        return entry.name
+    return [
+        entry.name,
+        [_dump_type(sub_member, dump_definition) for sub_member in entry.sub_members],
+    ]
+
+
+def _load_type(value: Any, load_definition: Callable[[Any], DictEntry]) -> Entry:
+    """The entry _dump_type returned `value` for"""
+    if isinstance(value, str):
+        return MemberEntry(value)
+    if isinstance(value, list):
+        name, sub_members = value
+        return MemberEntry(
+            name, sub_members={_load_type(sm, load_definition) for sm in sub_members}
+        )
+    return load_definition(value)
+
+
+class _EventFrame:
+    """An open map or array while typing from events"""
+
+    __slots__ = ("entry", "key", "item_types", "idx")
+
+    entry: Optional[DictEntry]
+    key: str
+    item_types: Set[Union[MemberEntry, DictEntry]]
+    idx: int
+
+    def __init__(self, entry: Optional[DictEntry] = None, key: str = "") -> None:
+        self.entry = entry
+        self.key = key
+        self.item_types = set()
+        self.idx = 0
+
+
+class _TypeFrame:
+    """A dict or sequence being typed by DefinitionBuilder._type_value"""
+
+    __slots__ = (
+        "items",
+        "key",
+        "entry",
+        "sequence_type_name",
+        "item_types",
+        "dependencies",
+        "dct",
+        "cache_key",
+    )
+
+    # The keys and values of a dict, or the indexes and items of a sequence
+    items: Iterator[Tuple[Any, Any]]
+    # The key of the sequence, or of the dict value being typed
+    key: str
+    # The DictEntry of a dict, None for a sequence
+    entry: Optional[DictEntry]
+    sequence_type_name: str
+    item_types: Set[Union[MemberEntry, DictEntry]]
+    # The dependencies of the definition the container values of a dict are
+    # folded into, when it's typed like an earlier dict
+    dependencies: Optional[Set[str]]
+    # The dict and its fingerprint key, to add the entry to the definitions
+    dct: Optional[Dict]
+    cache_key: Optional[FingerprintKey]
+
+    def __init__(
+        self, items: Iterator[Tuple[Any, Any]], key: str, entry: Optional[DictEntry]
+    ) -> None:
+        self.items = items
+        self.key = key
+        self.entry = entry
+        self.dependencies = None
+        self.dct = None
 
 
 class DefinitionBuilder:
@@ -39,9 +220,26 @@ class DefinitionBuilder:
     show_imports: bool
     source: Source
     name_map: NameMap
+    sampling: Optional[Sampling]
+    # Set once a sequence has been typed from a sample of its items
+    sampled: bool
+    # The Stats being collected when the builder was created
+    stats: Optional[Stats]
 
     _output: Optional[str] = None
 
+    # Index of the definitions by key set and by name, with their positions
+    _definitions_by_keys: Dict[FrozenSet[str], List[Tuple[int, DictEntry]]]
+    _definitions_by_name: Dict[str, Tuple[int, DictEntry]]
+    _rename_hints: Dict[str, int]
+    # The names of the definitions each definition depends on, by position
+    _dependencies: List[Set[str]]
+    _indexed: Optional[List[DictEntry]]
+    _indexed_count: int
+    # The definitions dicts were merged into, with their position and the keys
+    # holding containers, by the name and fingerprint of the dicts
+    _fingerprints: Dict[FingerprintKey, Tuple[int, DictEntry, Tuple[Any, ...]]]
+
     def __init__(
         self,
         source: Source,
@@ -51,8 +249,11 @@ class DefinitionBuilder:
         show_imports: bool = True,
         force_alternative: bool = False,
         name_map: Optional[NameMap] = None,
+        sampling: Optional[Sampling] = None,
     ) -> None:
         self.definitions = []
+        self._indexed = None
+        self._indexed_count = 0
 
         self.root_type_name = root_type_name
         self.type_postfix = type_postfix
@@ -62,6 +263,9 @@ class DefinitionBuilder:
             self.name_map = name_map
         else:
             self.name_map = {}
+        self.sampling = sampling
+        self.sampled = False
+        self.stats = current_stats()
 
         self.source = source
 
@@ -69,212 +273,894 @@ class DefinitionBuilder:
         """Return the mapped name if it exist"""
         return self.name_map.get(name, name)
 
+    def _sync_index(self) -> None:
+        """Rebuild the definition index if the definitions were replaced or
+        changed outside of _add_definition.
+        """
+        if self._indexed is self.definitions and self._indexed_count == len(
+            self.definitions
+        ):
+            return
+
+        self._definitions_by_keys = defaultdict(list)
+        self._definitions_by_name = {}
+        self._rename_hints = {}
+        self._dependencies = []
+        self._fingerprints = {}
+        for position, definition in enumerate(self.definitions):
+            if isinstance(definition, DictEntry):
+                self._index_definition(position, definition)
+            else:
+                self._dependencies.append(set())
+        self._indexed = self.definitions
+        self._indexed_count = len(self.definitions)
+
+    def _index_definition(self, position: int, definition: DictEntry) -> None:
+        self._definitions_by_keys[frozenset(definition.members)].append(
+            (position, definition)
+        )
+        self._definitions_by_name.setdefault(definition.name, (position, definition))
+        self._dependencies.append(
+            dict_entry_names(itertools.chain.from_iterable(definition.members.values()))
+        )
+
+    def _rename(self, entry: DictEntry) -> None:
+        """Append the first number that makes the name of the entry unique.
+
+        Names are never removed, so the search continues from the last number
+        found for the same name.
+        """
+        idx = self._rename_hints.get(entry.name, 1)
+        while f"{entry.name}{idx}" in self._definitions_by_name:
+            idx += 1
+            if self.stats is not None:
+                self.stats.counts["name_collision_retries"] += 1
+        self._rename_hints[entry.name] = idx
+        entry.name = f"{entry.name}{idx}"
+
     def _add_definition(self, entry: DictEntry) -> DictEntry:
         """Add an entry to the definions.
 
         If the entry is a DictEntry and there's an existing entry with the same
-        keys, then combine the DictEntries
+        keys, then combine the DictEntries.
+
+        Definitions are looked up by their key set and name, equivalent to
+        comparing the entry to each definition in order, where the entry is
+        renamed once it passes a definition with the same name.
         """
-        dicts_only = [d for d in self.definitions if isinstance(d, DictEntry)]
-        for definition in dicts_only:
-            if entry.keys == definition.keys:
-                # Check if both are list item types (contain "Item" followed by digits)
-                entry_is_list_item = 'Item' in entry.name and any(c.isdigit() for c in entry.name.split('Item')[-1])
-                def_is_list_item = 'Item' in definition.name and any(c.isdigit() for c in definition.name.split('Item')[-1])
-                
-                if entry_is_list_item and def_is_list_item:
-                    # Both are list item types - only merge if they have the same semantic base
-                    entry_base = entry.name.split('Item')[0]
-                    def_base = definition.name.split('Item')[0]
-                    if entry_base == def_base:
-                        definition.update_members(entry.members)
-                        return definition
-                else:
-                    # At least one is not a list item type - merge based on structure
-                    definition.update_members(entry.members)
-                    return definition
-            
-            # Handle name collisions by appending a number
-            if entry.name == definition.name:
-                idx = 1
-                new_name = f"{entry.name}{idx}"
-                dicts_names = [d.name for d in dicts_only]
-                while new_name in dicts_names:
-                    idx += 1
-                    new_name = f"{entry.name}{idx}"
-                entry.name = new_name
-        
+        return self._add_definition_at(entry)[1]
+
+    def _add_definition_at(self, entry: DictEntry) -> Tuple[int, DictEntry]:
+        """_add_definition, also returning the position of the definition"""
+        self._sync_index()
+
+        collision = self._definitions_by_name.get(entry.name)
+        for position, definition in self._definitions_by_keys.get(
+            frozenset(entry.members), []
+        ):
+            if self.stats is not None:
+                self.stats.counts["definition_comparisons"] += 1
+            if collision is not None and collision[0] < position:
+                self._rename(entry)
+                collision = None
+
+            # List item types (containing "Item" followed by digits) are only
+            # merged if they have the same semantic base
+            entry_base = _list_item_base(entry.name)
+            def_base = _list_item_base(definition.name)
+            if entry_base is None or def_base is None or entry_base == def_base:
+                if self.stats is not None:
+                    self.stats.counts["definition_merges"] += 1
+                definition.update_members(entry.members)
+                self._dependencies[position] |= dict_entry_names(
+                    itertools.chain.from_iterable(entry.members.values())
+                )
+                return position, definition
+
+        # Handle name collisions by appending a number
+        if collision is not None:
+            self._rename(entry)
+
+        if self.stats is not None:
+            self.stats.counts["definitions_added"] += 1
+        position = len(self.definitions)
+        self._index_definition(position, entry)
         self.definitions.append(entry)
-        return entry
+        self._indexed_count += 1
+        return position, entry
+
+    def _sorted_definitions(self) -> List[DictEntry]:
+        """The definitions in dependency order.
+
+        A depth first search over the dependency graph, visiting definitions
+        and their dependencies in the order they were added, so each definition
+        comes after the ones it depends on and the order is otherwise kept.
+        Cycles are broken where they are found.
+        """
+        self._sync_index()
+
+        dependency_positions = [
+            sorted(
+                self._definitions_by_name[name][0]
+                for name in dependencies
+                if name in self._definitions_by_name
+            )
+            for dependencies in self._dependencies
+        ]
+
+        ordered: List[DictEntry] = []
+        # 0: not visited, 1: being visited, 2: done
+        state = [0] * len(self.definitions)
+        for position in range(len(self.definitions)):
+            if state[position]:
+                continue
+            state[position] = 1
+            stack = [(position, iter(dependency_positions[position]))]
+            while stack:
+                current, dependencies = stack[-1]
+                for dependency in dependencies:
+                    if not state[dependency]:
+                        state[dependency] = 1
+                        stack.append(
+                            (dependency, iter(dependency_positions[dependency]))
+                        )
+                        break
+                else:
+                    stack.pop()
+                    state[current] = 2
+                    ordered.append(self.definitions[current])
+
+        return ordered
 
     def _convert_list(self, key: str, lst: List, item_name: str) -> MemberEntry:
-        entry = MemberEntry(key)
+        sub_members: Set[Union[MemberEntry, DictEntry]] = set()
 
         idx = 0
         for item in lst:
             item_type = self._get_type(item, key=f"{item_name}{idx}")
 
-            entry.sub_members.add(item_type)
+            if self.stats is not None and isinstance(item_type, DictEntry):
+                self.stats.counts["dict_entry_hashes"] += 1
+            sub_members.add(item_type)
             if isinstance(item_type, DictEntry):
                 self._add_definition(item_type)
             idx += 1
 
-        return entry
+        return MemberEntry(key, sub_members=sub_members)
 
-    def _convert_dict(self, type_name: str, dct: Dict, total: bool = True) -> DictEntry:
-        entry = DictEntry(
-            self._get_name(type_name), force_alternative=self.force_alternative, total=total
-        )
-        for key, value in dct.items():
-            value_type = self._get_type(value, key=key)
-            if isinstance(value_type, DictEntry):
-                definition = self._add_definition(value_type)
-                value_type = definition
-            entry.members[key] = {value_type}
-        return entry
+    def _get_definition(self, dct: Dict, type_name: str) -> DictEntry:
+        """Type a dict and add it to the definitions, returning the potentially
+        merged definition.
+
+        The definition a dict is merged into only depends on its name, or the
+        base of the name for list item types, and its keys. Once a dict with
+        the same keys and value types has been added, the values that are
+        containers are typed and folded into that definition, without building
+        a DictEntry for the dict again.
+        """
+        return self._type_value(dct, "", type_name)  # type: ignore
+
+    def _get_sequence_item_type(
+        self, value: Any, key: str, idx: int
+    ) -> Union[MemberEntry, DictEntry]:
+        """Get the type of the item at `idx` in the sequence named `key`
+
+        DictEntries are added to the definitions and the potentially merged
+        result is returned.
+        """
+        if isinstance(value, dict):
+            # The index only ever extends the "Item" part of the class name
+            return self._type_value(
+                value, "", f"{key_to_class_name(f'{key}Item')}{idx}{self.type_postfix}"
+            )
+        return self._type_value(value, f"{key}Item{idx}", None)
 
     def _get_type(self, item: Any, key: str) -> Union[MemberEntry, DictEntry]:
-        if item is None:
-            return MemberEntry("None")
+        return self._type_value(item, key, None)
+
+    def _type_value(
+        self, value: Any, key: str, type_name: Optional[str]
+    ) -> Union[MemberEntry, DictEntry]:
+        """Get the type of a value named `key`.
+
+        A dict is added to the definitions as `type_name`, see _get_definition,
+        and the potentially merged definition is returned. Without a type name
+        the DictEntry of the dict is returned without adding it.
+
+        Containers are typed with a stack of frames rather than recursion, so
+        the nesting depth is only limited by memory. Values are visited in the
+        same order as a depth first recursion would.
+        """
+        frames: List[_TypeFrame] = []
+        result = self._open(value, key, type_name, frames)
+        stats = self.stats
+        while frames:
+            frame = frames[-1]
+            for child_key, child_value in frame.items:
+                if child_value is None or isinstance(child_value, BASE_TYPES):
+                    # Leaves are the most common values, typed inline. Frames
+                    # of dicts typed like an earlier one only hold containers
+                    if stats is not None:
+                        stats.counts["get_type_calls"] += 1
+                    leaf = MemberEntry(
+                        "None" if child_value is None else type(child_value).__name__
+                    )
+                    if frame.entry is None:
+                        frame.item_types.add(leaf)
+                    else:
+                        frame.entry.members[child_key] = {leaf}
+                    continue
+
+                if frame.entry is None:
+                    if isinstance(child_value, dict):
+                        # The index only ever extends the "Item" part of the class name
+                        item_type = self._open(
+                            child_value,
+                            "",
+                            f"{key_to_class_name(f'{frame.key}Item')}{child_key}{self.type_postfix}",
+                            frames,
+                        )
+                    else:
+                        item_type = self._open(
+                            child_value, f"{frame.key}Item{child_key}", None, frames
+                        )
+                else:
+                    frame.key = child_key
+                    if isinstance(child_value, dict):
+                        item_type = self._open(
+                            child_value,
+                            child_key,
+                            f"{key_to_class_name(child_key)}{self.type_postfix}",
+                            frames,
+                        )
+                    else:
+                        item_type = self._open(child_value, child_key, None, frames)
+
+                if item_type is None:
+                    # Typed once the frame pushed for it is done
+                    break
+                if stats is not None and isinstance(item_type, DictEntry):
+                    stats.counts["dict_entry_hashes"] += 1
+                if frame.entry is None:
+                    frame.item_types.add(item_type)
+                elif frame.dependencies is None:
+                    frame.entry.members[child_key] = {item_type}
+                else:
+                    frame.entry.members[child_key].add(item_type)
+                    frame.dependencies |= dict_entry_names({item_type})
+            else:
+                frames.pop()
+                if frame.entry is None:
+                    result = MemberEntry(
+                        frame.sequence_type_name, sub_members=frame.item_types
+                    )
+                elif frame.dct is None:
+                    result = frame.entry
+                else:
+                    result = self._add_typed_definition(frame)
+                if not frames:
+                    break
+
+                parent = frames[-1]
+                if stats is not None and isinstance(result, DictEntry):
+                    stats.counts["dict_entry_hashes"] += 1
+                if parent.entry is None:
+                    parent.item_types.add(result)
+                elif parent.dependencies is None:
+                    parent.entry.members[parent.key] = {result}
+                else:
+                    parent.entry.members[parent.key].add(result)
+                    parent.dependencies |= dict_entry_names({result})
 
-        if isinstance(item, BASE_TYPES):
-            return MemberEntry(type(item).__name__)
+        return result  # type: ignore
 
-        if isinstance(item, (list, set, tuple, frozenset)):
-            if isinstance(item, list):
+    def _open(
+        self, value: Any, key: str, type_name: Optional[str], frames: List["_TypeFrame"]
+    ) -> Optional[Union[MemberEntry, DictEntry]]:
+        """Return the type of a value, or push a frame to type the contents of
+        a container and return None.
+        """
+        if self.stats is not None:
+            self.stats.counts["get_type_calls"] += 1
+
+        if isinstance(value, dict):
+            if type_name is None:
+                entry = DictEntry(
+                    self._get_name(f"{key_to_class_name(key)}{self.type_postfix}"),
+                    force_alternative=self.force_alternative,
+                )
+                frames.append(_TypeFrame(iter(value.items()), key, entry))
+                return None
+
+            self._sync_index()
+            name = self._get_name(type_name)
+            base = _list_item_base(name)
+            fingerprint = (tuple(value), tuple(map(type, value.values())))
+            cache_key = (name if base is None else None, base, fingerprint)
+
+            cached = self._fingerprints.get(cache_key)
+            if cached is None:
+                entry = DictEntry(name, force_alternative=self.force_alternative)
+                frame = _TypeFrame(iter(value.items()), key, entry)
+                frame.dct = value
+                frame.cache_key = cache_key
+                frames.append(frame)
+                return None
+
+            if self.stats is not None:
+                self.stats.counts["fingerprint_hits"] += 1
+            position, definition, containers = cached
+            if not containers:
+                return definition
+            frame = _TypeFrame(
+                zip(containers, map(value.__getitem__, containers)), key, definition
+            )
+            frame.dependencies = self._dependencies[position]
+            frames.append(frame)
+            return None
+
+        if isinstance(value, (list, set, tuple, frozenset)):
+            if isinstance(value, list):
                 sequence_type_name = "List"
-            elif isinstance(item, set):
+            elif isinstance(value, set):
                 sequence_type_name = "Set"
-            elif isinstance(item, frozenset):
+            elif isinstance(value, frozenset):
                 sequence_type_name = "FrozenSet"
             else:
                 sequence_type_name = "Tuple"
 
-            list_item_types: Set[Union[MemberEntry, DictEntry]] = set()
-            idx = 0
-            for value in item:
-                item_type = self._get_type(value, key=f"{key}Item{idx}")
-                if isinstance(item_type, DictEntry):
-                    # Add the DictEntry and get the potentially merged result
-                    merged_type = self._add_definition(item_type)
-                    list_item_types.add(merged_type)
+            items: Iterable[Tuple[int, Any]] = enumerate(value)
+            if self.sampling is not None and len(value) > self.sampling.size:
+                items = self.sampling.sample(value)
+                self.sampled = True
+
+            frame = _TypeFrame(iter(items), key, None)
+            frame.sequence_type_name = sequence_type_name
+            frame.item_types = set()
+            frames.append(frame)
+            return None
+
+        if value is None:
+            return MemberEntry("None")
+
+        if isinstance(value, BASE_TYPES):
+            return MemberEntry(type(value).__name__)
+
+        raise NotImplementedError(f"Type handling for '{type(value)}' not implemented")
+
+    def _add_typed_definition(self, frame: "_TypeFrame") -> DictEntry:
+        """Add the DictEntry of a typed dict to the definitions, returning the
+        potentially merged definition.
+        """
+        assert frame.entry is not None and frame.dct is not None
+        position, definition = self._add_definition_at(frame.entry)
+        containers = tuple(
+            key
+            for key, value in frame.dct.items()
+            if not (value is None or isinstance(value, BASE_TYPES))
+        )
+        self._fingerprints[frame.cache_key] = (position, definition, containers)  # type: ignore
+        return definition
+
+    def _get_type_from_events(
+        self, events: Iterator[Event], key: str
+    ) -> Union[MemberEntry, DictEntry]:
+        """The equivalent of _get_type for a value read as JSON events.
+
+        Values are dropped as soon as they are typed, so memory depends on the
+        nesting depth and the types found rather than the size of the value.
+        """
+        # One frame per open container, holding the DictEntry and current key of
+        # a map or the key, item types and current index of an array
+        frames: List[_EventFrame] = []
+
+        for event, value in events:
+            if event == "map_key":
+                frames[-1].key = value
+                continue
+
+            if event == "start_map" or event == "start_array":
+                if not frames:
+                    child_key = key
+                elif frames[-1].entry is not None:
+                    child_key = frames[-1].key
                 else:
-                    list_item_types.add(item_type)
-                idx += 1
+                    child_key = f"{frames[-1].key}Item{frames[-1].idx}"
 
-            return MemberEntry(sequence_type_name, sub_members=list_item_types)
+                if event == "start_map":
+                    entry = DictEntry(
+                        self._get_name(
+                            f"{key_to_class_name(child_key)}{self.type_postfix}"
+                        ),
+                        force_alternative=self.force_alternative,
+                    )
+                    frames.append(_EventFrame(entry=entry))
+                else:
+                    frames.append(_EventFrame(key=child_key))
+                continue
 
-        if isinstance(item, dict):
-            return self._convert_dict(
-                f"{key_to_class_name(key)}{self.type_postfix}", item
-            )
+            item_type: Union[MemberEntry, DictEntry]
+            if event == "end_map":
+                item_type = frames.pop().entry  # type: ignore
+            elif event == "end_array":
+                item_type = MemberEntry("List", sub_members=frames.pop().item_types)
+            elif value is None:
+                item_type = MemberEntry("None")
+            else:
+                item_type = MemberEntry(type(value).__name__)
 
-        raise NotImplementedError(f"Type handling for '{type(item)}' not implemented")
+            if not frames:
+                return item_type
+
+            if isinstance(item_type, DictEntry):
+                item_type = self._add_definition(item_type)
+                if self.stats is not None:
+                    self.stats.counts["dict_entry_hashes"] += 1
+            parent = frames[-1]
+            if parent.entry is not None:
+                parent.entry.members[parent.key] = {item_type}
+            else:
+                parent.item_types.add(item_type)
+                parent.idx += 1
+
+        raise ValueError("Events ended before the value was complete")
+
+    def _type_source(self) -> Union[MemberEntry, DictEntry]:
+        """Populate the definitions from the source and return its type"""
+        with phase("infer"):
+            source_type = self._get_type(self.source, key=self.root_type_name)
+            if isinstance(source_type, DictEntry):
+                self._add_definition(source_type)
+        return source_type
 
     def build_output(self) -> str:
         if self._output:
             return self._output
 
-        source_type = self._get_type(self.source, key=self.root_type_name)
-        if isinstance(source_type, DictEntry):
-            self._add_definition(source_type)
-            root_item = None
-        else:
-            root_item = source_type
+        self._output = self._render(self._type_source())
+        return self._output
 
-        # Convert the definitions to structured output
-        self._output = ""
+    def _render(self, source_type: Union[MemberEntry, DictEntry]) -> str:
+        """Convert the definitions to structured output"""
+        with phase("sort"):
+            definitions = self._sorted_definitions()
 
-        if self.show_imports:
-            typing_imports = set()
-            typed_dict_import = False
+        with phase("render"):
+            return self._render_definitions(source_type, definitions)
+
+    def _render_definitions(
+        self, source_type: Union[MemberEntry, DictEntry], definitions: List[DictEntry]
+    ) -> str:
+        root_item = None if isinstance(source_type, DictEntry) else source_type
 
-            for definition in self.definitions:
-                if isinstance(definition, DictEntry):
-                    typed_dict_import = True
-                typing_imports |= definition.get_imports()
+        output = ""
+
+        if self.sampled and self.sampling is not None:
+            output += f"{self.sampling.describe()}\n\n"
+
+        if self.show_imports:
+            typed_dict_import = any(isinstance(d, DictEntry) for d in self.definitions)
+            # A single walk, as definitions share most of the entries below them
+            roots: List[Set[Union[MemberEntry, DictEntry]]] = [
+                {definition} for definition in self.definitions
+            ]
             if root_item:
-                typing_imports |= sub_members_to_imports({root_item})
+                roots.append({root_item})
+            typing_imports = members_to_imports(roots)
 
             if typing_imports:
-                self._output += "\n".join(
+                output += "\n".join(
                     [f"from typing import {', '.join(sorted(typing_imports))}", "", ""]
                 )
             if typed_dict_import:
-                self._output += "\n".join(
+                output += "\n".join(
                     ["from typing_extensions import TypedDict", "", "", ""]
                 )
 
-        self._output += "\n\n\n".join(
-            [str(d) for d in sorted(self.definitions, key=key_to_dependency_cmp)]
-        )
+        output += "\n\n\n".join([str(d) for d in definitions])
 
         if not isinstance(source_type, DictEntry):
-            if len(self._output):
-                self._output += "\n"
+            if len(output):
+                output += "\n"
                 if len(self.definitions):
-                    self._output += "\n\n"
-            self._output += f"{self.root_type_name}{self.type_postfix} = {sub_members_to_string({source_type})}"
+                    output += "\n\n"
+            output += f"{self.root_type_name}{self.type_postfix} = {sub_members_to_string({source_type})}"
 
-        return self._output
+        return output
+
+
+class _ItemLog(DefinitionBuilder):
+    """Type values as the items of a list, logging the definitions to replay
+    them into other builders.
+
+    Dicts aren't merged by the definitions already added, as _add_definition
+    does, but by their merge key, which is all that decides the definition a
+    dict is merged into. Replaying the log into a builder is then the same as
+    typing the items with it, whatever the builder held before, so the items
+    are only typed once and the logs of consecutive items can be merged.
+
+    Each dict item can also be typed on its own, as the root of an example,
+    into another builder along the way.
+    """
+
+    # The logged item types
+    item_types: Set[Entry]
+    # The names of the definitions, by position. Logged definitions are named
+    # by their position, so types holding different definitions don't compare
+    # equal, whatever they turn into when replayed
+    names: List[str]
+    # The names of the definitions each definition depends on, by position
+    dependencies: List[Set[str]]
+    # The position of the definition logged for each merge key
+    _positions: Dict[MergeKey, int]
+    # The index of the item each definition with a name holding the index of
+    # the item was first logged by, by position
+    _item_indexes: Dict[int, int]
+
+    def __init__(
+        self,
+        source: Source = None,
+        *,
+        root_type_name: str = "Root",
+        type_postfix: str = "",
+        force_alternative: bool = False,
+        name_map: Optional[NameMap] = None,
+        sampling: Optional[Sampling] = None,
+    ) -> None:
+        super().__init__(
+            source,
+            root_type_name=root_type_name,
+            type_postfix=type_postfix,
+            show_imports=False,
+            force_alternative=force_alternative,
+            name_map=name_map,
+            sampling=sampling,
+        )
+        self.item_types = set()
+        self.names = []
+        self.dependencies = []
+        self._positions = {}
+        self._item_indexes = {}
+        self._fingerprints = {}
+        self._item_prefix = key_to_class_name(f"{root_type_name}Item")
+        self._example_name = self._get_name(
+            f"{key_to_class_name(root_type_name)}{type_postfix}"
+        )
+
+        # The item being typed, its index and the builder of its example, with
+        # the example definitions of the logged definitions, by their id
+        self._item: Any = None
+        self._idx: Optional[int] = None
+        self._example: Optional[DefinitionBuilder] = None
+        self._example_definitions: Dict[int, DictEntry] = {}
+
+    def add_item(
+        self, item: Any, idx: int, example: Optional[DefinitionBuilder] = None
+    ) -> None:
+        """Type the item at `idx` of the list, adding the definitions of the
+        item typed on its own to `example` if it's given.
+        """
+        self._item, self._idx, self._example = item, idx, example
+        try:
+            with phase("infer"):
+                self.item_types.add(
+                    self._get_sequence_item_type(item, self.root_type_name, idx)
+                )
+        finally:
+            self._item, self._idx, self._example = None, None, None
+            self._example_definitions = {}
+
+    def _type_source(self) -> Union[MemberEntry, DictEntry]:
+        """Log the source, returning the logged type"""
+        with phase("infer"):
+            source_type = self._get_type(self.source, key=self.root_type_name)
+            if isinstance(source_type, DictEntry):
+                source_type = self._add_definition(source_type)
+        return source_type
+
+    def _sync_index(self) -> None:
+        """The definitions are found by their merge key only"""
+
+    def _open(
+        self, value: Any, key: str, type_name: Optional[str], frames: List["_TypeFrame"]
+    ) -> Optional[Union[MemberEntry, DictEntry]]:
+        item_type = super()._open(value, key, type_name, frames)
+        if self._example is None or not isinstance(item_type, DictEntry):
+            return item_type
+
+        # A dict of leaves typed like an earlier one, typed from its values for
+        # the example
+        assert type_name is not None
+        entry = DictEntry(
+            self._example_name if value is self._item else self._get_name(type_name),
+            members={
+                key: {MemberEntry("None" if v is None else type(v).__name__)}
+                for key, v in value.items()
+            },
+            force_alternative=self.force_alternative,
+        )
+        if value is self._item:
+            # The only dict of the example
+            self._example.definitions.append(entry)
+        else:
+            example_definition = self._example._add_definition(entry)
+            self._example_definitions[id(item_type)] = example_definition
+        return item_type
+
+    def _add_typed_definition(self, frame: "_TypeFrame") -> DictEntry:
+        """Log the DictEntry of a typed dict and add it to the example being
+        typed. Only the fingerprints of dicts of leaves are cached, so every
+        dict is typed for the example.
+        """
+        entry = frame.entry
+        assert entry is not None and frame.dct is not None
+        example_definition = None
+        if self._example is not None:
+            example_definitions = self._example_definitions
+            example_definition = self._example._add_definition(
+                DictEntry(
+                    self._example_name if frame.dct is self._item else entry.name,
+                    members={
+                        key: {
+                            _map_entry(member, lambda e: example_definitions[id(e)])
+                            for member in members
+                        }
+                        for key, members in entry.members.items()
+                    },
+                    force_alternative=self.force_alternative,
+                )
+            )
+
+        position, definition = self._add_definition_at(entry)
+        if example_definition is not None:
+            self._example_definitions[id(definition)] = example_definition
+        values = frame.dct.values()
+        if all(value is None or isinstance(value, BASE_TYPES) for value in values):
+            self._fingerprints[frame.cache_key] = (position, definition, ())  # type: ignore
+        return definition
+
+    def _add_definition_at(self, entry: DictEntry) -> Tuple[int, DictEntry]:
+        """Merge the entry into the definition logged with the same merge key,
+        or log it.
+        """
+        key = _merge_key(entry.name, frozenset(entry.members))
+        dependencies = dict_entry_names(
+            itertools.chain.from_iterable(entry.members.values())
+        )
+        position = self._positions.get(key)
+        if position is not None:
+            definition = self.definitions[position]
+            definition.update_members(entry.members)
+            self.dependencies[position] |= dependencies
+            return position, definition
+
+        position = self._positions[key] = len(self.definitions)
+        if self._idx is not None and self._is_item_name(entry.name, self._idx):
+            self._item_indexes[position] = self._idx
+        self.names.append(entry.name)
+        self.dependencies.append(dependencies)
+        entry.name = f"#{position}"
+        self.definitions.append(entry)
+        return position, entry
+
+    def _is_item_name(self, name: str, idx: int) -> bool:
+        """If the name holds the index of the item, like "RootItem1Item0"
+        for a dict in a list at index 1.
+        """
+        prefix = f"{self._item_prefix}{idx}"
+        if not name.startswith(prefix):
+            return False
+        return not name.partition(prefix)[2][:1].isdigit()
+
+    def merge(self, other: "_ItemLog", offset: int) -> None:
+        """Log the items of another log, following the `offset` items logged
+        by this one.
+        """
+        merged: Dict[int, DictEntry] = {}
+        positions: List[int] = []
+        for position, definition in enumerate(other.definitions):
+            name = other.names[position]
+            idx = other._item_indexes.get(position)
+            if idx is not None:
+                prefix = f"{self._item_prefix}{idx}"
+                idx += offset
+                name = f"{self._item_prefix}{idx}{name[len(prefix):]}"
+
+            merge_key = _merge_key(name, frozenset(definition.members))
+            existing = self._positions.get(merge_key)
+            if existing is not None:
+                merged[id(definition)] = self.definitions[existing]
+                positions.append(existing)
+                continue
+
+            position = self._positions[merge_key] = len(self.definitions)
+            if idx is not None:
+                self._item_indexes[position] = idx
+            entry = DictEntry(
+                name,
+                members={key: set() for key in definition.members},
+                force_alternative=definition.force_alternative,
+            )
+            entry.name = f"#{position}"
+            self.names.append(name)
+            self.dependencies.append(set())
+            self.definitions.append(entry)
+            merged[id(definition)] = entry
+            positions.append(position)
+
+        def merged_type(entry: Entry) -> Entry:
+            return _map_entry(entry, lambda e: merged[id(e)])
+
+        for position, definition, dependencies in zip(
+            positions, other.definitions, other.dependencies
+        ):
+            members = self.definitions[position].members
+            for key, types in definition.members.items():
+                members[key].update(map(merged_type, types))
+            self.dependencies[position] |= {
+                f"#{positions[int(name[1:])]}" for name in dependencies
+            }
+        self.item_types.update(map(merged_type, other.item_types))
+        self.sampled = self.sampled or other.sampled
+
+    def dump_types(self, types: Iterable[Entry]) -> List[Any]:
+        """The logged types as JSON values, see _dump_type, with the logged
+        definitions by position.
+        """
+        return [_dump_type(entry, lambda e: int(e.name[1:])) for entry in types]
+
+    def load_types(self, values: Iterable[Any]) -> Set[Entry]:
+        """The logged types dump_types returned the values for"""
+        return {_load_type(value, self.definitions.__getitem__) for value in values}
+
+    def dump_state(self) -> Dict[str, Any]:
+        """The log as JSON values"""
+        return {
+            "names": list(self.names),
+            "members": [
+                [
+                    [key, self.dump_types(types)]
+                    for key, types in definition.members.items()
+                ]
+                for definition in self.definitions
+            ],
+            "dependencies": [
+                sorted(int(name[1:]) for name in dependencies)
+                for dependencies in self.dependencies
+            ],
+            "item_indexes": [list(item) for item in self._item_indexes.items()],
+            "item_types": self.dump_types(self.item_types),
+            "sampled": self.sampled,
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """Log what dump_state returned the state for, into an empty log"""
+        for name, members in zip(state["names"], state["members"]):
+            keys = [key for key, _ in members]
+            position = len(self.definitions)
+            self._positions[_merge_key(name, frozenset(keys))] = position
+            definition = DictEntry(
+                name,
+                members={key: set() for key in keys},
+                force_alternative=self.force_alternative,
+            )
+            definition.name = f"#{position}"
+            self.names.append(name)
+            self.definitions.append(definition)
+
+        for definition, members, dependencies in zip(
+            self.definitions, state["members"], state["dependencies"]
+        ):
+            for key, types in members:
+                definition.members[key] = self.load_types(types)
+            self.dependencies.append({f"#{position}" for position in dependencies})
+        self._item_indexes = dict(state["item_indexes"])
+        self.item_types = self.load_types(state["item_types"])
+        self.sampled = state["sampled"]
+
+
+def _replay(builder: DefinitionBuilder, log: _ItemLog) -> Callable[[Entry], Entry]:
+    """Add the logged definitions to the builder, like typing the values they
+    were logged from with it would, returning a function mapping the logged
+    types to the types of the builder.
+    """
+    definitions: Dict[int, DictEntry] = {}
+    positions: List[int] = []
+    for name, definition in zip(log.names, log.definitions):
+        position, definitions[id(definition)] = builder._add_definition_at(
+            DictEntry(
+                name,
+                members={key: set() for key in definition.members},
+                force_alternative=definition.force_alternative,
+            )
+        )
+        positions.append(position)
+
+    def builder_type(entry: Entry) -> Entry:
+        return _map_entry(entry, lambda e: definitions[id(e)])
+
+    # The dependencies are the ones typing the values would have found, even
+    # where their types were merged with equal ones
+    targets = [builder.definitions[position] for position in positions]
+    for position, definition, dependencies in zip(
+        positions, log.definitions, log.dependencies
+    ):
+        members = builder.definitions[position].members
+        for key, types in definition.members.items():
+            members[key].update(map(builder_type, types))
+        builder._dependencies[position] |= {
+            targets[int(name[1:])].name for name in dependencies
+        }
+    builder.sampled = builder.sampled or log.sampled
+    return builder_type
 
 
 def _should_treat_as_examples(dicts: List[Dict[str, Any]]) -> bool:
     """Determine if a list of dictionaries should be treated as multiple examples
     of the same schema rather than a list of different items.
-    
+
     This function heuristically determines if the dictionaries have enough overlap
     in their field names to suggest they represent variations of the same type.
-    
+
     Special case: If one of the dictionaries is empty and others have content,
     treat as examples (the empty dict represents a case where all fields are optional).
     """
-    if len(dicts) < 2:
+    field_counts: Dict[str, int] = defaultdict(int)
+    for d in dicts:
+        for field in d.keys():
+            field_counts[field] += 1
+
+    empty_count = sum(1 for d in dicts if len(d) == 0)
+    return _counts_suggest_examples(len(dicts), empty_count, field_counts)
+
+
+def _counts_suggest_examples(
+    total_dicts: int, empty_count: int, field_counts: Dict[str, int]
+) -> bool:
+    """The heuristic of _should_treat_as_examples, based only on the number of
+    dicts, how many of them are empty and how often each field appears.
+
+    Split out so the decision can be made from running counts when the dicts
+    are streamed rather than held in memory.
+    """
+    if total_dicts < 2:
         return False
-    
+
     # Special case: if we have exactly one empty dict and others with content,
     # treat as examples where all fields should be optional
-    empty_dicts = [d for d in dicts if len(d) == 0]
-    non_empty_dicts = [d for d in dicts if len(d) > 0]
-    
-    if len(empty_dicts) == 1 and len(non_empty_dicts) >= 1:
+    if empty_count == 1 and total_dicts - empty_count >= 1:
         return True
-    
-    # Get all field names from all dictionaries
-    all_fields = set()
-    field_counts = defaultdict(int)
-    
-    for d in dicts:
-        for field in d.keys():
-            all_fields.add(field)
-            field_counts[field] += 1
-    
-    if not all_fields:
+
+    if not field_counts:
         return False
-    
-    total_dicts = len(dicts)
-    
+
     # Count fields by their frequency
-    core_fields = sum(1 for count in field_counts.values() if count == total_dicts)  # In all dicts
-    partial_fields = sum(1 for count in field_counts.values() if 1 < count < total_dicts)  # In some but not all
-    unique_fields = sum(1 for count in field_counts.values() if count == 1)  # In only one dict
-    
+    core_fields = sum(
+        1 for count in field_counts.values() if count == total_dicts
+    )  # In all dicts
+    partial_fields = sum(
+        1 for count in field_counts.values() if 1 < count < total_dicts
+    )  # In some but not all
+    unique_fields = sum(
+        1 for count in field_counts.values() if count == 1
+    )  # In only one dict
+
     # Key insight: If ALL fields appear in ALL dictionaries, it's likely a regular list
     # If there are fields that appear in some but not all dictionaries, it's likely examples
-    
+
     if partial_fields == 0:
         # No partial fields means either all fields are in all dicts (regular list)
         # or all fields are unique to one dict (completely different structures)
         return False
-    
+
     # We have partial fields, which suggests variations of the same schema
     # Additional check: ensure we have some core schema (shared fields)
     # and that partial fields make up a reasonable portion
-    
+
     if core_fields == 0:
         # No shared fields at all - probably completely different items
         return False
-    
+
     # We have both core fields (shared) and partial fields (optional)
     # This is a good indicator of schema variations
     return True
@@ -282,7 +1168,7 @@ def _should_treat_as_examples(dicts: List[Dict[str, Any]]) -> bool:
 
 def _merge_dict_examples(examples: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Merge multiple dictionary examples to create a comprehensive type definition.
-    
+
     This function analyzes all provided examples to:
     1. Identify fields that are truly optional (present in some but not all examples)
     2. Collect all possible types for each field
@@ -290,32 +1176,36 @@ def _merge_dict_examples(examples: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     if not examples:
         return {}
-    
+
     if len(examples) == 1:
         return examples[0]
-    
+
     # Track which fields appear in which examples
     field_counts = defaultdict(int)
     field_types = defaultdict(set)
-    
+
     # Count field occurrences and collect types
     for example in examples:
         if not isinstance(example, dict):
             continue
         for key, value in example.items():
             field_counts[key] += 1
-            field_types[key].add(type(value).__name__ if value is not None else 'None')
-    
+            field_types[key].add(type(value).__name__ if value is not None else "None")
+
     # Build merged dictionary
     merged = {}
     total_examples = len(examples)
-    
+
     for field in field_counts:
         # If field appears in all examples, use the first non-None value
         if field_counts[field] == total_examples:
             # Find first example that has this field with a non-None value
             for example in examples:
-                if isinstance(example, dict) and field in example and example[field] is not None:
+                if (
+                    isinstance(example, dict)
+                    and field in example
+                    and example[field] is not None
+                ):
                     merged[field] = example[field]
                     break
             else:
@@ -332,7 +1222,7 @@ def _merge_dict_examples(examples: List[Dict[str, Any]]) -> Dict[str, Any]:
             else:
                 # Only None values found
                 merged[field] = None
-            
+
             # For optional fields, we need to ensure None is in the type union
             # This will be handled by adding None to the merged dict in a special way
             # We'll create a list with the value and None to signal optionality
@@ -340,7 +1230,7 @@ def _merge_dict_examples(examples: List[Dict[str, Any]]) -> Dict[str, Any]:
                 # Create a marker for optionality by storing both the value and None
                 # This will be processed specially by the type system
                 pass  # The current system will handle this through multiple passes
-    
+
     return merged
 
 
@@ -351,10 +1241,13 @@ def get_type_definitions(
     show_imports: bool = True,
     force_alternative: bool = False,
     name_map: NameMap | None = None,
+    sampling: Optional[Sampling] = None,
+    workers: Optional[int] = None,
+    optional_threshold: float = 1.0,
 ) -> str:
     """
     Generate TypedDict definitions from a source object.
-    
+
     Args:
         source: The source object to generate types from. Can be:
                 - A single dict: generates types for that dict
@@ -365,157 +1258,82 @@ def get_type_definitions(
         show_imports: Whether to include import statements
         force_alternative: Whether to force alternative TypedDict syntax
         name_map: Optional mapping of field names to type names
-    
+        sampling: Type sequences longer than the sample size from a sample of
+                  their items, noted in the output when applied
+        workers: Spread the typing of a large list of records over this many
+                 processes, the output is the same as with a single one
+        optional_threshold: Fields of the examples in a list of dicts are
+                            optional if they appear in less than this share of
+                            the examples of their type, by default if they
+                            don't appear in all of them
+
     Returns:
         String containing the generated TypedDict definitions
     """
-    # Check if source is a list of dictionaries for multi-example analysis
-    # Only apply this when the list contains dictionaries with overlapping but varying field structures
-    # suggesting they represent multiple examples of the same schema rather than a list of different items
-    if (isinstance(source, list) and len(source) > 1 and 
-        all(isinstance(item, dict) for item in source) and
-        _should_treat_as_examples(source)):
-        # Multiple dictionary examples - use enhanced analysis
-        primary_source = source[0]  # Use first dict as primary
-        
-        # Check if we have the empty dict case
-        source_dicts = [item for item in source if isinstance(item, dict)]
-        empty_dicts = [d for d in source_dicts if len(d) == 0]
-        non_empty_dicts = [d for d in source_dicts if len(d) > 0]
-        has_empty_dict = len(empty_dicts) == 1 and len(non_empty_dicts) >= 1
-        
-        # Create a builder for each example to collect type information
-        builders = []
-        for i, example in enumerate(source):
-            builder = DefinitionBuilder(
-                example,
+    _check_optional_threshold(optional_threshold)
+
+    if (
+        workers is not None
+        and workers > 1
+        and isinstance(source, list)
+        and not name_map
+        and sampling is None
+    ):
+        from dict_typer.parallel import (
+            MIN_RECORDS_PER_WORKER,
+            get_type_definitions_parallel,
+        )
+
+        if len(source) >= workers * MIN_RECORDS_PER_WORKER:
+            return get_type_definitions_parallel(
+                source,
+                workers,
                 root_type_name=root_type_name,
                 type_postfix=type_postfix,
-                show_imports=False,  # We'll handle imports at the end
+                show_imports=show_imports,
                 force_alternative=force_alternative,
-                name_map=name_map,
+                optional_threshold=optional_threshold,
             )
-            builder.build_output()  # This populates the definitions
-            
-            # If we have empty dict case, make all fields in all types optional
-            if has_empty_dict:
-                for definition in builder.definitions:
-                    if isinstance(definition, DictEntry):
-                        for field_name, field_types in definition.members.items():
-                            none_entry = MemberEntry("None")
-                            definition.members[field_name].add(none_entry)
-            
-            builders.append(builder)
-        
-        # Special handling for empty dict case: create OptionalRootType and use total=False
-        if has_empty_dict:
-            # For empty dict case, we want a single merged type, not a list union
-            # Use only the non-empty dict(s) as the basis for the type
-            if len(non_empty_dicts) == 1:
-                # Single non-empty dict case - build the type normally
-                builder = DefinitionBuilder(
-                    non_empty_dicts[0],
-                    root_type_name=root_type_name,
-                    type_postfix=type_postfix,
-                    show_imports=show_imports,
-                    force_alternative=force_alternative,
-                    name_map=name_map,
-                )
-                builder.build_output()
-                
-                # Set total=False for all nested definitions (not the root)
-                for definition in builder.definitions:
-                    if isinstance(definition, DictEntry):
-                        if definition.name != root_type_name:
-                            definition.total = False
-                
-                # Clear cached output so it regenerates with total=False
-                builder._output = None
-                output = builder.build_output()
-                
-                # Add OptionalRootType definition
-                optional_line = f"Optional{root_type_name} = Optional[{root_type_name}{type_postfix}]"
-                
-                # Ensure Optional is imported
-                if "from typing import" in output:
-                    # Check if Optional is already imported
-                    if "Optional" not in output.split("\n")[0]:
-                        # Add Optional to existing import
-                        output = output.replace(
-                            "from typing import",
-                            "from typing import Optional,"
-                        )
-                    output += f"\n\n{optional_line}"
-                else:
-                    # Need to add Optional import
-                    if "from typing_extensions import TypedDict" in output:
-                        output = output.replace(
-                            "from typing_extensions import TypedDict",
-                            "from typing import Optional\nfrom typing_extensions import TypedDict"
-                        )
-                    else:
-                        output = f"from typing import Optional\n\n{output}"
-                    output += f"\n\n{optional_line}"
-                
-                return output
-            else:
-                # Multiple non-empty dicts - merge them first
-                non_empty_builders = []
-                for example in non_empty_dicts:
-                    builder = DefinitionBuilder(
-                        example,
-                        root_type_name=root_type_name,
-                        type_postfix=type_postfix,
-                        show_imports=False,
-                        force_alternative=force_alternative,
-                        name_map=name_map,
-                    )
-                    builder.build_output()
-                    non_empty_builders.append(builder)
-                
-                # Merge the non-empty builders
-                final_builder = _merge_builders(non_empty_builders, non_empty_dicts[0], root_type_name, type_postfix, show_imports, force_alternative, name_map)
-                
-                # Set total=False for all nested definitions (not the root)
-                for definition in final_builder.definitions:
-                    if isinstance(definition, DictEntry):
-                        if definition.name != root_type_name:
-                            definition.total = False
-                
-                # Clear cached output so it regenerates with total=False
-                final_builder._output = None
-                output = final_builder.build_output()
-                
-                # Add OptionalRootType definition
-                optional_line = f"Optional{root_type_name} = Optional[{root_type_name}{type_postfix}]"
-                
-                # Ensure Optional is imported
-                if "from typing import" in output:
-                    # Check if Optional is already imported
-                    if "Optional" not in output.split("\n")[0]:
-                        # Add Optional to existing import
-                        output = output.replace(
-                            "from typing import",
-                            "from typing import Optional,"
-                        )
-                    output += f"\n\n{optional_line}"
-                else:
-                    # Need to add Optional import
-                    if "from typing_extensions import TypedDict" in output:
-                        output = output.replace(
-                            "from typing_extensions import TypedDict",
-                            "from typing import Optional\nfrom typing_extensions import TypedDict"
-                        )
-                    else:
-                        output = f"from typing import Optional\n\n{output}"
-                    output += f"\n\n{optional_line}"
-                
-                return output
-        
-        # Merge all the type information
-        final_builder = _merge_builders(builders, source, root_type_name, type_postfix, show_imports, force_alternative, name_map)
-        return final_builder.build_output()
-    
+
+    # Check if source is a list of dictionaries for multi-example analysis
+    # Only apply this when the list contains dictionaries with overlapping but varying field structures
+    # suggesting they represent multiple examples of the same schema rather than a list of different items
+    examples = source
+    indexed_examples: Iterable[Tuple[int, Any]] = ()
+    if isinstance(source, list):
+        indexed_examples = enumerate(source)
+        if sampling is not None and len(source) > sampling.size:
+            indexed_examples = list(sampling.sample(source))
+            examples = [value for _, value in indexed_examples]
+
+    if (
+        isinstance(examples, list)
+        and len(examples) > 1
+        and all(isinstance(item, dict) for item in examples)
+        and _should_treat_as_examples(examples)
+    ):
+        # Multiple dictionary examples - use enhanced analysis. Each example is
+        # typed once, both as an item of the list and on its own, and the
+        # definitions of the examples are merged by name
+        record_types = _RecordTypes(
+            root_type_name=root_type_name,
+            type_postfix=type_postfix,
+            force_alternative=force_alternative,
+            name_map=name_map,
+            sampling=sampling,
+        )
+        for idx, example in indexed_examples:
+            record_types.add(example, idx)
+
+        return record_types.render(
+            as_examples=True,
+            total=len(examples),
+            empty_count=sum(1 for example in examples if not example),
+            show_imports=show_imports,
+            optional_threshold=optional_threshold,
+            sampled=examples is not source,
+        )
+
     # Standard single-source processing
     builder = DefinitionBuilder(
         source,
@@ -524,129 +1342,589 @@ def get_type_definitions(
         show_imports=show_imports,
         force_alternative=force_alternative,
         name_map=name_map,
+        sampling=sampling,
     )
 
     return builder.build_output()
 
 
-def _merge_builders(
-    builders: List[DefinitionBuilder], 
-    primary_source: Source,
+def _set_non_total(builder: DefinitionBuilder, root_type_name: str) -> None:
+    """Make all the definitions of the builder but the root one non-total"""
+    for definition in builder.definitions:
+        if isinstance(definition, DictEntry):
+            if definition.name != root_type_name:
+                definition.total = False
+
+
+def _build_optional_root_output(
+    builder: DefinitionBuilder,
     root_type_name: str,
     type_postfix: str,
-    show_imports: bool,
-    force_alternative: bool,
-    name_map: Optional[NameMap]
-) -> DefinitionBuilder:
-    """Merge multiple builders into a single builder with combined type information."""
-    
-    # Check if we have the special case of empty dict + non-empty dict(s)
-    # In this case, ALL fields (including nested ones) should be optional
-    has_empty_dict = False
-    if isinstance(primary_source, list):
-        source_dicts = [item for item in primary_source if isinstance(item, dict)]
-        empty_dicts = [d for d in source_dicts if len(d) == 0]
-        non_empty_dicts = [d for d in source_dicts if len(d) > 0]
-        has_empty_dict = len(empty_dicts) == 1 and len(non_empty_dicts) >= 1
-    
-    # Create the final builder using the primary source
-    final_builder = DefinitionBuilder(
-        primary_source,
-        root_type_name=root_type_name,
-        type_postfix=type_postfix,
-        show_imports=show_imports,
-        force_alternative=force_alternative,
-        name_map=name_map,
+    source_type: Union[MemberEntry, DictEntry],
+) -> str:
+    """Render the output for examples that include an empty dict, adding an
+    Optional alias of the root type.
+    """
+    output = builder._render(source_type)
+
+    # Add OptionalRootType definition
+    optional_line = (
+        f"Optional{root_type_name} = Optional[{root_type_name}{type_postfix}]"
     )
-    
-    # Track field presence across all examples for optional field detection
-    field_presence = defaultdict(lambda: defaultdict(int))  # {normalized_type_name: {field_name: count}}
-    type_counts = defaultdict(int)  # {normalized_type_name: total_examples}
-    all_definitions = {}  # {normalized_type_name: merged_definition}
-    
-    # Helper function to normalize type names
-    def normalize_type_name(name: str) -> str:
-        # Remove temp prefixes and get the actual type name
-        import re
-        cleaned = re.sub(r'_temp_\d+', '', name)
-        if not cleaned or cleaned == root_type_name:
-            return root_type_name
-        return cleaned
-    
-    # First pass: collect all definitions and track field presence
-    for builder_idx, builder in enumerate(builders):
-        for definition in builder.definitions:
-            if isinstance(definition, DictEntry):
-                normalized_name = normalize_type_name(definition.name)
-                
-                # Track this type occurrence
-                type_counts[normalized_name] += 1
-                
-                # Track field presence for this type
-                for field_name in definition.members.keys():
-                    field_presence[normalized_name][field_name] += 1
-                
-                # Store or merge the definition
-                if normalized_name not in all_definitions:
-                    # Create a new definition with the normalized name
-                    merged_def = DictEntry(
-                        normalized_name,
-                        force_alternative=force_alternative
-                    )
-                    # Copy all fields from this definition
-                    for field_name, field_types in definition.members.items():
-                        merged_def.members[field_name] = field_types.copy()
-                    all_definitions[normalized_name] = merged_def
-                else:
-                    # Merge with existing definition
-                    existing_def = all_definitions[normalized_name]
-                    for field_name, field_types in definition.members.items():
-                        if field_name in existing_def.members:
-                            existing_def.members[field_name] |= field_types
-                        else:
-                            existing_def.members[field_name] = field_types.copy()
-    
-    # Second pass: mark fields as optional if they don't appear in all examples
-    total_examples = len(builders)
-    for type_name, definition in all_definitions.items():
-        # For the root type, we need to consider all examples
-        if type_name == root_type_name:
-            examples_for_this_type = total_examples
+
+    # Ensure Optional is imported
+    if "from typing import" in output:
+        # Check if Optional is already imported
+        typing_import = next(
+            line for line in output.split("\n") if line.startswith("from typing import")
+        )
+        if "Optional" not in typing_import:
+            # Add Optional to existing import
+            output = output.replace(
+                "from typing import", "from typing import Optional,"
+            )
+        output += f"\n\n{optional_line}"
+    else:
+        # Need to add Optional import
+        if "from typing_extensions import TypedDict" in output:
+            output = output.replace(
+                "from typing_extensions import TypedDict",
+                "from typing import Optional\nfrom typing_extensions import TypedDict",
+            )
         else:
-            examples_for_this_type = type_counts[type_name]
-        
-        # Collect all fields that should exist based on all examples
-        all_possible_fields = set()
-        for builder in builders:
-            for def_entry in builder.definitions:
-                if isinstance(def_entry, DictEntry) and normalize_type_name(def_entry.name) == type_name:
-                    all_possible_fields.update(def_entry.members.keys())
-        
-        # Add missing fields as optional
-        for field_name in all_possible_fields:
-            if field_name not in definition.members:
-                # Field is completely missing from this merged definition, make it optional
-                none_entry = MemberEntry("None")
-                definition.members[field_name] = {none_entry}
+            output = f"from typing import Optional\n\n{output}"
+        output += f"\n\n{optional_line}"
+
+    return output
+
+
+def _check_optional_threshold(optional_threshold: float) -> None:
+    if not 0 <= optional_threshold <= 1:
+        raise ValueError(
+            f"Optional threshold has to be between 0 and 1, got {optional_threshold}"
+        )
+
+
+class FieldStats:
+    """How many examples of a type have a field, and how many of them have a
+    value of each type, by the name of the type.
+    """
+
+    __slots__ = ("presence", "types")
+
+    presence: int
+    types: "Counter[str]"
+
+    def __init__(self) -> None:
+        self.presence = 0
+        self.types = Counter()
+
+    @property
+    def nulls(self) -> int:
+        return self.types["None"]
+
+    def add(
+        self, field_types: Iterable[Union[MemberEntry, DictEntry]], weight: int = 1
+    ) -> None:
+        """Count an example, or `weight` examples, of the field with the types"""
+        self.presence += weight
+        for field_type in field_types:
+            self.types[
+                field_type.name
+                if isinstance(field_type, DictEntry)
+                else str(field_type)
+            ] += weight
+
+    def count(self, type_names: Iterable[str], weight: int = 1) -> None:
+        """add, with the names of the types"""
+        self.presence += weight
+        for type_name in type_names:
+            self.types[type_name] += weight
+
+    def update(self, other: "FieldStats") -> None:
+        """Add the counts of other examples of the field"""
+        self.presence += other.presence
+        self.types.update(other.types)
+
+    def __repr__(self) -> str:
+        return f"<FieldStats (presence={self.presence}, types={dict(self.types)})>"
+
+
+# The names of the definitions an example was counted in, with the statistics
+# of their fields and the names of the types counted for each field
+ExampleCounters = List[Tuple[str, List[Tuple[FieldStats, List[str]]]]]
+
+
+class _ExampleMerger:
+    """Merge the definitions of one builder per example by their name.
+
+    Builders are folded in one at a time, keeping the types of the fields of
+    each merged definition, referencing definitions by name, along with the
+    statistics of the fields, so what's kept only grows with the variety of
+    the examples. Mergers of consecutive examples can be merged. Empty
+    examples are counted apart, examples with a single empty one are merged
+    without it.
+    """
+
+    def __init__(self, root_type_name: str, force_alternative: bool) -> None:
+        self.root_type_name = root_type_name
+        self.force_alternative = force_alternative
+
+        # {normalized_type_name: {field_name: stats}}
+        self.field_stats: Dict[str, Dict[str, FieldStats]] = defaultdict(
+            lambda: defaultdict(FieldStats)
+        )
+        # {normalized_type_name: total_examples}
+        self.type_counts: Dict[str, int] = defaultdict(int)
+        # {normalized_type_name: {field_name: types}}, in the order the types
+        # were found, referencing definitions by their name and keys
+        self.members: Dict[str, Dict[str, Set[Entry]]] = {}
+        self.total_examples = 0
+        # The number of empty examples, the name of their definition and how
+        # many merged types were found before the first one
+        self.empty_examples = 0
+        self.empty_name: Optional[str] = None
+        self.empty_position: Optional[int] = None
+        # Definition names seen so far, normalized once each
+        self._normalized_names: Dict[str, str] = {}
+        # The referenced definitions by their name and keys
+        self._references: Dict[Tuple[str, FrozenSet[str]], DictEntry] = {}
+
+    def _normalize_type_name(self, name: str) -> str:
+        normalized = self._normalized_names.get(name)
+        if normalized is None:
+            # Remove temp prefixes and get the actual type name
+            cleaned = _TEMP_SUFFIX_RE.sub("", name) if "_temp_" in name else name
+            if not cleaned or cleaned == self.root_type_name:
+                cleaned = self.root_type_name
+            normalized = self._normalized_names[name] = cleaned
+        return normalized
+
+    def _reference(self, entry: Entry) -> Entry:
+        """The type with the definitions in it replaced by memberless ones with
+        the same name and keys, which is all the merged types depend on.
+        """
+        return _map_entry(entry, self._reference_definition)
+
+    def _reference_definition(self, entry: DictEntry) -> DictEntry:
+        key = (entry.name, frozenset(entry.members))
+        reference = self._references.get(key)
+        if reference is None:
+            reference = self._references[key] = DictEntry(
+                entry.name,
+                members={field_name: set() for field_name in entry.members},
+                force_alternative=self.force_alternative,
+            )
+        return reference
+
+    def _field_types(self, field_types: Set[Entry]) -> Set[Entry]:
+        """The types of a field as they're merged, see _reference"""
+        return {
+            field_type
+            if isinstance(field_type, MemberEntry) and field_type._internable
+            else self._reference(field_type)
+            for field_type in field_types
+        }
+
+    def add(self, builder: DefinitionBuilder, weight: int = 1) -> None:
+        """Collect the definitions of a builder and track the statistics of
+        their fields, counting the builder as `weight` examples typed the same.
+        """
+        with phase("merge"):
+            self._add(builder, weight)
+
+    def _add(self, builder: DefinitionBuilder, weight: int) -> None:
+        self.total_examples += weight
+
+        definitions = builder.definitions
+        if len(definitions) == 1 and not definitions[0].members:
+            if self.empty_position is None:
+                self.empty_position = len(self.members)
+            self.empty_examples += weight
+            self.empty_name = self._normalize_type_name(definitions[0].name)
+            return
+
+        for definition in definitions:
+            normalized_name = self._normalize_type_name(definition.name)
+
+            # Track this type occurrence and the statistics of its fields
+            self.type_counts[normalized_name] += weight
+            field_stats = self.field_stats[normalized_name]
+            members = self.members.setdefault(normalized_name, {})
+            for field_name, field_types in definition.members.items():
+                types = self._field_types(field_types)
+                field_stats[field_name].add(types, weight)
+                merged_types = members.get(field_name)
+                if merged_types is None:
+                    members[field_name] = types
+                else:
+                    merged_types |= types
+
+    def counters(self, builder: DefinitionBuilder) -> ExampleCounters:
+        """The counters `add` counted the examples of the builder in, none for
+        an empty example, to count more examples typed the same with `count`.
+        """
+        definitions = builder.definitions
+        if len(definitions) == 1 and not definitions[0].members:
+            return []
+
+        counters: ExampleCounters = []
+        for definition in definitions:
+            normalized_name = self._normalize_type_name(definition.name)
+            field_stats = self.field_stats[normalized_name]
+            fields = []
+            for field_name, field_types in definition.members.items():
+                type_names = [
+                    t.name if isinstance(t, DictEntry) else str(t)
+                    for t in self._field_types(field_types)
+                ]
+                fields.append((field_stats[field_name], type_names))
+            counters.append((normalized_name, fields))
+        return counters
+
+    def count(self, counters: ExampleCounters, weight: int = 1) -> None:
+        """Count `weight` more examples typed the same as the ones `counters`
+        were returned for, which is all that adding them would change.
+        """
+        self.total_examples += weight
+        if not counters:
+            self.empty_examples += weight
+        for name, fields in counters:
+            self.type_counts[name] += weight
+            for field_stats, type_names in fields:
+                field_stats.count(type_names, weight)
+
+    def merge(self, other: "_ExampleMerger") -> None:
+        """Add the examples merged by another merger, following the examples
+        merged by this one.
+        """
+        with phase("merge"):
+            if self.empty_position is None and other.empty_position is not None:
+                names = itertools.islice(other.members, other.empty_position)
+                self.empty_position = len(self.members) + sum(
+                    1 for name in names if name not in self.members
+                )
+            self.empty_examples += other.empty_examples
+            self.empty_name = self.empty_name or other.empty_name
+            self.total_examples += other.total_examples
+
+            for name, fields in other.members.items():
+                self.type_counts[name] += other.type_counts[name]
+                field_stats = self.field_stats[name]
+                members = self.members.setdefault(name, {})
+                for field_name, types in fields.items():
+                    field_stats[field_name].update(other.field_stats[name][field_name])
+                    merged_types = members.get(field_name)
+                    if merged_types is None:
+                        members[field_name] = set(types)
+                    else:
+                        merged_types |= types
+
+    def dump_state(self) -> Dict[str, Any]:
+        """The merged examples as JSON values, with the referenced definitions
+        as their name and keys.
+        """
+
+        def dump_reference(entry: DictEntry) -> Dict[str, Any]:
+            return {"name": entry.name, "keys": list(entry.members)}
+
+        definitions = []
+        for name, fields in self.members.items():
+            field_stats = self.field_stats[name]
+            definitions.append(
+                [
+                    name,
+                    self.type_counts[name],
+                    [
+                        [
+                            field_name,
+                            [_dump_type(t, dump_reference) for t in types],
+                            field_stats[field_name].presence,
+                            dict(field_stats[field_name].types),
+                        ]
+                        for field_name, types in fields.items()
+                    ],
+                ]
+            )
+        return {
+            "definitions": definitions,
+            "total_examples": self.total_examples,
+            "empty_examples": self.empty_examples,
+            "empty_name": self.empty_name,
+            "empty_position": self.empty_position,
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """Merge what dump_state returned the state for, into an empty merger"""
+
+        def load_reference(value: Dict[str, Any]) -> DictEntry:
+            return self._reference_definition(
+                DictEntry(value["name"], members={key: set() for key in value["keys"]})
+            )
+
+        for name, type_count, fields in state["definitions"]:
+            self.type_counts[name] = type_count
+            field_stats = self.field_stats[name]
+            members = self.members[name] = {}
+            for field_name, types, presence, type_counts in fields:
+                members[field_name] = {_load_type(t, load_reference) for t in types}
+                field_stats[field_name].presence = presence
+                field_stats[field_name].types.update(type_counts)
+        self.total_examples = state["total_examples"]
+        self.empty_examples = state["empty_examples"]
+        self.empty_name = state["empty_name"]
+        self.empty_position = state["empty_position"]
+
+    def build(
+        self,
+        *,
+        type_postfix: str,
+        show_imports: bool,
+        name_map: Optional[NameMap],
+        sampling: Optional[Sampling] = None,
+        optional_threshold: float = 1.0,
+        include_empty: bool = True,
+    ) -> DefinitionBuilder:
+        """Mark fields as optional if they appear in less than the
+        `optional_threshold` share of the examples of their type, by default
+        if they don't appear in all of them, and return a builder holding the
+        merged definitions. Without `include_empty` the empty examples aren't
+        counted.
+        """
+        with phase("merge"):
+            return self._build(
+                type_postfix=type_postfix,
+                show_imports=show_imports,
+                name_map=name_map,
+                sampling=sampling,
+                optional_threshold=optional_threshold,
+                include_empty=include_empty,
+            )
+
+    def _build(
+        self,
+        *,
+        type_postfix: str,
+        show_imports: bool,
+        name_map: Optional[NameMap],
+        sampling: Optional[Sampling],
+        optional_threshold: float,
+        include_empty: bool,
+    ) -> DefinitionBuilder:
+        final_builder = DefinitionBuilder(
+            None,
+            root_type_name=self.root_type_name,
+            type_postfix=type_postfix,
+            show_imports=show_imports,
+            force_alternative=self.force_alternative,
+            name_map=name_map,
+            sampling=sampling,
+        )
+
+        total_examples = self.total_examples
+        type_counts = dict(self.type_counts)
+        names = list(self.members)
+        if self.empty_examples and include_empty:
+            # Merged where the first empty example was found, unless examples
+            # of the same type came before
+            assert self.empty_name is not None and self.empty_position is not None
+            empty_name = self.empty_name
+            type_counts[empty_name] = (
+                type_counts.get(empty_name, 0) + self.empty_examples
+            )
+            position = self.empty_position
+            if empty_name in self.members:
+                position = min(position, names.index(empty_name))
+                names.remove(empty_name)
+            names.insert(position, empty_name)
+        elif self.empty_examples:
+            total_examples -= self.empty_examples
+
+        definitions = {
+            name: DictEntry(
+                name,
+                members={
+                    field_name: set() for field_name in self.members.get(name, {})
+                },
+                force_alternative=self.force_alternative,
+            )
+            for name in names
+        }
+
+        for type_name, definition in definitions.items():
+            # For the root type, we need to consider all examples
+            if type_name == self.root_type_name:
+                examples_for_this_type = total_examples
             else:
-                # Field exists, check if it should be optional
-                field_count = field_presence[type_name][field_name]
-                
-                # Special case: if we have empty dict, ALL fields should be optional
-                if has_empty_dict or field_count < examples_for_this_type:
+                examples_for_this_type = type_counts[type_name]
+
+            for field_name, types in self.members.get(type_name, {}).items():
+                field_types = definition.members[field_name]
+                field_types.update(types)
+
+                field_count = self.field_stats[type_name][field_name].presence
+                if field_count < examples_for_this_type * optional_threshold:
                     # Add None to make it optional
-                    none_entry = MemberEntry("None")
-                    definition.members[field_name].add(none_entry)
-        
-        # Special handling for empty dict case: make ALL fields in ALL types optional
-        if has_empty_dict:
-            for field_name, field_types in definition.members.items():
-                none_entry = MemberEntry("None")
-                definition.members[field_name].add(none_entry)
-    
-    # Add all merged definitions to the final builder, but clear existing ones first
-    final_builder.definitions = []
-    for definition in all_definitions.values():
-        final_builder._add_definition(definition)
-    
-    return final_builder
+                    field_types.add(MemberEntry("None"))
+
+        # Add all merged definitions to the final builder
+        for definition in definitions.values():
+            final_builder._add_definition(definition)
+
+        return final_builder
+
+
+class _RecordTypes:
+    """The types of records typed once each, both as the items of a list and
+    as examples of one type, to render either way.
+    """
+
+    def __init__(
+        self,
+        *,
+        root_type_name: str,
+        type_postfix: str,
+        force_alternative: bool,
+        name_map: Optional[NameMap],
+        sampling: Optional[Sampling] = None,
+    ) -> None:
+        self.root_type_name = root_type_name
+        self.type_postfix = type_postfix
+        self.force_alternative = force_alternative
+        self.name_map = name_map
+        self.sampling = sampling
+
+        self.items = _ItemLog(**self._options())
+        self.merger = _ExampleMerger(root_type_name, force_alternative)
+        # The first non-empty record typed as the root, and its type
+        self.first: Optional[_ItemLog] = None
+        self.first_type: Optional[Entry] = None
+        # Holds the definitions of one example at a time
+        self._example = DefinitionBuilder(None, show_imports=False, **self._options())
+
+    def _options(self) -> Dict[str, Any]:
+        return {
+            "root_type_name": self.root_type_name,
+            "type_postfix": self.type_postfix,
+            "force_alternative": self.force_alternative,
+            "name_map": self.name_map,
+            "sampling": self.sampling,
+        }
+
+    def add(self, record: Any, idx: int, weight: int = 1) -> None:
+        """Type the record at `idx`, counting it as `weight` examples"""
+        if not isinstance(record, dict):
+            self.items.add_item(record, idx)
+            return
+
+        example = self._example
+        example.definitions = []
+        self.items.add_item(record, idx, example)
+        self.merger.add(example, weight)
+        if record and self.first is None:
+            self.first = _ItemLog(record, **self._options())
+            self.first_type = self.first._type_source()
+
+    def counters(self, record: Any) -> Optional[ExampleCounters]:
+        """The counters of the example of the record just added, for dicts. As
+        typing records the same again doesn't change anything else, they're
+        added by counting them with `merger.count`.
+        """
+        if not isinstance(record, dict):
+            return None
+        return self.merger.counters(self._example)
+
+    def merge(self, other: "_RecordTypes", offset: int) -> None:
+        """Add the records typed by another one, following the `offset`
+        records typed by this one.
+        """
+        self.items.merge(other.items, offset)
+        self.merger.merge(other.merger)
+        if self.first is None:
+            self.first, self.first_type = other.first, other.first_type
+
+    def dump_state(self) -> Dict[str, Any]:
+        """The types of the records as JSON values"""
+        first = None
+        if self.first is not None:
+            assert self.first_type is not None
+            first = self.first.dump_state()
+            first["type"] = self.first.dump_types([self.first_type])[0]
+        return {
+            "items": self.items.dump_state(),
+            "examples": self.merger.dump_state(),
+            "first": first,
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """Type the records dump_state returned the state for, with no records
+        typed so far.
+        """
+        self.items.load_state(state["items"])
+        self.merger.load_state(state["examples"])
+        if state["first"] is not None:
+            self.first = _ItemLog(**self._options())
+            self.first.load_state(state["first"])
+            (self.first_type,) = self.first.load_types([state["first"]["type"]])
+
+    def render(
+        self,
+        *,
+        as_examples: bool,
+        total: int,
+        empty_count: int,
+        show_imports: bool,
+        optional_threshold: float = 1.0,
+        sampled: bool = False,
+    ) -> str:
+        """Render the records as examples of one type or as a list of them,
+        `total` and `empty_count` counting all the records and the empty ones.
+        """
+        options = self._options()
+        options["show_imports"] = show_imports
+
+        if as_examples and empty_count == 1 and self.first is not None:
+            # With a single empty dict the type is merged from the non-empty
+            # ones, the only one as it is
+            if total == 2:
+                builder = DefinitionBuilder(None, **options)
+                first_type = _replay(builder, self.first)
+                _set_non_total(builder, self.root_type_name)
+            else:
+                builder = self.merger.build(
+                    type_postfix=self.type_postfix,
+                    show_imports=show_imports,
+                    name_map=self.name_map,
+                    sampling=self.sampling,
+                    optional_threshold=optional_threshold,
+                    include_empty=False,
+                )
+                _set_non_total(builder, self.root_type_name)
+                first_type = _replay(builder, self.first)
+                sampled = sampled or self.items.sampled
+            builder.sampled = builder.sampled or sampled
+            assert self.first_type is not None
+            return _build_optional_root_output(
+                builder,
+                self.root_type_name,
+                self.type_postfix,
+                first_type(self.first_type),
+            )
+
+        if as_examples:
+            builder = self.merger.build(
+                type_postfix=self.type_postfix,
+                show_imports=show_imports,
+                name_map=self.name_map,
+                sampling=self.sampling,
+                optional_threshold=optional_threshold,
+            )
+        else:
+            builder = DefinitionBuilder(None, **options)
+        item_type = _replay(builder, self.items)
+        builder.sampled = builder.sampled or sampled
+        return builder._render(
+            MemberEntry(
+                "List", sub_members={item_type(t) for t in self.items.item_types}
+            )
+        )
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from keyword import iskeyword
 from typing import List
 
@@ -9,6 +10,7 @@ def is_valid_key(key: str) -> bool:
     return key.isidentifier()
 
 
+@lru_cache(maxsize=1024)
 def key_to_class_name(key: str) -> str:
     # First split on non characters
     parts1 = re.split(r"[^a-zA-Z0-9]", key)
@@ -0,0 +1,13 @@
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """Keep the output cache of each test to itself instead of ~/.cache"""
+    directory = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("DICT_TYPER_CACHE_DIR", str(directory))
+    return directory
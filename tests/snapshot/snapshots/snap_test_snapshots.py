@@ -18,6 +18,15 @@ class DataItem0(TypedDict):
     id: str
 
 
+class Cursors(TypedDict):
+    after: str
+
+
+class Paging(TypedDict):
+    cursors: Cursors
+    next: str
+
+
 class Comments(TypedDict):
     data: Union[List[DataItem01], List[DataItem0]]
     paging: Optional[Paging]
@@ -27,6 +36,10 @@ class Owner(TypedDict):
     id: str
 
 
+class Children(TypedDict):
+    data: Union[List[DataItem01], List[DataItem0], List[Owner]]
+
+
 class Root(TypedDict):
     caption: str
     comments: Comments
@@ -45,19 +58,6 @@ class Root(TypedDict):
     children: Optional[Children]
 
 
-class Children(TypedDict):
-    data: Union[List[DataItem01], List[DataItem0], List[Owner]]
-
-
-class Cursors(TypedDict):
-    after: str
-
-
-class Paging(TypedDict):
-    cursors: Cursors
-    next: str
-
-
 class RootItem0(TypedDict):
     caption: str
     comments: Union[Children, Comments]
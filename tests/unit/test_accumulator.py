@@ -0,0 +1,252 @@
+import io
+import json
+import pickle
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from click.testing import CliRunner
+
+from dict_typer import SchemaAccumulator, cli, get_type_definitions
+from dict_typer.accumulator import shape_of
+
+RECORDS: List[Any] = [
+    {"id": 1, "name": "John", "tags": ["a", "b"], "sub": {"a": 1}},
+    {"id": 2, "name": "Jane", "tags": []},
+    {"id": 3, "email": "bob@example.com", "sub": {"a": 2, "b": 3}},
+    {"id": 4, "name": "Jim", "tags": ["c"], "sub": {"a": None}},
+    {"id": 5, "name": "Joe", "tags": ["a", "b", "c"]},
+]
+
+
+def _accumulate(records: List[Any], **kwargs: Any) -> SchemaAccumulator:
+    accumulator = SchemaAccumulator(**kwargs)
+    for record in records:
+        accumulator.add(record)
+    return accumulator
+
+
+def test_shape_of() -> None:
+    assert shape_of({"a": 1, "b": [None, "x"]}) == shape_of({"a": 2, "b": [None, "y"]})
+    assert shape_of({"a": 1}) != shape_of({"a": 1.0})
+    assert shape_of({"a": 1, "b": 2}) != shape_of({"b": 2, "a": 1})
+    # Repeated items don't change the shape, but item type names include the
+    # index, so the order of distinct items does
+    assert shape_of(["a", "b", 1]) == shape_of(["a", "c", 1, 2])
+    assert shape_of([{"a": 1}, {"b": 1}]) != shape_of([{"b": 1}, {"a": 1}])
+
+
+@pytest.mark.parametrize(
+    "records",
+    [
+        RECORDS,
+        [{"id": 1, "name": "foo"}, {"id": 2, "name": "bar"}],
+        [{"a": 1}, {"b": "2"}, 3, None],
+        [{"a": 1, "b": [{"x": 1}]}, {}],
+        [],
+    ],
+)
+def test_accumulator_matches_list_of_samples(records: List[Any]) -> None:
+    assert _accumulate(records, type_postfix="Type").render() == (
+        get_type_definitions(records, type_postfix="Type")
+    )
+
+
+def test_accumulator_state_does_not_grow_with_the_samples() -> None:
+    records = [{"id": idx, "sub": {"tags": ["a"] * idx}} for idx in range(100)]
+    few, many = _accumulate(records[:2]), _accumulate(records)
+
+    assert many.count == 100
+    assert many._types.items.names == few._types.items.names
+    assert many._types.merger.members == few._types.merger.members
+
+
+def test_accumulator_merge_is_associative() -> None:
+    expected = get_type_definitions(RECORDS)
+    first, second, third = RECORDS[:1], RECORDS[1:3], RECORDS[3:]
+
+    left = _accumulate(first).merge(_accumulate(second)).merge(_accumulate(third))
+    right = _accumulate(first).merge(_accumulate(second).merge(_accumulate(third)))
+
+    assert left.render() == expected
+    assert right.render() == expected
+
+
+def test_accumulator_can_be_pickled() -> None:
+    accumulator = pickle.loads(pickle.dumps(_accumulate(RECORDS[:2])))
+    accumulator.merge(pickle.loads(pickle.dumps(_accumulate(RECORDS[2:]))))
+
+    assert accumulator.render() == get_type_definitions(RECORDS)
+
+
+def test_accumulator_merge_requires_the_same_options() -> None:
+    with pytest.raises(ValueError):
+        SchemaAccumulator().merge(SchemaAccumulator(type_postfix="Type"))
+
+
+def test_accumulator_state_round_trip() -> None:
+    state = io.StringIO()
+    _accumulate(RECORDS[:3], type_postfix="Type").dump(state)
+    state.seek(0)
+
+    accumulator = SchemaAccumulator.load(state)
+    for record in RECORDS[3:]:
+        accumulator.add(record)
+
+    assert accumulator.count == len(RECORDS)
+    assert accumulator.render() == get_type_definitions(RECORDS, type_postfix="Type")
+
+
+def test_accumulator_optional_threshold() -> None:
+    records = [{"id": idx, "name": "x"} for idx in range(999)] + [{"id": 999}]
+    accumulator = _accumulate(records)
+
+    assert "name: str" in accumulator.render(optional_threshold=0.999)
+    assert "name: Optional[str]" in accumulator.render(optional_threshold=1.0)
+    assert accumulator.render() == get_type_definitions(records)
+    assert accumulator.render(optional_threshold=0.99) == get_type_definitions(
+        records, optional_threshold=0.99
+    )
+    with pytest.raises(ValueError):
+        accumulator.render(optional_threshold=1.5)
+
+
+def test_accumulator_field_stats() -> None:
+    field_stats = _accumulate(RECORDS * 2).field_stats()
+
+    assert field_stats["Root"]["id"].presence == 10
+    assert field_stats["Root"]["name"].presence == 8
+    assert field_stats["Root"]["tags"].types == {"List[str]": 6, "List": 2}
+    assert field_stats["Sub"]["a"].presence == 6
+    assert field_stats["Sub"]["a"].nulls == 2
+    assert field_stats["Sub"]["a"].types == {"int": 4, "None": 2}
+
+
+def test_accumulator_field_stats_are_counted_when_adding() -> None:
+    accumulator = _accumulate(RECORDS)
+    field_stats = accumulator.field_stats()
+    accumulator.add({"id": 6, "sub": {"b": "x"}})
+
+    assert field_stats["Root"]["id"].presence == 5
+    assert accumulator.field_stats()["Root"]["id"].presence == 6
+    assert accumulator.field_stats()["Sub"]["b"].types == {"int": 1, "str": 1}
+
+    records = RECORDS[:2] + RECORDS[2:] * 3
+    merged = _accumulate(records[:2]).merge(_accumulate(records[2:]))
+    assert repr(merged.field_stats()) == repr(_accumulate(records).field_stats())
+
+
+def test_accumulator_state_keeps_the_number_of_samples_of_each_shape() -> None:
+    records = [{"id": 1, "name": "x"}] * 3 + [{"id": 2}]
+    state = io.StringIO()
+    _accumulate(records).dump(state)
+    state.seek(0)
+
+    accumulator = SchemaAccumulator.load(state)
+
+    assert accumulator.field_stats()["Root"]["name"].presence == 3
+    assert accumulator.render(optional_threshold=0.75) == get_type_definitions(
+        records, optional_threshold=0.75
+    )
+
+
+def test_accumulator_state_keeps_types_that_are_not_json() -> None:
+    records: List[Any] = [{"a": (1, "x"), "b": {1, 2}}, {"a": (None,), "c": [(1.5,)]}]
+    state = io.StringIO()
+    _accumulate(records).dump(state)
+    state.seek(0)
+
+    assert SchemaAccumulator.load(state).render() == get_type_definitions(records)
+
+
+def test_accumulator_state_rejects_other_versions() -> None:
+    with pytest.raises(ValueError):
+        SchemaAccumulator.load(io.StringIO(json.dumps({"version": 0})))
+
+
+def test_accumulator_state_rejects_invalid_states() -> None:
+    state = io.StringIO()
+    _accumulate(RECORDS).dump(state)
+    invalid = json.loads(state.getvalue())
+    invalid["types"]["items"]["members"] = [[["id"]]]
+
+    with pytest.raises(ValueError):
+        SchemaAccumulator.load(io.StringIO(json.dumps(invalid)))
+
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_accumulator_loads_states_of_samples(version: int) -> None:
+    records = [{"id": 1, "name": "x"}] * 3 + [{"id": 2}]
+    samples = [[0, records[0], 3], [3, records[3], 1]]
+    state = {
+        "version": version,
+        "root_type_name": "Root",
+        "type_postfix": "",
+        "force_alternative": False,
+        "stats": {
+            "total": 4,
+            "empty_count": 0,
+            "all_dicts": True,
+            "field_counts": {"id": 4, "name": 3},
+        },
+        "samples": [sample[:2] for sample in samples] if version == 1 else samples,
+    }
+
+    accumulator = SchemaAccumulator.load(io.StringIO(json.dumps(state)))
+
+    assert accumulator.count == 4
+    if version == 2:
+        assert accumulator.render(optional_threshold=0.75) == get_type_definitions(
+            records, optional_threshold=0.75
+        )
+    assert accumulator.render() == get_type_definitions(records)
+
+
+def test_cli_state(tmp_path: Path) -> None:
+    state = str(tmp_path / "state.json")
+    runner = CliRunner()
+
+    first = runner.invoke(cli, ["--state-out", state], input=json.dumps(RECORDS[:2]))
+    ndjson = "\n".join(json.dumps(record) for record in RECORDS[2:])
+    second = runner.invoke(
+        cli, ["--state-in", state, "--state-out", state, "--ndjson"], input=ndjson
+    )
+
+    assert first.exit_code == 0
+    assert first.output == get_type_definitions(RECORDS[:2]) + "\n"
+    assert second.exit_code == 0
+    assert second.output == get_type_definitions(RECORDS) + "\n"
+    assert list(tmp_path.iterdir()) == [tmp_path / "state.json"]
+
+
+def test_cli_render_state(tmp_path: Path) -> None:
+    records = [{"id": 1, "name": "x"}] * 3 + [{"id": 2}]
+    state = str(tmp_path / "state.json")
+    runner = CliRunner()
+    runner.invoke(cli, ["--state-out", state], input=json.dumps(records))
+
+    result = runner.invoke(
+        cli,
+        ["--state-in", state, "--render-state", "--optional-threshold", "0.75"],
+        input="",
+    )
+
+    assert result.exit_code == 0
+    assert (
+        result.output == get_type_definitions(records, optional_threshold=0.75) + "\n"
+    )
+    assert runner.invoke(cli, ["--render-state"], input="").exit_code != 0
+    assert (
+        runner.invoke(cli, ["--state-in", state, "--render-state", state]).exit_code
+        != 0
+    )
+
+
+def test_cli_state_rejects_invalid_files(tmp_path: Path) -> None:
+    state = tmp_path / "state.json"
+    state.write_text("[]")
+
+    result = CliRunner().invoke(cli, ["--state-in", str(state)], input="[]")
+
+    assert result.exit_code != 0
+    assert "Invalid state file" in result.output
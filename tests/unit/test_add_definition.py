@@ -0,0 +1,153 @@
+from dict_typer.models import DictEntry, MemberEntry
+from dict_typer.type_definitions import DefinitionBuilder, get_type_definitions
+
+
+def _entry(name: str, *keys: str, member_type: str = "int") -> DictEntry:
+    return DictEntry(name, members={key: {MemberEntry(member_type)} for key in keys})
+
+
+def test_add_definition_merges_same_keys() -> None:
+    builder = DefinitionBuilder(None)
+    first = builder._add_definition(_entry("Foo", "a", "b"))
+
+    merged = builder._add_definition(_entry("Bar", "b", "a", member_type="str"))
+
+    assert merged is first
+    assert builder.definitions == [first]
+    # fmt: off
+    assert str(first) == "\n".join([
+        "class Foo(TypedDict):",
+        "    a: Union[int, str]",
+        "    b: Union[int, str]",
+    ])
+    # fmt: on
+
+
+def test_add_definition_keeps_list_items_of_different_bases_apart() -> None:
+    builder = DefinitionBuilder(None)
+    hosts = builder._add_definition(_entry("HostsItem0", "id", "name"))
+    authors = builder._add_definition(_entry("AuthorsItem0", "id", "name"))
+
+    assert hosts is not authors
+    assert builder._add_definition(_entry("AuthorsItem1", "id", "name")) is authors
+    assert builder._add_definition(_entry("Owner", "id", "name")) is hosts
+
+
+def test_add_definition_renames_on_name_collisions() -> None:
+    builder = DefinitionBuilder(None)
+    for keys in [("a",), ("b",), ("c",), ("d",)]:
+        builder._add_definition(_entry("Foo", *keys))
+
+    assert [d.name for d in builder.definitions] == ["Foo", "Foo1", "Foo2", "Foo3"]
+
+
+def test_add_definition_handles_replaced_definitions() -> None:
+    builder = DefinitionBuilder(None)
+    builder._add_definition(_entry("Foo", "a"))
+
+    replacement = _entry("Bar", "a")
+    builder.definitions = [replacement]
+
+    assert builder._add_definition(_entry("Baz", "a")) is replacement
+    assert builder._add_definition(_entry("Bar", "b")).name == "Bar1"
+
+
+def test_sorted_definitions_puts_dependencies_first() -> None:
+    sub_entry = _entry("Sub", "a")
+    nested = MemberEntry(
+        "List", sub_members={MemberEntry("List", sub_members={sub_entry})}
+    )
+    root = DictEntry("Root", members={"subs": {nested}})
+    other = _entry("Other", "b")
+
+    builder = DefinitionBuilder(None)
+    builder.definitions = [root, other, sub_entry]
+
+    assert builder._sorted_definitions() == [sub_entry, root, other]
+
+
+def test_sorted_definitions_includes_dependencies_added_by_merging() -> None:
+    builder = DefinitionBuilder(None)
+    root = builder._add_definition(_entry("Root", "sub"))
+    sub_entry = builder._add_definition(_entry("Sub", "a"))
+    builder._add_definition(DictEntry("Root", members={"sub": {sub_entry}}))
+
+    assert builder._sorted_definitions() == [sub_entry, root]
+
+
+def test_sorted_definitions_breaks_cycles() -> None:
+    first = _entry("First", "a")
+    second = DictEntry("Second", members={"first": {first}})
+    first.members["a"].add(second)
+
+    builder = DefinitionBuilder(None)
+    builder.definitions = [first, second]
+
+    assert builder._sorted_definitions() == [second, first]
+
+
+def test_get_definition_reuses_definitions_of_the_same_shape() -> None:
+    builder = DefinitionBuilder(None)
+    first = builder._get_definition({"a": 1, "sub": {"b": 1}}, "FooItem0")
+
+    second = builder._get_definition({"a": 2, "sub": {"b": None}}, "FooItem1")
+
+    assert second is first
+    assert len(builder._fingerprints) == 3
+    # fmt: off
+    assert "\n\n\n".join(str(d) for d in builder.definitions) == "\n".join([
+        "class Sub(TypedDict):",
+        "    b: Optional[int]",
+        "",
+        "",
+        "class FooItem0(TypedDict):",
+        "    a: int",
+        "    sub: Sub",
+    ])
+    # fmt: on
+
+
+def test_get_definition_keeps_list_items_of_different_bases_apart() -> None:
+    builder = DefinitionBuilder(None)
+    hosts = builder._get_definition({"id": 1}, "HostsItem0")
+
+    assert builder._get_definition({"id": 2}, "HostsItem5") is hosts
+    assert builder._get_definition({"id": 3}, "AuthorsItem0") is not hosts
+
+
+def test_get_definition_forgets_shapes_of_replaced_definitions() -> None:
+    builder = DefinitionBuilder(None)
+    builder._get_definition({"a": 1}, "Foo")
+
+    replacement = _entry("Bar", "a")
+    builder.definitions = [replacement]
+
+    assert builder._get_definition({"a": 1}, "Foo") is replacement
+
+
+def test_sorted_definitions_keeps_dependencies_with_the_same_keys() -> None:
+    # Entries with the same keys are equal, but are different definitions
+    first_sub = DictEntry("First")
+    second_sub = DictEntry("Second")
+    root = DictEntry("Root", members={"first": {first_sub}, "second": {second_sub}})
+
+    builder = DefinitionBuilder(None)
+    builder.definitions = [root, first_sub, second_sub]
+
+    assert [entry.name for entry in builder._sorted_definitions()] == [
+        "First",
+        "Second",
+        "Root",
+    ]
+
+
+def test_definitions_are_defined_before_they_are_referenced() -> None:
+    source = [
+        {"id": 1, "x": 1, "c": {"k": 1}},
+        {"id": 2, "x": 1, "c": {}},
+        {"id": 3, "e": {}},
+    ]
+
+    output = get_type_definitions(source)
+
+    assert output.index("class E(TypedDict)") < output.index("e: Optional[E]")
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, List
+
+import pytest
+
+from dict_typer import (
+    AsyncSchemaAccumulator,
+    aget_type_definitions,
+    get_type_definitions,
+)
+from dict_typer.stats import Stats, collect_stats
+
+RECORDS: List[Any] = [
+    {"id": 1, "name": "John", "tags": ["a", "b"], "sub": {"a": 1}},
+    {"id": 2, "name": "Jane", "tags": []},
+    {"id": 3, "email": "bob@example.com", "sub": {"a": 2, "b": 3}},
+    {"id": 4, "name": "Jim", "tags": ["c"], "sub": {"a": None}},
+    {"id": 5, "name": "Joe", "tags": ["a", "b", "c"]},
+]
+
+
+async def _records(records: List[Any]) -> AsyncIterator[Any]:
+    for record in records:
+        await asyncio.sleep(0)
+        yield record
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 100])
+def test_aget_type_definitions(batch_size: int) -> None:
+    output = asyncio.run(
+        aget_type_definitions(
+            _records(RECORDS), batch_size=batch_size, type_postfix="Type"
+        )
+    )
+
+    assert output == get_type_definitions(RECORDS, type_postfix="Type")
+
+
+def test_aget_type_definitions_iterable() -> None:
+    assert asyncio.run(aget_type_definitions(RECORDS)) == get_type_definitions(RECORDS)
+    assert asyncio.run(aget_type_definitions([])) == get_type_definitions([])
+
+
+def test_async_accumulator_process_pool() -> None:
+    async def accumulate() -> str:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            accumulator = AsyncSchemaAccumulator(batch_size=2, executor=executor)
+            await accumulator.extend(RECORDS)
+            assert accumulator.count == len(RECORDS)
+            return await accumulator.render()
+
+    assert asyncio.run(accumulate()) == get_type_definitions(RECORDS)
+
+
+def test_async_accumulator_concurrent_flushes() -> None:
+    async def accumulate() -> str:
+        accumulator = AsyncSchemaAccumulator(batch_size=100)
+        flushes = []
+        for record in RECORDS:
+            await accumulator.add(record)
+            flushes.append(asyncio.ensure_future(accumulator.flush()))
+        await asyncio.gather(*flushes)
+        return await accumulator.render()
+
+    assert asyncio.run(accumulate()) == get_type_definitions(RECORDS)
+
+
+def test_async_accumulator_does_not_block_the_loop() -> None:
+    records = [{"id": i, "sub": {f"key{i % 50}": [i, str(i)]}} for i in range(20000)]
+    ticks: List[float] = []
+
+    async def tick() -> None:
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.001)
+
+    async def accumulate() -> str:
+        ticker = asyncio.ensure_future(tick())
+        await asyncio.sleep(0)
+        output = await aget_type_definitions(records, batch_size=500)
+        ticker.cancel()
+        return output
+
+    assert asyncio.run(accumulate()) == get_type_definitions(records)
+    # The ticker kept running while the records were typed
+    assert len(ticks) > 5
+
+
+def test_async_accumulator_collects_stats() -> None:
+    stats = Stats()
+
+    async def accumulate() -> str:
+        with collect_stats(stats):
+            return await aget_type_definitions(RECORDS, batch_size=2)
+
+    asyncio.run(accumulate())
+
+    assert stats.counts["get_type_calls"] > 0
+
+
+def test_async_accumulator_invalid_batch_size() -> None:
+    with pytest.raises(ValueError):
+        AsyncSchemaAccumulator(batch_size=0)
@@ -0,0 +1,155 @@
+import io
+import json
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from click.testing import CliRunner
+
+from dict_typer import SchemaAccumulator, cli, get_type_definitions
+from dict_typer.batch import accumulate_files, expand_paths, read_document, type_files
+
+DOCUMENTS: List[Any] = [
+    {"id": 1, "name": "John", "sub": {"a": 1}},
+    {"id": 2, "name": "Jane"},
+    [{"id": 3, "email": "bob@example.com"}, {"id": 4}],
+    {"id": 5, "sub": {"a": 2, "b": [1, "2"]}},
+]
+
+
+def _write_documents(directory: Path) -> List[str]:
+    paths = []
+    for idx, document in enumerate(DOCUMENTS):
+        path = directory / f"doc{idx}.json"
+        path.write_text(json.dumps(document))
+        paths.append(str(path))
+    return paths
+
+
+def _records() -> List[Any]:
+    records: List[Any] = []
+    for document in DOCUMENTS:
+        records.extend(document if isinstance(document, list) else [document])
+    return records
+
+
+def test_expand_paths(tmp_path: Path) -> None:
+    paths = _write_documents(tmp_path)
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "more.json").write_text("{}")
+
+    assert expand_paths([str(tmp_path / "*.json")]) == paths
+    assert expand_paths([str(tmp_path / "**" / "*.json")]) == sorted(
+        paths + [str(tmp_path / "nested" / "more.json")]
+    )
+    assert expand_paths(["plain.json", str(tmp_path / "doc0.*")]) == [
+        "plain.json",
+        paths[0],
+    ]
+    with pytest.raises(ValueError):
+        expand_paths([str(tmp_path / "*.yaml")])
+
+
+@pytest.mark.parametrize("backend", ["json", "auto"])
+def test_read_document(tmp_path: Path, backend: str) -> None:
+    path = tmp_path / "doc.json"
+    for text in ['\n {"id": 12345678901234567890123, "a": [1.5]}\n\n', "[]", " 1 "]:
+        path.write_text(text)
+
+        # Memory mapped, and read from a buffer, or as text
+        with open(path, "rb") as f:
+            assert read_document(f, backend) == json.loads(text)
+        with open(path, "r") as f:
+            assert read_document(f, backend) == json.loads(text)
+        assert read_document(io.BytesIO(text.encode()), backend) == json.loads(text)
+
+    for text in ["", "  \n", '{"a": [1,}']:
+        path.write_text(text)
+        with pytest.raises(json.JSONDecodeError) as expected:
+            json.loads(text.strip())
+        with open(path, "rb") as f, pytest.raises(json.JSONDecodeError) as error:
+            read_document(f, backend)
+        assert str(error.value) == str(expected.value)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_accumulate_files(tmp_path: Path, workers: int) -> None:
+    paths = _write_documents(tmp_path)
+
+    accumulator = accumulate_files(paths, SchemaAccumulator(), workers=workers)
+
+    assert accumulator.count == len(_records())
+    assert accumulator.render() == get_type_definitions(_records())
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_type_files(tmp_path: Path, workers: int) -> None:
+    paths = _write_documents(tmp_path)
+
+    outputs = list(type_files(paths, workers=workers, show_imports=False))
+
+    assert outputs == [get_type_definitions(d, show_imports=False) for d in DOCUMENTS]
+
+
+def test_cli_merges_multiple_files(tmp_path: Path) -> None:
+    _write_documents(tmp_path)
+
+    result = CliRunner().invoke(cli, [str(tmp_path / "*.json")])
+
+    assert result.exit_code == 0
+    assert result.output == get_type_definitions(_records()) + "\n"
+
+
+def test_cli_output_dir(tmp_path: Path) -> None:
+    paths = _write_documents(tmp_path)
+    output_dir = tmp_path / "types"
+
+    result = CliRunner().invoke(
+        cli, ["--output-dir", str(output_dir), "-j", "2", *paths]
+    )
+
+    assert result.exit_code == 0
+    assert result.output == ""
+    assert sorted(p.name for p in output_dir.iterdir()) == [
+        f"doc{i}.py" for i in range(4)
+    ]
+    for idx, document in enumerate(DOCUMENTS):
+        assert (output_dir / f"doc{idx}.py").read_text() == get_type_definitions(
+            document
+        ) + "\n"
+
+
+def test_cli_output_dir_rejects_clashing_names(tmp_path: Path) -> None:
+    for directory in ("a", "b"):
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "doc.json").write_text("{}")
+
+    result = CliRunner().invoke(
+        cli, ["-o", str(tmp_path / "types"), str(tmp_path / "*" / "doc.json")]
+    )
+
+    assert result.exit_code != 0
+    assert "would both be written to" in result.output
+
+
+def test_cli_multiple_files_invalid_json(tmp_path: Path) -> None:
+    paths = _write_documents(tmp_path)
+    (tmp_path / "invalid.json").write_text("{")
+
+    result = CliRunner().invoke(cli, [*paths, str(tmp_path / "invalid.json")])
+
+    assert result.exit_code != 0
+    assert f"JSON serialisation error in {tmp_path / 'invalid.json'}" in result.output
+
+
+@pytest.mark.parametrize(
+    "args", [["--sample", "2"], ["--rich", "-o", "types"], ["-"], ["missing.json"]]
+)
+def test_cli_multiple_files_rejects_invalid_usage(
+    tmp_path: Path, args: List[str]
+) -> None:
+    paths = _write_documents(tmp_path)
+
+    result = CliRunner().invoke(cli, [*args, *paths])
+
+    assert result.exit_code == 2
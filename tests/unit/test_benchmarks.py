@@ -0,0 +1,54 @@
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from benchmarks.generators import GENERATORS, fixtures
+from benchmarks.run import main, run_benchmarks
+from dict_typer import get_type_definitions
+
+
+def test_generators_are_deterministic() -> None:
+    for generator, _ in GENERATORS.values():
+        assert generator(5) == generator(5)
+        assert get_type_definitions(generator(5))
+
+
+def test_fixtures() -> None:
+    assert "json.org.example1" in fixtures()
+
+
+def test_run_benchmarks() -> None:
+    results = list(run_benchmarks(scale=0.001, repeat=1, only="wide_dict"))
+
+    assert [(r.case, r.target, r.size) for r in results] == [
+        ("wide_dict", "get_type_definitions", 5),
+        ("wide_dict", "build_output", 5),
+        ("wide_dict", "cli", 5),
+    ]
+    assert all(r.seconds > 0 and r.peak_bytes > 0 for r in results)
+
+
+def test_cli_target_is_not_cached(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("DICT_TYPER_CACHE_DIR", str(tmp_path))
+
+    list(run_benchmarks(scale=0.001, repeat=2, only="wide_dict"))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_main_json_output() -> None:
+    result = CliRunner().invoke(
+        main, ["--scale", "0.001", "--repeat", "1", "--only", "wide", "--json"]
+    )
+
+    assert result.exit_code == 0
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    assert {row["target"] for row in rows} == {
+        "get_type_definitions",
+        "build_output",
+        "cli",
+    }
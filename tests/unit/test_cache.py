@@ -0,0 +1,144 @@
+import json
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+from click.testing import CliRunner
+
+import dict_typer
+from dict_typer import cli, get_type_definitions
+from dict_typer.batch import type_path
+from dict_typer.cache import OutputCache, cache_key, output_options
+
+SOURCE = {"id": 1, "name": "John", "tags": ["a"]}
+
+
+def test_cache_key_covers_options_and_version(monkeypatch: pytest.MonkeyPatch) -> None:
+    digests = [b"digest"]
+    key = cache_key(digests, output_options({}))
+
+    assert cache_key(digests, output_options({"workers": 4})) == key
+    assert cache_key(digests, output_options({"root_type_name": "Root"})) == key
+    assert cache_key([b"other"], output_options({})) != key
+    for option, value in [
+        ("root_type_name", "Base"),
+        ("type_postfix", "Type"),
+        ("show_imports", False),
+        ("force_alternative", True),
+        ("name_map", {"id": "ID"}),
+    ]:
+        assert cache_key(digests, output_options({option: value})) != key
+
+    monkeypatch.setattr(dict_typer, "__version__", "0.0.0")
+    assert cache_key(digests, output_options({})) != key
+
+
+def test_cache_get_type_definitions(
+    cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = OutputCache()
+    data = json.dumps(SOURCE)
+
+    assert cache.get_type_definitions(data, show_imports=False) == get_type_definitions(
+        SOURCE, show_imports=False
+    )
+    assert len(os.listdir(cache_dir)) == 1
+    # Served from the cache without typing the document again
+    monkeypatch.setattr(
+        "dict_typer.cache.get_type_definitions",
+        lambda *args, **kwargs: pytest.fail("Typed again"),
+    )
+    assert OutputCache().get_type_definitions(
+        data, show_imports=False
+    ) == get_type_definitions(SOURCE, show_imports=False)
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_cache_only_generates_missing_entries(tmp_path: Path) -> None:
+    cache = OutputCache(str(tmp_path))
+    calls: List[str] = []
+
+    def generate() -> str:
+        calls.append("called")
+        return "output"
+
+    assert cache.cached([b"a"], {}, generate) == "output"
+    assert cache.cached([b"a"], {}, generate) == "output"
+    assert cache.cached([b"a"], {"show_imports": False}, generate) == "output"
+    assert len(calls) == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = OutputCache(str(tmp_path), max_size=25)
+    cache.store("a", "x" * 10)
+    cache.store("b", "x" * 10)
+    os.utime(tmp_path / "a.py", (0, 0))
+    os.utime(tmp_path / "b.py", (1, 1))
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") == "x" * 10
+
+    cache.store("c", "x" * 10)
+
+    assert sorted(os.listdir(tmp_path)) == ["a.py", "c.py"]
+    assert cache.get("b") is None
+
+
+def test_type_path_cache(tmp_path: Path) -> None:
+    path = tmp_path / "source.json"
+    path.write_text(json.dumps(SOURCE))
+    cache = OutputCache(str(tmp_path / "cache"))
+
+    assert type_path(str(path), cache) == get_type_definitions(SOURCE)
+    # Changing the file changes the key
+    path.write_text(json.dumps({"id": 1}))
+    assert type_path(str(path), cache) == get_type_definitions({"id": 1})
+    assert len(os.listdir(tmp_path / "cache")) == 2
+
+
+@pytest.mark.parametrize("args", [[], ["--no-cache"], ["--stats"]])
+def test_cli_cache(cache_dir: Path, tmp_path: Path, args: List[str]) -> None:
+    path = tmp_path / "source.json"
+    path.write_text(json.dumps(SOURCE))
+
+    for _ in range(2):
+        result = CliRunner().invoke(cli, [*args, str(path)])
+        assert result.exit_code == 0
+        assert result.stdout == get_type_definitions(SOURCE) + "\n"
+        result = CliRunner().invoke(cli, args, input=json.dumps(SOURCE))
+        assert result.exit_code == 0
+        assert result.stdout == get_type_definitions(SOURCE) + "\n"
+
+    # The file and stdin have the same content
+    assert len(os.listdir(cache_dir)) == (0 if args else 1)
+
+
+def test_cli_cache_merged_files(cache_dir: Path, tmp_path: Path) -> None:
+    paths = []
+    for idx, document in enumerate([{"id": 1}, {"id": 2, "name": "Jane"}]):
+        (tmp_path / f"doc{idx}.json").write_text(json.dumps(document))
+        paths.append(str(tmp_path / f"doc{idx}.json"))
+    expected = get_type_definitions([{"id": 1}, {"id": 2, "name": "Jane"}]) + "\n"
+
+    assert CliRunner().invoke(cli, paths).output == expected
+    assert CliRunner().invoke(cli, paths).output == expected
+    assert CliRunner().invoke(cli, ["--ndjson", *paths]).output == expected
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_cli_unwritable_cache(
+    cache_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # A file in place of a parent directory can't be written to, even as root
+    (tmp_path / "file").write_text("")
+    monkeypatch.setenv("DICT_TYPER_CACHE_DIR", str(tmp_path / "file" / "cache"))
+    path = tmp_path / "source.json"
+    path.write_text(json.dumps(SOURCE))
+
+    result = CliRunner().invoke(cli, [str(path)])
+
+    assert result.exit_code == 0
+    assert result.stdout == get_type_definitions(SOURCE) + "\n"
+    cache = OutputCache(str(tmp_path / "file"))
+    cache.store("key", "output")
+    assert cache.get("key") is None
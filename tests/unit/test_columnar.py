@@ -0,0 +1,158 @@
+from typing import Any, Dict, List
+
+import pytest
+
+from dict_typer import get_type_definitions, get_type_definitions_from_table
+
+pa = pytest.importorskip("pyarrow")
+pd = pytest.importorskip("pandas")
+
+ROWS: List[Dict[str, Any]] = [
+    {
+        "id": 1,
+        "name": "a",
+        "score": 1.5,
+        "tags": ["x"],
+        "meta": {"a": 1},
+        "items": [{"k": 1}],
+    },
+    {
+        "id": 2,
+        "name": None,
+        "score": None,
+        "tags": [None],
+        "meta": None,
+        "items": [{"k": None}],
+    },
+]
+SCHEMA = [
+    ("id", pa.int64()),
+    ("name", pa.string()),
+    ("score", pa.float64()),
+    ("tags", pa.list_(pa.string())),
+    ("meta", pa.struct([("a", pa.int64())])),
+    ("items", pa.list_(pa.struct([("k", pa.int64())]))),
+]
+
+# fmt: off
+EXPECTED = "\n".join([
+    "from typing import List, Optional",
+    "",
+    "from typing_extensions import TypedDict",
+    "",
+    "",
+    "class Meta(TypedDict):",
+    "    a: int",
+    "",
+    "",
+    "class ItemsItem0(TypedDict):",
+    "    k: Optional[int]",
+    "",
+    "",
+    "class Root(TypedDict):",
+    "    id: int",
+    "    name: Optional[str]",
+    "    score: Optional[float]",
+    "    tags: List[Optional[str]]",
+    "    meta: Optional[Meta]",
+    "    items: List[ItemsItem0]",
+])
+# fmt: on
+
+
+def _table() -> Any:
+    return pa.Table.from_pylist(ROWS, schema=pa.schema(SCHEMA))
+
+
+def test_arrow_table() -> None:
+    table = _table()
+
+    assert get_type_definitions_from_table(table) == EXPECTED
+    assert get_type_definitions_from_table(table.to_batches()[0]) == EXPECTED
+    # Chunked columns
+    chunked = pa.concat_tables([table.slice(0, 1), table.slice(1)])
+    assert get_type_definitions_from_table(chunked) == EXPECTED
+
+
+def test_arrow_table_matches_records_without_nulls() -> None:
+    table = _table().slice(0, 1)
+
+    assert get_type_definitions_from_table(
+        table, type_postfix="Type"
+    ) == get_type_definitions(table.to_pylist()[0], type_postfix="Type")
+
+
+def test_arrow_nested_types() -> None:
+    table = pa.table(
+        {
+            "null": pa.array([None, None]),
+            "labels": pa.array(["a", None]).dictionary_encode(),
+            "data": pa.array([b"1", b"2"], type=pa.large_binary()),
+            "counts": pa.array([[(1, "a")], []], type=pa.map_(pa.int64(), pa.string())),
+            "grid": pa.array([[[1.5]], [[]]], type=pa.list_(pa.list_(pa.float32()))),
+        }
+    )
+
+    # fmt: off
+    assert get_type_definitions_from_table(table, show_imports=False) == "\n".join([
+        "class Root(TypedDict):",
+        "    null: None",
+        "    labels: Optional[str]",
+        "    data: bytes",
+        "    counts: List[Tuple[Union[int, str]]]",
+        "    grid: List[List[float]]",
+    ])
+    # fmt: on
+
+
+def test_arrow_unsupported_type() -> None:
+    table = pa.table({"at": pa.array([0], type=pa.timestamp("s"))})
+
+    with pytest.raises(NotImplementedError):
+        get_type_definitions_from_table(table)
+
+
+def test_pandas_dataframe() -> None:
+    df = pd.DataFrame(ROWS)
+
+    # Lists of Python objects are typed like lists of records
+    assert get_type_definitions_from_table(df) == EXPECTED.replace(
+        "tags: List[Optional[str]]", "tags: Union[List[None], List[str]]"
+    ).replace("import List, Optional", "import List, Optional, Union")
+
+
+def test_pandas_dtypes() -> None:
+    df = pd.DataFrame(
+        {
+            "count": pd.array([1, None], dtype="Int64"),
+            "flag": [True, False],
+            "ratio": [float("nan"), 0.5],
+            "kind": pd.Categorical(["a", "b"]),
+            "mixed": [1, "a"],
+            7: ["a", "b"],
+        }
+    )
+
+    # fmt: off
+    assert get_type_definitions_from_table(df, show_imports=False) == "\n".join([
+        'Root = TypedDict("Root", {',
+        '    "count": Optional[int],',
+        '    "flag": bool,',
+        '    "ratio": Optional[float],',
+        '    "kind": str,',
+        '    "mixed": Union[int, str],',
+        '    "7": str,',
+        "})",
+    ])
+    # fmt: on
+
+
+def test_pandas_arrow_dtypes() -> None:
+    df = _table().to_pandas(types_mapper=pd.ArrowDtype)
+
+    assert get_type_definitions_from_table(df) == EXPECTED
+
+
+def test_not_a_table() -> None:
+    with pytest.raises(TypeError):
+        get_type_definitions_from_table(ROWS)
@@ -172,3 +172,20 @@ def test_convert_nested_overlapping_dict() -> None:
     # fmt: on
 
     assert expected == get_type_definitions(source)
+
+
+def test_convert_dicts_nested_deeper_than_the_recursion_limit() -> None:
+    depth = 5000
+    source: Dict = {"value": 1}
+    for level in range(depth):
+        source = {f"level{level}": source}
+
+    output = get_type_definitions(source)
+
+    assert output.count("(TypedDict):") == depth + 1
+    assert output.startswith(
+        "from typing_extensions import TypedDict\n\n\nclass Level0(TypedDict):"
+    )
+    assert output.endswith(
+        f"class Root(TypedDict):\n    level{depth - 1}: Level{depth - 1}"
+    )
@@ -70,3 +70,17 @@ def test_convert_with_mixed_list() -> None:
     # fmt: on
 
     assert expected == get_type_definitions(source)
+
+
+def test_convert_lists_nested_deeper_than_the_recursion_limit() -> None:
+    depth = 5000
+    source: List = [1]
+    for _ in range(depth):
+        source = [source]
+
+    output = get_type_definitions(source)
+
+    assert (
+        output
+        == f"from typing import List\n\n\nRoot = {'List[' * (depth + 1)}int{']' * (depth + 1)}"
+    )
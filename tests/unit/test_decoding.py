@@ -0,0 +1,121 @@
+import gc
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from click.testing import CliRunner
+
+from dict_typer import cli, get_type_definitions
+from dict_typer.decoding import (
+    _SCAN_CHUNK_SIZE,
+    JSON_BACKENDS,
+    get_loads,
+    paused_gc,
+    strip_whitespace,
+)
+
+orjson = pytest.importorskip("orjson")
+
+# fmt: off
+DOCUMENTS = [
+    '{"id": 1, "name": "John", "tags": ["a"], "score": 1.5, "sub": {"a": null}}',
+    '[{"id": 1}, {"id": 2, "email": "bob@example.com"}]',
+    # Out of the 64 bit range, decoded as floats by orjson
+    '{"id": 12345678901234567890123, "negative": -9223372036854775809}',
+    '{"float": 1.12345678901234567890, "exponent": 1e-12345678901234567890}',
+    '{"id": "12345678901234567890123"}',
+    # Rejected by orjson
+    '{"nan": NaN, "infinity": Infinity, "large": 1e400}',
+    '{"surrogate": "\\ud800"}',
+    '{"a": 1, "a": "duplicate"}',
+]
+# fmt: on
+
+
+@pytest.mark.parametrize("backend", ["auto", "orjson"])
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_fast_backend_matches_json(backend: str, document: str) -> None:
+    loads = get_loads(backend)
+    expected = json.loads(document)
+
+    for data in (document, document.encode()):
+        assert get_type_definitions(loads(data)) == get_type_definitions(expected)
+
+
+@pytest.mark.parametrize("document", ["{", "[1,]", "", '{"a": 1} x'])
+def test_fast_backend_raises_json_errors(document: str) -> None:
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(document)
+    with pytest.raises(json.JSONDecodeError) as error:
+        get_loads("orjson")(document.encode())
+
+    assert str(error.value) == str(expected.value)
+
+
+def test_loads_leaves_gc_alone(monkeypatch: pytest.MonkeyPatch) -> None:
+    # The collector is process wide, other threads may be allocating
+    enabled = []
+    json_loads = json.loads
+
+    def loads(data: Any) -> Any:
+        enabled.append(gc.isenabled())
+        return json_loads(data)
+
+    monkeypatch.setattr(json, "loads", loads)
+
+    assert get_loads("json")(b"[1]") == [1]
+    assert enabled == [True]
+
+
+def test_paused_gc_restores_gc() -> None:
+    with paused_gc():
+        assert not gc.isenabled()
+    assert gc.isenabled()
+
+    with pytest.raises(ValueError):
+        with paused_gc():
+            raise ValueError
+    assert gc.isenabled()
+
+
+def test_get_loads_invalid_backend() -> None:
+    with pytest.raises(ValueError):
+        get_loads("simdjson")
+
+
+@pytest.mark.parametrize("backend", [b for b in JSON_BACKENDS if b != "msgspec"])
+def test_cli_json_backend(tmp_path: Path, backend: str) -> None:
+    source: Any = {"id": 12345678901234567890123, "name": "John", "tags": ["a"]}
+    path = tmp_path / "source.json"
+    path.write_text(json.dumps(source))
+
+    result = CliRunner().invoke(cli, ["--json-backend", backend, str(path)])
+    assert result.exit_code == 0
+    assert result.output == get_type_definitions(source) + "\n"
+
+    result = CliRunner().invoke(
+        cli, ["--json-backend", backend], input=json.dumps(source)
+    )
+    assert result.exit_code == 0
+    assert result.output == get_type_definitions(source) + "\n"
+
+
+def test_strip_whitespace() -> None:
+    for data in [b"", b" \n", b'\t {"a": 1} \r\n', b"[1]", b" [ 1 ] "]:
+        assert strip_whitespace(memoryview(data)).tobytes() == data.strip()
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_loads_memoryview(backend: str) -> None:
+    for document in DOCUMENTS:
+        assert get_type_definitions(
+            get_loads(backend)(memoryview(document.encode()))
+        ) == get_type_definitions(json.loads(document))
+
+
+def test_long_integer_across_scan_chunks() -> None:
+    padding = "x" * (_SCAN_CHUNK_SIZE - 15)
+    document = f'["{padding}", 12345678901234567890123]'.encode()
+
+    assert get_loads("orjson")(document)[1] == 12345678901234567890123
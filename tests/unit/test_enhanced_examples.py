@@ -1,3 +1,7 @@
+from typing import Any, Dict, List, Union
+
+import pytest
+
 from dict_typer import get_type_definitions
 
 
@@ -203,3 +207,52 @@ def test_examples_with_completely_different_structure():
     assert "RootItem1" in result
     assert "RootItem2" in result
 
+
+def test_example_merger_counts_field_presence_per_type() -> None:
+    """Test that merging builders counts fields per normalized type name."""
+    from dict_typer.type_definitions import DefinitionBuilder, _ExampleMerger
+
+    examples: List[Dict[str, Any]] = [
+        {"id": 1, "sub": {"a": 1, "b": "x"}},
+        {"id": 2, "sub": {"a": 2}},
+        {"id": 3},
+    ]
+    merger = _ExampleMerger("Root", force_alternative=False)
+    for example in examples:
+        builder = DefinitionBuilder(example, show_imports=False)
+        builder.build_output()
+        merger.add(builder)
+
+    assert merger._normalize_type_name("Sub_temp_12") == "Sub"
+    assert merger._normalize_type_name("_temp_3") == "Root"
+    assert merger.total_examples == 3
+    assert merger.type_counts == {"Root": 3, "Sub": 2}
+    assert merger.field_stats["Sub"]["a"].presence == 2
+    assert merger.field_stats["Sub"]["b"].presence == 1
+    assert merger.field_stats["Sub"]["b"].types == {"str": 1}
+    assert set(merger.members["Sub"]) == {"a", "b"}
+
+
+def test_examples_are_rendered_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that examples are folded into the merged types and rendered once."""
+    from dict_typer.models import DictEntry, MemberEntry
+    from dict_typer.type_definitions import DefinitionBuilder
+
+    renders: List[DefinitionBuilder] = []
+    render = DefinitionBuilder._render
+
+    def counting_render(
+        self: DefinitionBuilder, source_type: Union[MemberEntry, DictEntry]
+    ) -> str:
+        renders.append(self)
+        return render(self, source_type)
+
+    monkeypatch.setattr(DefinitionBuilder, "_render", counting_render)
+
+    examples: List[Dict[str, Any]] = [{"id": 1, "a": 1}, {"id": 2, "b": "x"}, {"id": 3, "a": 2}]
+    for source in (examples, examples + [{}], [examples[0], {}]):
+        renders.clear()
+        result = get_type_definitions(source)
+
+        assert len(renders) == 1
+        assert "id: int" in result
@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+import dict_typer
+
+# Only needed by the command line, the async API, the server or tables
+DEFERRED_MODULES = [
+    "asyncio",
+    "click",
+    "concurrent",
+    "http",
+    "pandas",
+    "pyarrow",
+    "pygments",
+    "rich",
+    "tempfile",
+]
+
+# Only needed to serve, the command line imports them for `dict-typer serve`
+SERVER_MODULES = ["dict_typer.server", "http.server", "socketserver"]
+
+
+def _imported_modules(code: str, env: Dict[str, str]) -> List[str]:
+    """The modules imported by running the code in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-c", f"{code}; import sys; print(*sys.modules)"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return result.stdout.split()
+
+
+@pytest.fixture
+def env(tmp_path: Path) -> Dict[str, str]:
+    env = dict(os.environ)
+    # Compiled out of the source tree
+    env["PYTHONPYCACHEPREFIX"] = str(tmp_path)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(Path(dict_typer.__file__).parent.parent), env.get("PYTHONPATH", "")]
+    )
+    return env
+
+
+def test_import_defers_cli_dependencies(env: Dict[str, str]) -> None:
+    modules = _imported_modules("import dict_typer", env)
+
+    assert "dict_typer.type_definitions" in modules
+    assert sorted({m.split(".")[0] for m in modules} & set(DEFERRED_MODULES)) == []
+
+
+def test_command_line_defers_the_server(env: Dict[str, str]) -> None:
+    modules = _imported_modules("import dict_typer.command_line", env)
+
+    assert "dict_typer.command_line" in modules
+    assert sorted(set(modules) & set(SERVER_MODULES)) == []
+
+
+def test_lazy_attributes() -> None:
+    from dict_typer import (
+        AsyncSchemaAccumulator,
+        aget_type_definitions,
+        cli,
+        get_type_definitions_from_table,
+    )
+    from dict_typer.asynchronous import AsyncSchemaAccumulator as accumulator_class
+    from dict_typer.columnar import get_type_definitions_from_table as from_table
+    from dict_typer.command_line import cli as command
+
+    assert (AsyncSchemaAccumulator, cli) == (accumulator_class, command)
+    assert get_type_definitions_from_table is from_table
+    assert callable(aget_type_definitions)
+    with pytest.raises(AttributeError):
+        dict_typer.missing  # noqa: B018
@@ -0,0 +1,136 @@
+import io
+import json
+from typing import Any
+
+import pytest
+from click.testing import CliRunner
+
+from dict_typer import cli, get_type_definitions
+from dict_typer.events import build_value, iter_json_events
+from dict_typer.streaming import get_type_definitions_from_json_stream
+
+FIXTURES = [
+    "json.org.example1",
+    "json.org.example2",
+    "json.org.example3",
+    "json.org.example4",
+    "json.org.example5",
+    "sitepoint.com.example1",
+    "sitepoint.com.example2",
+    "sitepoint.com.example3",
+    "sitepoint.com.example4",
+    "custom.example1",
+]
+
+
+class UnseekableStream(io.StringIO):
+    def seekable(self) -> bool:
+        return False
+
+    def seek(self, *args: Any) -> int:
+        raise io.UnsupportedOperation("seek")
+
+
+def _parse(text: str, chunk_size: int) -> Any:
+    events = iter_json_events(io.StringIO(text), chunk_size)
+    value = build_value(next(events), events)
+    for _ in events:
+        pass
+    return value
+
+
+def test_events() -> None:
+    events = iter_json_events(io.StringIO('{"a": [1, 2.5, "x"], "b": {"c": null}}'))
+
+    assert list(events) == [
+        ("start_map", None),
+        ("map_key", "a"),
+        ("start_array", None),
+        ("value", 1),
+        ("value", 2.5),
+        ("value", "x"),
+        ("end_array", None),
+        ("map_key", "b"),
+        ("start_map", None),
+        ("map_key", "c"),
+        ("value", None),
+        ("end_map", None),
+        ("end_map", None),
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1024])
+@pytest.mark.parametrize("fixture", FIXTURES)
+def test_events_parse_fixtures_across_chunk_boundaries(
+    fixture: str, chunk_size: int
+) -> None:
+    with open(f"tests/snapshot/fixtures/{fixture}.json", "r") as f:
+        text = f.read()
+
+    assert _parse(text, chunk_size) == json.loads(text)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5])
+def test_events_parse_escapes_and_literals(chunk_size: int) -> None:
+    text = '["a\\"b\\\\", "\\ud83d\\ude00", -1.5e+3, 0, true, false, null, {}, []]'
+
+    assert _parse(text, chunk_size) == json.loads(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "{", "[1,]", '{"a" 1}', '{"a": 1,}', "[1 2]", "1 2", '"abc', "tru", "[01]"],
+)
+def test_events_reject_invalid_json(text: str) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        _parse(text, 2)
+
+
+@pytest.mark.parametrize("fixture", FIXTURES)
+def test_json_stream_matches_get_type_definitions(fixture: str) -> None:
+    with open(f"tests/snapshot/fixtures/{fixture}.json", "r") as f:
+        text = f.read()
+    expected = get_type_definitions(json.loads(text), type_postfix="Type")
+
+    assert expected == get_type_definitions_from_json_stream(
+        io.StringIO(text), type_postfix="Type", chunk_size=16
+    )
+    assert expected == get_type_definitions_from_json_stream(
+        UnseekableStream(text), type_postfix="Type", chunk_size=16
+    )
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        [
+            {"id": 1, "name": "John", "email": "j@example.com"},
+            {"id": 2, "name": "Jane"},
+        ],
+        [{"a": 1, "b": [{"x": 1}]}, {}],
+        [1, "2", 3.0, {"id": 123}, {"id": 456}],
+        "just a string",
+        None,
+    ],
+)
+def test_json_stream_root_types(source: Any) -> None:
+    text = json.dumps(source)
+    expected = get_type_definitions(source)
+
+    assert expected == get_type_definitions_from_json_stream(io.StringIO(text))
+    assert expected == get_type_definitions_from_json_stream(UnseekableStream(text))
+
+
+def test_cli_stream() -> None:
+    source = {"id": 1, "items": [{"a": 1}, {"a": None}]}
+
+    result = CliRunner().invoke(cli, ["--stream"], input=json.dumps(source))
+
+    assert result.exit_code == 0
+    assert result.output == get_type_definitions(source) + "\n"
+
+
+def test_cli_stream_and_ndjson_are_exclusive() -> None:
+    result = CliRunner().invoke(cli, ["--stream", "--ndjson"], input="{}")
+
+    assert result.exit_code != 0
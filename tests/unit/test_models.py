@@ -1,4 +1,9 @@
-from dict_typer.models import DictEntry, MemberEntry, key_to_dependency_cmp
+import copy
+import pickle
+
+import pytest
+
+from dict_typer.models import DictEntry, MemberEntry
 
 
 def test_member_entry_base_output() -> None:
@@ -49,6 +54,61 @@ def test_member_entry_is_hashable_based_on_str_out() -> None:
     }
 
 
+def test_member_entry_leaves_are_singletons() -> None:
+    assert MemberEntry("int") is MemberEntry("int")
+    assert MemberEntry("List") is MemberEntry("List", sub_members=set())
+
+
+def test_member_entry_is_interned_without_dict_entries() -> None:
+    list_int_1 = MemberEntry("List", sub_members={MemberEntry("int")})
+    list_int_2 = MemberEntry("List", sub_members=[MemberEntry("int")])
+
+    assert list_int_1 is list_int_2
+    assert copy.copy(list_int_1) is list_int_1
+    assert pickle.loads(pickle.dumps(list_int_1)) is list_int_1
+
+
+def test_member_entry_with_dict_entry_is_not_interned() -> None:
+    sub_entry_1 = DictEntry("SubType", members={"foo": {MemberEntry("str")}})
+    sub_entry_2 = DictEntry("SubType", members={"foo": {MemberEntry("int")}})
+    list_1 = MemberEntry(
+        "List", sub_members={MemberEntry("Set", sub_members={sub_entry_1})}
+    )
+    list_2 = MemberEntry(
+        "List", sub_members={MemberEntry("Set", sub_members={sub_entry_2})}
+    )
+
+    assert list_1 == list_2
+    assert list_1 is not list_2
+    set_2 = next(iter(list_2.sub_members))
+    assert isinstance(set_2, MemberEntry)
+    assert next(iter(set_2.sub_members)) is sub_entry_2
+
+
+def test_member_entry_is_immutable() -> None:
+    entry = MemberEntry("List", sub_members={MemberEntry("int")})
+
+    with pytest.raises(AttributeError):
+        entry.name = "Set"  # type: ignore
+    with pytest.raises(AttributeError):
+        entry.sub_members.add(MemberEntry("str"))  # type: ignore
+
+
+def test_entries_are_slotted() -> None:
+    member = MemberEntry("List", sub_members={MemberEntry("int")})
+    entry = DictEntry("Root", members={"ids": {member}}, total=False)
+
+    assert not hasattr(member, "__dict__")
+    assert not hasattr(entry, "__dict__")
+    with pytest.raises(AttributeError):
+        entry.other = 1  # type: ignore
+
+    for copied in (copy.deepcopy(entry), pickle.loads(pickle.dumps(entry))):
+        assert str(copied) == str(entry)
+        assert copied.total is False
+        assert next(iter(copied.members["ids"])) is member
+
+
 def test_member_entry_get_imports() -> None:
     just_list = MemberEntry("List")
     just_list_one_item = MemberEntry("List", sub_members={MemberEntry("str")})
@@ -184,51 +244,31 @@ def test_dict_entry_get_imports_from_sub_members() -> None:
     assert entry.get_imports() == {"List", "Union"}
 
 
-def test_sorting_member_entries_based_on_dependency() -> None:
-    foo = MemberEntry(name="Foo")
-    bar = MemberEntry(name="Bar", sub_members={foo})
-    baz = MemberEntry(name="Baz", sub_members={bar})
+def test_dict_entry_invalid_name_adds_underscore() -> None:
+    assert DictEntry("List").name == "List_"
+    assert DictEntry("None").name == "None_"
 
-    assert sorted([foo, bar, baz], key=key_to_dependency_cmp) == [foo, bar, baz]
-    assert sorted([bar, foo, baz], key=key_to_dependency_cmp) == [foo, bar, baz]
-    assert sorted([baz, bar, foo], key=key_to_dependency_cmp) == [foo, bar, baz]
 
+def test_dict_entry_get_imports_of_self_referencing_entry() -> None:
+    entry = DictEntry("Node", members={"value": {MemberEntry("int")}})
+    entry.members["children"] = {MemberEntry("List", sub_members={entry})}
+    entry.members["parent"] = {entry, MemberEntry("None")}
 
-def test_sorting_dict_entry_based_on_dependency() -> None:
-    foo = MemberEntry(name="Foo")
-    bar = MemberEntry(name="Bar", sub_members={foo})
-    baz = MemberEntry(name="int")
+    assert entry.get_imports() == {"List", "Optional"}
 
-    entry = DictEntry("RootType", members={"foo": {foo}, "bar": {bar}, "baz": {baz}})
 
-    assert sorted([foo, baz, entry, bar], key=key_to_dependency_cmp) == [
-        foo,
-        baz,
-        bar,
-        entry,
-    ]
+def test_dict_entry_hash_does_not_look_up_stats(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Hashing is on the hot path of the inference, stats are counted by callers
+    import dict_typer.models
 
+    first = DictEntry("A", members={"a": {MemberEntry("int")}})
+    second = DictEntry("B", members={"a": set()})
 
-def test_sorting_dict_entry_with_sub_entry() -> None:
-    sub_entry = DictEntry(
-        "NestedType",
-        members={
-            "foo": {
-                MemberEntry(
-                    "List", sub_members={MemberEntry("int"), MemberEntry("str")}
-                )
-            }
-        },
-    )
-    entry = DictEntry("RootType", members={"sub": {sub_entry}})
-
-    assert sub_entry.name in entry.depends_on
-    assert entry.name not in sub_entry.depends_on
+    def current_stats() -> None:
+        raise AssertionError("Looked up the stats")
 
-    assert sorted([entry, sub_entry], key=key_to_dependency_cmp) == [sub_entry, entry]
-    assert sorted([sub_entry, entry], key=key_to_dependency_cmp) == [sub_entry, entry]
+    monkeypatch.setattr(dict_typer.models, "current_stats", current_stats)
 
-
-def test_dict_entry_invalid_name_adds_underscore() -> None:
-    assert DictEntry("List").name == "List_"
-    assert DictEntry("None").name == "None_"
+    assert hash(first) == hash(second)
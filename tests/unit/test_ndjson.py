@@ -0,0 +1,76 @@
+import io
+import json
+from typing import Any, List
+
+import pytest
+from click.testing import CliRunner
+
+from dict_typer import cli, get_type_definitions
+from dict_typer.streaming import get_type_definitions_from_ndjson
+
+
+class UnseekableStream(io.StringIO):
+    def seekable(self) -> bool:
+        return False
+
+    def seek(self, *args: Any) -> int:
+        raise io.UnsupportedOperation("seek")
+
+
+def _to_ndjson(records: List[Any]) -> str:
+    return "\n".join(json.dumps(record) for record in records) + "\n"
+
+
+@pytest.mark.parametrize(
+    "records",
+    [
+        # A regular list
+        [{"id": 1, "name": "foo"}, {"id": 2, "name": "bar"}],
+        # Completely different items
+        [{"a": 1}, {"b": "2"}, 3, None],
+        # Examples of the same schema
+        [
+            {"id": 1, "name": "John", "sub": {"a": 1}},
+            {"id": 2, "name": "Jane"},
+            {"id": 3, "email": "bob@example.com", "sub": {"a": 2, "b": 3}},
+        ],
+        # A single example and an empty dict
+        [{"a": 1, "b": [{"x": 1}]}, {}],
+        # Multiple examples and an empty dict
+        [{"a": 1, "b": "hello"}, {"a": 2, "c": "world"}, {}],
+        [],
+    ],
+)
+def test_ndjson_matches_list_of_records(records: List[Any]) -> None:
+    expected = get_type_definitions(records, type_postfix="Type")
+
+    assert expected == get_type_definitions_from_ndjson(
+        io.StringIO(_to_ndjson(records)), type_postfix="Type"
+    )
+    assert expected == get_type_definitions_from_ndjson(
+        UnseekableStream(_to_ndjson(records)), type_postfix="Type"
+    )
+
+
+def test_ndjson_skips_blank_lines() -> None:
+    stream = io.StringIO('\n{"id": 1}\n\n   \n{"id": 2}\n')
+
+    assert get_type_definitions([{"id": 1}, {"id": 2}]) == (
+        get_type_definitions_from_ndjson(stream)
+    )
+
+
+def test_ndjson_decode_error_includes_line_number() -> None:
+    stream = io.StringIO('{"id": 1}\n{"id": \n')
+
+    with pytest.raises(json.JSONDecodeError, match="line 2"):
+        get_type_definitions_from_ndjson(stream)
+
+
+def test_cli_ndjson() -> None:
+    records = [{"id": 1, "tags": ["a"]}, {"id": 2}, {"id": 3, "tags": []}]
+
+    result = CliRunner().invoke(cli, ["--ndjson"], input=_to_ndjson(records))
+
+    assert result.exit_code == 0
+    assert result.output == get_type_definitions(records) + "\n"
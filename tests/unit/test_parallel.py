@@ -0,0 +1,80 @@
+import json
+import pickle
+from typing import Any, List
+
+import pytest
+from click.testing import CliRunner
+
+from dict_typer import cli, get_type_definitions, parallel
+from dict_typer.parallel import get_type_definitions_parallel
+
+
+@pytest.mark.parametrize(
+    "records",
+    [
+        # A regular list
+        [{"id": 1, "name": "foo"}, {"id": 2, "name": "bar"}] * 5,
+        # Completely different items
+        [{"a": 1}, {"b": "2"}, 3, None, [{"a": 1}]] * 3,
+        # Examples of the same schema
+        [
+            {"id": 1, "name": "John", "sub": {"a": 1}},
+            {"id": 2, "name": "Jane"},
+            {"id": 3, "email": "bob@example.com", "sub": {"a": 2, "b": 3}},
+        ]
+        * 4,
+        # Examples with lists of items in different orders
+        [
+            {"id": 1, "l": [{"a": 1}, {"b": 1}]},
+            {"id": 2, "l": [{"b": 1}, {"a": 1}], "c": 1},
+        ]
+        * 3,
+        # A single example and an empty dict
+        [{"a": 1, "b": [{"x": 1}]}, {}],
+        # Multiple examples and an empty dict
+        [{"a": 1, "b": "hello"}, {"a": 2, "c": "world"}, {"a": 3, "b": "again"}, {}],
+        [],
+    ],
+)
+def test_parallel_matches_serial(records: List[Any]) -> None:
+    expected = get_type_definitions(records, type_postfix="Type")
+
+    assert expected == get_type_definitions_parallel(records, 2, type_postfix="Type")
+
+
+def test_workers_return_partial_schemas() -> None:
+    records = [{"id": 1, "secret": "hunter2", "sub": [{"a": "hunter2"}]}, {"id": 2}]
+    options = {"root_type_name": "Root", "type_postfix": "", "show_imports": True}
+
+    accumulator = pickle.loads(
+        pickle.dumps(parallel._accumulate_shard(records * 100, options))
+    )
+
+    assert b"hunter2" not in pickle.dumps(accumulator)
+    assert accumulator.render() == get_type_definitions(records * 100)
+
+
+def test_parallel_is_used_for_large_lists(monkeypatch: pytest.MonkeyPatch) -> None:
+    records = [{"id": idx, "tags": ["a"] * (idx % 3)} for idx in range(20)]
+    calls = []
+
+    def spy(*args: Any, **kwargs: Any) -> str:
+        calls.append(args)
+        return get_type_definitions_parallel(*args, **kwargs)
+
+    monkeypatch.setattr(parallel, "MIN_RECORDS_PER_WORKER", 10)
+    monkeypatch.setattr(parallel, "get_type_definitions_parallel", spy)
+
+    assert get_type_definitions(records, workers=3) == get_type_definitions(records)
+    assert calls == []
+    assert get_type_definitions(records, workers=2) == get_type_definitions(records)
+    assert len(calls) == 1
+
+
+def test_cli_jobs() -> None:
+    records = [{"id": 1, "tags": ["a"]}, {"id": 2}, {"id": 3, "tags": []}]
+
+    result = CliRunner().invoke(cli, ["--jobs", "2"], input=json.dumps(records))
+
+    assert result.exit_code == 0
+    assert result.output == get_type_definitions(records) + "\n"
@@ -0,0 +1,112 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from dict_typer import cli, get_type_definitions
+from dict_typer.sampling import Sampling
+
+
+def test_sampling_head() -> None:
+    assert list(Sampling(3).indexes(10)) == [0, 1, 2]
+    assert list(Sampling(3).indexes(2)) == [0, 1]
+
+
+def test_sampling_reservoir_is_seeded() -> None:
+    indexes = list(Sampling(5, "reservoir", seed=1).indexes(1000))
+
+    assert len(set(indexes)) == 5
+    assert indexes == sorted(indexes)
+    assert indexes == list(Sampling(5, "reservoir", seed=1).indexes(1000))
+    assert indexes != list(Sampling(5, "reservoir", seed=2).indexes(1000))
+
+
+def test_sampling_stratified_includes_first_and_last() -> None:
+    indexes = list(Sampling(6, "stratified").indexes(1000))
+
+    assert len(indexes) == 6
+    assert indexes[0] == 0
+    assert indexes[-1] == 999
+    # One item from each quarter in between
+    assert [(idx - 1) * 4 // 998 for idx in indexes[1:-1]] == [0, 1, 2, 3]
+
+
+def test_sampling_sets() -> None:
+    items = frozenset(range(100))
+
+    sample = Sampling(4, "stratified").sample(items)
+
+    assert [idx for idx, _ in sample] == list(Sampling(4, "stratified").indexes(100))
+    assert all(value in items for _, value in sample)
+
+
+@pytest.mark.parametrize("size, strategy", [(0, "head"), (3, "random")])
+def test_sampling_rejects_invalid_options(size: int, strategy: str) -> None:
+    with pytest.raises(ValueError):
+        Sampling(size, strategy)
+
+
+def test_sampling_only_applies_to_long_sequences() -> None:
+    source = {"short": [1, "2"], "nested": [[1.0, None]]}
+
+    assert get_type_definitions(source, sampling=Sampling(2)) == get_type_definitions(
+        source
+    )
+
+
+def test_sampling_types_from_sampled_items() -> None:
+    source = {"values": [1, 2, 3, "4"], "more": [{"id": 1}, {"id": 2}, {"name": "x"}]}
+
+    # fmt: off
+    assert get_type_definitions(source, sampling=Sampling(2)) == "\n".join([
+        "# Types inferred from a sample of at most 2 items per sequence (head)",
+        "",
+        "from typing import List",
+        "",
+        "from typing_extensions import TypedDict",
+        "",
+        "",
+        "class MoreItem0(TypedDict):",
+        "    id: int",
+        "",
+        "",
+        "class Root(TypedDict):",
+        "    values: List[int]",
+        "    more: List[MoreItem0]",
+    ])
+    # fmt: on
+
+
+def test_sampling_root_examples() -> None:
+    source = [{"id": i, "name": "x"} if i % 2 else {"id": i} for i in range(1000)]
+
+    output = get_type_definitions(source, sampling=Sampling(10, "reservoir"))
+
+    assert output.startswith(
+        "# Types inferred from a sample of at most 10 items per sequence (reservoir, seed 0)\n"
+    )
+    # The sampled records are still merged as examples of one schema
+    assert "    name: Optional[str]\n" in output
+
+
+def test_cli_sample() -> None:
+    source = {"values": [1, 2, "3"]}
+
+    result = CliRunner().invoke(
+        cli,
+        ["--sample", "2", "--sample-strategy", "stratified"],
+        input=json.dumps(source),
+    )
+
+    assert result.exit_code == 0
+    assert (
+        result.output
+        == get_type_definitions(source, sampling=Sampling(2, "stratified")) + "\n"
+    )
+    assert "Union[int, str]" in result.output
+
+
+def test_cli_sample_and_ndjson_are_exclusive() -> None:
+    result = CliRunner().invoke(cli, ["--sample", "2", "--ndjson"], input="{}")
+
+    assert result.exit_code != 0
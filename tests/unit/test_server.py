@@ -0,0 +1,167 @@
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+from click.testing import CliRunner
+
+from dict_typer import cli, get_type_definitions
+from dict_typer.server import TypingService, UnixHTTPConnection, make_server
+
+SOURCE = {"id": 1, "name": "John", "tags": ["a"], "sub": {"a": None}}
+
+
+@pytest.fixture
+def service() -> Iterator[TypingService]:
+    service = TypingService()
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def socket_path(tmp_path: Path, service: TypingService) -> Iterator[str]:
+    path = str(tmp_path / "dict-typer.sock")
+    server = make_server(service, socket_path=path)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield path
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def _request(socket_path: str, method: str, path: str, body: Any = None) -> Any:
+    connection = UnixHTTPConnection(socket_path)
+    connection.request(method, path, body=body)
+    response = connection.getresponse()
+    result = (response.status, response.read().decode())
+    connection.close()
+    return result
+
+
+def test_type_payload(service: TypingService) -> None:
+    data = json.dumps(SOURCE).encode()
+
+    assert service.type_payload(data, {}) == (200, get_type_definitions(SOURCE))
+    assert service.type_payload(
+        data, {"type_postfix": "Type", "show_imports": False}
+    ) == (
+        200,
+        get_type_definitions(SOURCE, type_postfix="Type", show_imports=False),
+    )
+    status, error = service.type_payload(b"{", {})
+    assert status == 400
+    assert error.startswith("JSON serialisation error")
+
+
+def test_type_payload_cache() -> None:
+    service = TypingService(cache_size=1)
+    first, second = json.dumps({"a": 1}).encode(), json.dumps({"b": 1}).encode()
+
+    for data in (first, first, second, first):
+        service.type_payload(data, {})
+    service.close()
+
+    # The second payload evicted the first one
+    counters = service.counters.as_dict()
+    assert (counters["cache_hits"], counters["cache_misses"]) == (1, 3)
+    assert counters["requests"] == 4
+
+
+def test_type_payload_batches_concurrent_requests() -> None:
+    service = TypingService(batch_window=0.05)
+    data = json.dumps(SOURCE).encode()
+
+    with ThreadPoolExecutor(8) as executor:
+        responses = list(
+            executor.map(lambda _: service.type_payload(data, {}), range(8))
+        )
+    service.close()
+
+    assert responses == [(200, get_type_definitions(SOURCE))] * 8
+    counters = service.counters.as_dict()
+    assert counters["batches"] < 8
+    # Typed once
+    assert counters["cache_misses"] == 1
+
+
+def test_type_payload_after_close() -> None:
+    service = TypingService()
+    service.close()
+    service.close()
+
+    assert service.type_payload(b"{}", {})[0] == 503
+
+
+def test_server(socket_path: str) -> None:
+    status, output = _request(socket_path, "POST", "/", json.dumps(SOURCE))
+    assert (status, output) == (200, get_type_definitions(SOURCE) + "\n")
+
+    status, output = _request(
+        socket_path,
+        "POST",
+        "/?root_type_name=Base&show_imports=false",
+        json.dumps(SOURCE),
+    )
+    assert (
+        output
+        == get_type_definitions(SOURCE, root_type_name="Base", show_imports=False)
+        + "\n"
+    )
+
+    records = [{"id": 1, "name": "a"}] * 3 + [{"id": 2}]
+    status, output = _request(
+        socket_path, "POST", "/?optional_threshold=0.75", json.dumps(records)
+    )
+    assert output == get_type_definitions(records, optional_threshold=0.75) + "\n"
+
+    assert _request(socket_path, "POST", "/", "{")[0] == 400
+    assert _request(socket_path, "POST", "/?show_imports=maybe", "{}")[0] == 400
+    assert _request(socket_path, "POST", "/?unknown=1", "{}")[0] == 400
+    assert _request(socket_path, "POST", "/?optional_threshold=2", "{}")[0] == 400
+    assert _request(socket_path, "GET", "/")[0] == 404
+
+    status, counters = _request(socket_path, "GET", "/stats")
+    assert status == 200
+    counters = json.loads(counters)
+    assert counters["requests"] == 4
+    assert counters["errors"] == 1
+    assert counters["latency_ms"]["max"] > 0
+
+
+def test_server_replaces_only_stale_sockets(
+    tmp_path: Path, service: TypingService
+) -> None:
+    stale = tmp_path / "stale.sock"
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(stale))
+    sock.close()
+    make_server(service, socket_path=str(stale)).server_close()
+
+    regular = tmp_path / "notes.txt"
+    regular.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        make_server(service, socket_path=str(regular))
+    assert regular.read_text() == "keep me"
+
+
+def test_cli_serve_does_not_replace_files(tmp_path: Path) -> None:
+    regular = tmp_path / "notes.txt"
+    regular.write_text("keep me")
+
+    result = CliRunner().invoke(cli, ["serve", "--socket", str(regular)])
+
+    assert result.exit_code != 0
+    assert "isn't a socket" in result.output
+    assert regular.read_text() == "keep me"
+
+
+def test_cli_serve_help() -> None:
+    result = CliRunner().invoke(cli, ["serve", "--help"])
+
+    assert result.exit_code == 0
+    assert "serve [OPTIONS]" in result.output
+    assert "--socket" in result.output
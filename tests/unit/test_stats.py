@@ -0,0 +1,83 @@
+import json
+
+from click.testing import CliRunner
+
+from dict_typer import cli, get_type_definitions
+from dict_typer.stats import COUNTERS, PHASES, Stats, collect_stats, current_stats
+
+
+def test_stats_are_only_collected_within_the_block() -> None:
+    stats = Stats()
+    source = {"a": {"b": 1}, "c": [{"b": 2}, {"b": 3}]}
+
+    with collect_stats(stats):
+        assert current_stats() is stats
+        output = get_type_definitions(source)
+
+    assert current_stats() is None
+    assert output == get_type_definitions(source)
+    counts = dict(stats.counts)
+    get_type_definitions(source)
+    assert stats.counts == counts
+
+
+def test_stats_counters() -> None:
+    stats = Stats()
+    # The first list item is merged into "A", the second one is typed like
+    # the first, the nested "A" is renamed
+    source = {"a": {"b": 1}, "c": [{"b": 2}, {"b": 3}], "d": {"a": {"x": 1}}}
+
+    with collect_stats(stats):
+        get_type_definitions(source)
+
+    assert stats.counts["get_type_calls"] > 0
+    assert stats.counts["definitions_added"] == 4
+    assert stats.counts["definition_merges"] == 1
+    assert stats.counts["definition_comparisons"] >= stats.counts["definition_merges"]
+    assert stats.counts["fingerprint_hits"] == 1
+    assert stats.counts["member_entry_renders"] > 0
+    # Each dict value and list item added to the types of its parent
+    assert stats.counts["dict_entry_hashes"] == 5
+
+
+def test_stats_name_collision_retries() -> None:
+    stats = Stats()
+    source = {"a": {"x": 1}, "b": {"a": {"y": 1}, "c": {"a": {"z": 1}}}}
+
+    with collect_stats(stats):
+        output = get_type_definitions(source)
+
+    assert "class A2(TypedDict):" in output
+    assert stats.counts["name_collision_retries"] == 1
+
+
+def test_stats_phase_timings() -> None:
+    stats = Stats()
+
+    with collect_stats(stats):
+        get_type_definitions(
+            [{"id": 1, "name": "x"}, {"id": 2}, {"id": 3, "name": "y"}]
+        )
+
+    assert set(stats.timings) == set(PHASES)
+    assert all(stats.timings[name] > 0 for name in ("infer", "merge", "sort", "render"))
+    assert stats.timings["parse"] == 0
+
+
+def test_stats_report() -> None:
+    report = Stats().report()
+
+    assert report.startswith("Phase timings (ms):\n")
+    assert all(name in report for name in PHASES + COUNTERS)
+    assert set(Stats().as_dict()["counts"]) == set(COUNTERS)
+
+
+def test_cli_stats() -> None:
+    source = {"id": 1, "tags": ["a"]}
+
+    result = CliRunner().invoke(cli, ["--stats"], input=json.dumps(source))
+
+    assert result.exit_code == 0
+    assert result.stdout == get_type_definitions(source) + "\n"
+    assert result.stderr.startswith("Phase timings (ms):\n")
+    assert "get_type_calls" in result.stderr